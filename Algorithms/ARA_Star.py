@@ -0,0 +1,246 @@
+import Core.config as config
+import heapq
+import time
+import Algorithms.heuristics as heuristics
+from Algorithms.A_Star import Node
+from Core.context import SearchContext
+
+class Pathfinder:
+    """
+    Implements anytime repairing A* (ARA*) on a 2D grid.
+
+    The first round runs weighted A* with a high weight and publishes a route quickly. Each later
+    round lowers the weight and repairs the previous round's search instead of restarting: g-values
+    and parents are kept, and only nodes whose cost improved since they were expanded are reopened.
+    Every published route comes with a bound on how far its cost can be from the optimal cost.
+    The search stops once a round with weight 1 completes (the route is optimal) or the deadline passes.
+    Only time spent inside step() counts towards the deadline, so a driver that throttles or pauses the search
+    (like the GUI) gives it the same budget as one that steps it flat out.
+
+    Attributes:
+        grid (GridModel): The grid environment.
+        moves (list[list[int, int]]): The list of moves based on selected movement type.
+        start (tuple[int, int]): The starting coordinates for the search.
+        goal (tuple[int, int]): The goal coordinates for the search.
+        heuristic (str): The heuristic to use for calculating h.
+        h (Callable[[int, int], float]): Unweighted heuristic estimate of a cell, resolved from heuristic.
+        w (float): Weight of the current round.
+        w_step (float): Amount the weight is lowered by after each round.
+        deadline (float | None): Seconds the search may spend stepping, or None for no limit.
+        spent (float): Seconds spent inside step() so far.
+        step_start (float | None): time.perf_counter() when the step in progress began, or None between steps.
+        g (dict[tuple[int, int], int]): Best known cost of each reached cell.
+        parent (dict[tuple[int, int], tuple[int, int] | None]): Parent of each reached cell.
+        frontier (list): Heap of (f, counter, (x, y), g) entries. Entries with an outdated g are skipped.
+        visited (set[tuple[int, int]]): Cells expanded in the current round.
+        incons (set[tuple[int, int]]): Expanded cells whose g improved in the current round.
+        route (list[Node]): Best route published so far, from goal back to start.
+        solutions (list[dict]): Weight, route cost, bound and time at the end of every round.
+        bound (float): Suboptimality bound of the best route (cost / optimal cost <= bound).
+        counter (int): Counter used for the frontier.
+        last_popped (tuple[int, int] | None): Coordinates popped from the frontier by the last step.
+        last_enqueued (list[tuple[int, int]]): Coordinates enqueued by the last step.
+        context (SearchContext): Run state of the search.
+    """
+    def __init__(self, grid, sx, sy, gx, gy, heuristic, w: float=3.0, w_step: float=0.5, deadline: float | None=None,
+                 context: SearchContext | None=None, use_table: bool=False):
+        """
+        Initializes the search.
+
+        Args:
+            grid (GridModel): The grid environment.
+            sx, sy (int, int): Starting coordinates of the search agent.
+            gx, gy (int, int): Goal coordinates.
+            heuristic   (str): The heuristic to use.
+            w         (float): Weight of the first round.
+            w_step    (float): Amount the weight is lowered by after each round.
+            deadline (float | None): Seconds the search may spend stepping, or None for no limit.
+            context (SearchContext | None): Run state of the search. Defaults to a new context for config.movement_type.
+            use_table       (bool): Precompute (or reuse) a table of every cell's heuristic for the goal.
+        """
+        self.grid = grid
+        self.context = context or SearchContext(config.movement_type)
+        self.moves = self.context.get_moves()
+        self.start = (sx, sy)
+        self.goal = (gx, gy)
+        self.heuristic = heuristic
+        self.h = heuristics.resolve(heuristic, self.goal, 1, (grid.rows, grid.cols) if use_table else None)
+        self.w = max(1.0, w)
+        self.w_step = w_step
+        self.deadline = deadline
+        self.spent = 0.0
+        self.step_start = None
+
+        self.context.simulating = True
+        self.route = []
+        self.solutions = []
+        self.bound = float('inf')
+        self.g = {self.start: 0}
+        self.parent = {self.start: None}
+        self.visited = set()
+        self.incons = set()
+        self.frontier = []
+        self.counter = 0
+        self.last_popped = None
+        self.last_enqueued = []
+        self._push(self.start)
+
+    def _push(self, cell):
+        """Helper method that adds a cell to the frontier, keyed by the current round's weighted f."""
+        g = self.g[cell]
+        heapq.heappush(self.frontier, (g + self.w * self.h(*cell), self.counter, cell, g))
+        self.counter += 1
+
+    def _min_key(self):
+        """Helper method that drops outdated frontier entries and returns the smallest key left (inf if empty)."""
+        while self.frontier:
+            _, _, cell, g = self.frontier[0]
+            if g == self.g[cell] and cell not in self.visited:
+                return self.frontier[0][0]
+            heapq.heappop(self.frontier)
+        return float('inf')
+
+    def elapsed(self) -> float:
+        """Returns the seconds spent inside step(), so time between steps (throttling, pauses) does not count."""
+        if self.step_start is None:
+            return self.spent
+        return self.spent + time.perf_counter() - self.step_start
+
+    def step(self):
+        """
+        Performs a single iteration of the search. Completing a round publishes its route and starts the next.
+
+        Returns:
+            bool: True if search should continue, false if complete or aborted.
+        """
+        self.step_start = time.perf_counter()
+        try:
+            return self._step()
+        finally:
+            self.spent += time.perf_counter() - self.step_start
+            self.step_start = None
+
+    def _step(self):
+        """Helper method that performs the iteration timed by step()."""
+        self.last_popped = None
+        self.last_enqueued = []
+        if not self.context.simulating:
+            return False # Search is stopped externally
+        if self.deadline is not None and self.elapsed() >= self.deadline:
+            return self._finish() # Out of time, keep the best route so far
+
+        min_key = self._min_key()
+        goal_g = self.g.get(self.goal)
+        if goal_g is not None and goal_g <= min_key or min_key == float('inf'):
+            # The current round cannot improve the goal any further
+            if goal_g is None:
+                return self._finish() # Search failed
+            self._publish()
+            if self.w <= 1:
+                return self._finish() # Search completed with an optimal route
+            self._next_round()
+            return True
+
+        cell = heapq.heappop(self.frontier)[2]
+        self.visited.add(cell)
+        self.last_popped = cell
+        self._expansion(*cell)
+        return True # Search should continue
+
+    def _expansion(self, x, y):
+        """
+        Helper method that relaxes the neighbors of a cell. Improved cells are pushed to the frontier,
+        or set aside for the next round if they were already expanded in this one.
+        """
+        g = self.g[(x, y)]
+        for move in self.moves:
+            nx, ny = x + move[0], y + move[1]
+            # Cells are reopened, so tiles already shown as open or closed must stay passable
+            if self.grid.get(nx, ny) == 'wall' or not config.diagonal_check(x, y, move, self.grid):
+                continue
+            next_g = g + config.get_move_cost(move)
+            if next_g < self.g.get((nx, ny), next_g + 1):
+                self.g[(nx, ny)] = next_g
+                self.parent[(nx, ny)] = (x, y)
+                if (nx, ny) in self.visited:
+                    self.incons.add((nx, ny))
+                else:
+                    self._push((nx, ny))
+                    self.last_enqueued.append((nx, ny))
+
+    def _publish(self):
+        """
+        Helper method that publishes the route to the goal and its suboptimality bound.
+        The optimal cost is at least the smallest unweighted f among the cells still to be expanded.
+        """
+        cells = []
+        cell = self.goal
+        while cell is not None:
+            cells.append(cell)
+            cell = self.parent[cell]
+        cells.reverse()
+
+        # Parents may have improved since the goal was reached, so the route can be cheaper than g(goal)
+        route = []
+        node = None
+        for x, y in cells:
+            move = [x - node.x, y - node.y] if node else []
+            node = Node(x, y, node, move, node.g + config.get_move_cost(move) if node else 0, 0)
+            route.append(node)
+        route.reverse()
+        cost = route[0].g
+
+        pending = [cell for _, _, cell, g in self.frontier if g == self.g[cell] and cell not in self.visited]
+        lower = min((self.g[cell] + self.h(*cell) for cell in [*pending, *self.incons]), default=cost)
+        self.bound = min(self.w, cost / lower) if lower > 0 else 1.0
+        if not self.route or cost < self.route[0].g:
+            self.route = route # Only a cheaper route replaces the published one
+        self.solutions.append({'weight': self.w, 'cost': cost, 'bound': round(self.bound, 4),
+                               'seconds': round(self.elapsed(), 6)})
+
+    def _next_round(self):
+        """
+        Helper method that lowers the weight and reopens the cells that improved, keeping all g-values.
+        """
+        self.w = max(1.0, self.w - self.w_step)
+        pending = {cell for _, _, cell, g in self.frontier if g == self.g[cell] and cell not in self.visited}
+        pending |= self.incons
+        self.incons = set()
+        self.visited = set()
+        self.frontier = []
+        for cell in pending:
+            self._push(cell)
+
+    def _finish(self):
+        """Helper method that ends the search, failing it if no route was published."""
+        self.context.simulating = False
+        if not self.route:
+            self.context.failed = True
+        return False
+
+    def get_frontier(self):
+        """
+        Returns the coordinates of nodes currently in the frontier.
+
+        Returns:
+            list[list[int, int]]: List of [x, y] positions.
+        """
+        return [list(entry[2]) for entry in self.frontier]
+
+    def get_visited(self):
+        """
+        Returns the coordinates of nodes expanded in the current round.
+
+        Returns:
+            list[tuple[int, int]]: List of visited [x, y] coordinates.
+        """
+        return list(self.visited)
+
+    def get_route(self):
+        """
+        Returns the best route published so far. A new list is returned whenever a cheaper route is found.
+
+        Returns:
+            list[Node]: Ordered list of nodes representing the route, from goal back to start.
+        """
+        return self.route
@@ -1,5 +1,7 @@
 import Core.config as config
 import heapq
+import Algorithms.heuristics as heuristics
+from Core.context import SearchContext
 
 class Node:
     def __init__(self, x, y, parent, move, g, h):
@@ -25,14 +27,20 @@ class Pathfinder:
         goal (tuple[int, int]): The goal coordinates for the search.
         heuristic (str): The heuristic to use for calculating h.
         w (int): The weight of the heuristic.
+        h (Callable[[int, int], float]): Weighted heuristic estimate of a cell, resolved from heuristic.
         route (list[Node]): List of nodes along the solution route.
         frontier (heapq): Priority queue of nodes to be visited.
         enqueued (set[tuple[int, int]]): Set of coordinates that have been enqueued into the frontier.
         visited (set[tuple[int, int]]): Set of coordinates that have been visited.
         counter (int): counter used for the frontier.
         current (Node): The node currently being explored.
+        context (SearchContext): Run state of the search.
+        last_popped (tuple[int, int] | None): Coordinates popped from the frontier by the last step.
+        last_enqueued (list[tuple[int, int]]): Coordinates enqueued by the last step.
+        prune (bytes | None): 1 for each packed cell the search never enters, or None to enter every cell.
     """
-    def __init__(self, grid, sx, sy, gx, gy, heuristic, w):
+    def __init__(self, grid, sx, sy, gx, gy, heuristic, w, context: SearchContext | None=None, use_table: bool=False,
+                 prune: bytes | None=None):
         """
         Initializes the Search object and begins the simulation.
 
@@ -42,45 +50,33 @@ class Pathfinder:
             gx, gy      (int, int): Goal coordinates.
             heuristic        (str): The heuristic to use.
             w                (int): Weight of the heuristic.
+            context (SearchContext | None): Run state of the search. Defaults to a new context for config.movement_type.
+            use_table       (bool): Precompute (or reuse) a table of every cell's heuristic for the goal.
+            prune   (bytes | None): Cells to skip, from pruning.DeadEndIndex.skip_mask().
         """
         self.grid = grid
-        self.moves = config.get_moves(config.movement_type)
+        self.context = context or SearchContext(config.movement_type)
+        self.moves = self.context.get_moves()
         self.start = (sx, sy)
         self.goal = (gx, gy)
         self.heuristic = heuristic
         self.w = w
+        self.h = heuristics.resolve(heuristic, self.goal, w, (grid.rows, grid.cols) if use_table else None)
+        self.prune = prune
 
-        config.simulating = True
+        self.context.simulating = True
         self.route = []
         self.frontier = []
         self.enqueued = set()
         self.visited = set()
         self.counter = 0
-        self.current = Node(*self.start, None, [], 0, self.compute_h(*self.start, *self.goal))
+        self.last_popped = None
+        self.last_enqueued = []
+        self.current = Node(*self.start, None, [], 0, self.h(*self.start))
         self.enqueued.add(self.start)
         heapq.heappush(self.frontier, (self.current.f, self.counter, self.current))
         self.counter += 1
 
-    def compute_h(self, x, y, gx, gy):
-        """
-        Computes and returns h(n) of any given x, y position relative to a given goal position.
-
-        Parameters:
-            x, y   (int, int): Coordinates of given position.
-            gx, gy (int, int): Coordinates of goal position.
-        
-        Returns:
-            int              : Computed estimate.
-        """
-        if self.heuristic == 'Diagonal':
-            dx = abs(x - gx)
-            dy = abs(y - gy)
-            return (100 * (dx + dy) + (141 - 2 * 100) * min(dx,dy)) * self.w
-        elif self.heuristic == 'Manhattan':
-            return (100 * (abs(x-gx) + abs(y-gy))) * self.w
-        else:
-            return 0
-
     def step(self):
         """
         Performs a single iteration of the search.
@@ -88,14 +84,18 @@ class Pathfinder:
         Returns:
             bool: True if search should continue, false if complete or aborted.
         """
-        if not config.simulating:
+        self.last_popped = None
+        self.last_enqueued = []
+        if not self.context.simulating:
             return False # Search is stopped externally
         if len(self.frontier) == 0:
-            config.simulating = False
+            self.context.simulating = False
+            self.context.failed = True
             return False # Search failed
         
         self.current = heapq.heappop(self.frontier)[2]
         x, y = self.current.x, self.current.y
+        self.last_popped = (x, y)
 
         # Goal check
         if (x, y) == self.goal:
@@ -114,7 +114,7 @@ class Pathfinder:
         Helper method that traces the route from the goal node back to the start,
         following parent pointers and constructing the final route.
         """
-        config.simulating = False
+        self.context.simulating = False
         node = self.current
         while node:
             self.route.append(node)
@@ -129,12 +129,15 @@ class Pathfinder:
             if config.is_valid_pos(x, y, move, self.grid):
                 nx = x + move[0]
                 ny = y + move[1]
+                if self.prune and self.prune[ny * self.grid.cols + nx]:
+                    continue # Dead end that cannot lie on the route
                 g = config.get_move_cost(move)
                 if (nx, ny) not in self.visited and (nx, ny) not in self.enqueued:
-                    nextNode = Node(nx, ny, self.current, move, self.current.g + g, self.compute_h(nx, ny, *self.goal))
+                    nextNode = Node(nx, ny, self.current, move, self.current.g + g, self.h(nx, ny))
                     heapq.heappush(self.frontier, (nextNode.f, self.counter, nextNode))
                     self.counter += 1
                     self.enqueued.add((nx, ny))
+                    self.last_enqueued.append((nx, ny))
 
     def get_frontier(self):
         """
@@ -1,5 +1,6 @@
 import Core.config as config
 from collections import deque
+from Core.context import SearchContext
 
 class Node:
     """
@@ -30,9 +31,13 @@ class Pathfinder:
         frontier         (deque | list): The list of nodes to be explored.
         visited  (set[tuple[int, int]]): Set of visited node coordinates.
         enqueued (set[tuple[int, int]]): Set of coordinates currently in the frontier.
+        last_popped   (tuple[int, int] | None): Coordinates popped from the frontier by the last step.
+        last_enqueued  (list[tuple[int, int]]): Coordinates enqueued by the last step.
+        context         (SearchContext): Run state of the search.
+        prune            (bytes | None): 1 for each packed cell the search never enters, or None to enter every cell.
     
     """
-    def __init__(self, grid, sx, sy, gx, gy, mode: str):
+    def __init__(self, grid, sx, sy, gx, gy, mode: str, context: SearchContext | None=None, prune: bytes | None=None):
         """
         Initializes the Search object and begins the simulation.
 
@@ -41,19 +46,25 @@ class Pathfinder:
             sx, sy      (int, int): Starting coordinates of the search agent.
             gx, gy      (int, int): Goal coordinates.
             mode             (str): The algorithm mode ('BFS' or 'DFS').
+            context (SearchContext | None): Run state of the search. Defaults to a new context for config.movement_type.
+            prune   (bytes | None): Cells to skip, from pruning.DeadEndIndex.skip_mask().
         """
         self.grid = grid
-        self.moves = config.get_moves(config.movement_type)
+        self.context = context or SearchContext(config.movement_type)
+        self.moves = self.context.get_moves()
         self.enqueued = set()
         self.mode = mode
+        self.prune = prune
 
         self.start = (sx, sy)
         self.goal = (gx, gy)
 
-        config.simulating = True
+        self.context.simulating = True
         self.route = []
         self.frontier = deque() if self.mode == 'BFS' else []
         self.visited = set()
+        self.last_popped = None
+        self.last_enqueued = []
         self.current = Node(*self.start, None, [])
         self.enqueued.add(self.start)
         self.frontier.append(self.current)
@@ -65,16 +76,19 @@ class Pathfinder:
         Returns:
             bool: True if search should continue, false if complete or aborted.
         """
-        if not config.simulating:
+        self.last_popped = None
+        self.last_enqueued = []
+        if not self.context.simulating:
             return False # Search is stopped externally
         if len(self.frontier) == 0:
-            config.simulating = False
-            config.failed = True
+            self.context.simulating = False
+            self.context.failed = True
             return False # Search failed
         
         self.current = self.frontier.popleft() if self.mode == 'BFS' else self.frontier.pop()
 
         x, y = self.current.x, self.current.y
+        self.last_popped = (x, y)
 
         # Goal check
         if (x, y) == self.goal:
@@ -93,7 +107,7 @@ class Pathfinder:
         Helper method that traces the route from the goal node back to the start,
         following parent pointers and constructing the final route.
         """
-        config.simulating = False
+        self.context.simulating = False
         node = self.current
         while node:
             self.route.append(node)
@@ -107,10 +121,13 @@ class Pathfinder:
         for move in self.moves:
             if config.is_valid_pos(x, y, move, self.grid):
                 nx, ny = x + move[0], y + move[1]
+                if self.prune and self.prune[ny * self.grid.cols + nx]:
+                    continue # Dead end that cannot lie on the route
                 if (nx, ny) not in self.visited and (nx, ny) not in self.enqueued:
                     next = Node(nx, ny, self.current, move)
                     self.frontier.append(next)
                     self.enqueued.add((nx, ny))
+                    self.last_enqueued.append((nx, ny))
         
     def get_frontier(self) -> list[list[tuple[int, int]]]:
         """
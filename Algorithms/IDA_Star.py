@@ -0,0 +1,213 @@
+import Core.config as config
+import Algorithms.heuristics as heuristics
+from Core.context import SearchContext
+from Algorithms.A_Star import Node
+
+class Pathfinder:
+    """
+    Implements memory-bounded IDA* with a transposition table on a 2D grid.
+
+    Each iteration is a depth-first search that only follows nodes with f <= threshold; the next
+    iteration raises the threshold to the smallest f that was cut off. Only the current path and the
+    transposition table are stored, and together they never hold more than node_cap nodes. Once the
+    table is full, the oldest cells are forgotten, which costs time (repeated visits) but not memory.
+
+    Attributes:
+        grid (GridModel): The grid environment.
+        moves (list[list[int, int]]): The list of moves based on selected movement type.
+        start (tuple[int, int]): The starting coordinates for the search.
+        goal (tuple[int, int]): The goal coordinates for the search.
+        heuristic (str): The heuristic to use for calculating h.
+        w (float): The weight of the heuristic.
+        h (Callable[[int, int], float]): Weighted heuristic estimate of a cell, resolved from heuristic.
+        node_cap (int): Maximum number of nodes stored at once (path plus table).
+        route (list[Node]): List of nodes along the solution route.
+        path (list[Node]): Nodes on the current depth-first path, from the start.
+        next_move (list[int]): Index of the next move to try from each node on the path.
+        on_path (set[tuple[int, int]]): Coordinates on the current path, to avoid cycles.
+        table (dict[tuple[int, int], float]): Lowest g reached for each cell in this iteration.
+        threshold (float): f bound of the current iteration.
+        next_threshold (float): Smallest f cut off in the current iteration.
+        iterations (int): Number of iterations started.
+        peak_nodes (int): Largest number of nodes stored at once.
+        depth_limited (bool): True if the path was cut short because it reached node_cap.
+        current (Node): The node currently being explored.
+        context (SearchContext): Run state of the search.
+        last_popped (tuple[int, int] | None): Coordinates visited by the last step.
+        last_enqueued (list[tuple[int, int]]): Coordinates enqueued by the last step (always empty).
+    """
+    def __init__(self, grid, sx, sy, gx, gy, heuristic, w, node_cap: int=100000, context: SearchContext | None=None,
+                 use_table: bool=False):
+        """
+        Initializes the search and starts the first iteration.
+
+        Args:
+            grid (GridModel): The grid environment.
+            sx, sy (int, int): Starting coordinates of the search agent.
+            gx, gy (int, int): Goal coordinates.
+            heuristic   (str): The heuristic to use.
+            w         (float): Weight of the heuristic.
+            node_cap    (int): Maximum number of nodes stored at once.
+            context (SearchContext | None): Run state of the search. Defaults to a new context for config.movement_type.
+            use_table  (bool): Precompute (or reuse) a table of every cell's heuristic for the goal.
+        """
+        self.grid = grid
+        self.context = context or SearchContext(config.movement_type)
+        self.moves = self.context.get_moves()
+        self.start = (sx, sy)
+        self.goal = (gx, gy)
+        self.heuristic = heuristic
+        self.w = w
+        self.h = heuristics.resolve(heuristic, self.goal, w, (grid.rows, grid.cols) if use_table else None)
+        self.node_cap = max(2, node_cap)
+
+        self.context.simulating = True
+        self.route = []
+        self.threshold = self.h(*self.start)
+        self.iterations = 0
+        self.peak_nodes = 0
+        self.depth_limited = False
+        self.last_popped = None
+        self.last_enqueued = []
+        self._start_iteration()
+
+    def _start_iteration(self):
+        """
+        Helper method that restarts the depth-first search from the start with the current threshold.
+        """
+        self.iterations += 1
+        self.next_threshold = float('inf')
+        self.current = Node(*self.start, None, [], 0, self.h(*self.start))
+        self.path = [self.current]
+        self.next_move = [0]
+        self.on_path = {self.start}
+        self.table = {self.start: 0}
+
+    def nodes_in_use(self) -> int:
+        """Returns the number of nodes currently stored (path plus transposition table)."""
+        return len(self.path) + len(self.table)
+
+    def step(self):
+        """
+        Performs a single iteration of the search: descends to one new node or backtracks from one.
+
+        Returns:
+            bool: True if search should continue, false if complete or aborted.
+        """
+        self.last_popped = None
+        self.last_enqueued = []
+        if not self.context.simulating:
+            return False # Search is stopped externally
+
+        if not self.path:
+            if self.next_threshold == float('inf'):
+                self.context.simulating = False
+                self.context.failed = True
+                return False # Search failed
+            self.threshold = self.next_threshold
+            self._start_iteration()
+
+        node = self.path[-1]
+        if (node.x, node.y) == self.goal:
+            self.current = node
+            self._goal_found()
+            return False # Search completed successfully
+
+        child = self._next_child(node)
+        if child is None:
+            # Every move from this node has been tried, so backtrack
+            self.path.pop()
+            self.next_move.pop()
+            self.on_path.discard((node.x, node.y))
+            return True
+
+        self.current = child
+        self.last_popped = (child.x, child.y)
+        self.path.append(child)
+        self.next_move.append(0)
+        self.on_path.add((child.x, child.y))
+        self.peak_nodes = max(self.peak_nodes, self.nodes_in_use())
+        return True # Search should continue
+
+    def _next_child(self, node):
+        """
+        Helper method that returns the next child of a node within the threshold, or None if there is none.
+        Children over the threshold lower next_threshold; children reached more cheaply before are skipped.
+        """
+        x, y = node.x, node.y
+        while self.next_move[-1] < len(self.moves):
+            move = self.moves[self.next_move[-1]]
+            self.next_move[-1] += 1
+            nx, ny = x + move[0], y + move[1]
+            # Cells are revisited, so tiles already shown as open or closed must stay passable
+            if self.grid.get(nx, ny) == 'wall' or not config.diagonal_check(x, y, move, self.grid):
+                continue
+            if (nx, ny) in self.on_path:
+                continue
+            g = node.g + config.get_move_cost(move)
+            if g >= self.table.get((nx, ny), float('inf')):
+                continue # Reached as cheaply before in this iteration
+            child = Node(nx, ny, node, move, g, self.h(nx, ny))
+            if child.f > self.threshold:
+                self.next_threshold = min(self.next_threshold, child.f)
+                continue
+            if len(self.path) + 1 >= self.node_cap:
+                self.depth_limited = True
+                continue
+            self.table.pop((nx, ny), None)
+            while self.table and self.nodes_in_use() + 2 > self.node_cap:
+                del self.table[next(iter(self.table))] # Forget the oldest cells to stay within the cap
+            self.table[(nx, ny)] = g
+            return child
+        return None
+
+    def _goal_found(self):
+        """
+        Helper method that traces the route from the goal node back to the start,
+        following parent pointers and constructing the final route.
+        """
+        self.context.simulating = False
+        node = self.current
+        while node:
+            self.route.append(node)
+            node = node.parent
+
+    def get_budget(self) -> dict:
+        """
+        Returns:
+            dict: The node cap, the nodes stored now and at the peak, and the number of iterations.
+        """
+        return {
+            'node_cap': self.node_cap,
+            'nodes_in_use': self.nodes_in_use(),
+            'peak_nodes': self.peak_nodes,
+            'iterations': self.iterations,
+            'depth_limited': self.depth_limited,
+        }
+
+    def get_frontier(self):
+        """
+        Returns the coordinates of nodes on the current depth-first path.
+
+        Returns:
+            list[list[int, int]]: List of [x, y] positions.
+        """
+        return [[node.x, node.y] for node in self.path]
+
+    def get_visited(self):
+        """
+        Returns the coordinates recorded in the transposition table.
+
+        Returns:
+            list[tuple[int, int]]: List of visited [x, y] coordinates.
+        """
+        return list(self.table)
+
+    def get_route(self):
+        """
+        Returns the reconstructed route from start to goal.
+
+        Returns:
+            list[Node]: Ordered list of nodes representing the final route.
+        """
+        return self.route
@@ -0,0 +1,389 @@
+import heapq
+import math
+import threading
+import weakref
+import Core.config as config
+import Algorithms.A_Star as A_Star
+from Algorithms.A_Star import Node
+from Core.context import SearchContext
+from Core.grid_model import STATE_CODES
+
+WALL = STATE_CODES['wall']
+
+# Largest number of cell pairs whose line of sight is kept per grid.
+LOS_CACHE_SIZE = 65536
+
+# Line of sight caches of the grids searched this session. Dropped with their grid.
+_caches = weakref.WeakKeyDictionary()
+
+def line_cells(x0: int, y0: int, x1: int, y1: int):
+    """
+    Walks the tiles a straight line between two tile centres passes through, after the first.
+    Where the line passes exactly through a corner it steps diagonally, so each step is a single move.
+
+    Yields:
+        tuple[int, int, list[int, int]]: Coordinates of each tile and the move that reached it.
+    """
+    nx, ny = abs(x1 - x0), abs(y1 - y0)
+    sx = 1 if x1 > x0 else -1
+    sy = 1 if y1 > y0 else -1
+    x, y = x0, y0
+    ix = iy = 0
+    while ix < nx or iy < ny:
+        decision = (1 + 2 * ix) * ny - (1 + 2 * iy) * nx
+        if decision == 0:
+            x += sx
+            y += sy
+            ix += 1
+            iy += 1
+            yield x, y, [sx, sy]
+        elif decision < 0:
+            x += sx
+            ix += 1
+            yield x, y, [sx, 0]
+        else:
+            y += sy
+            iy += 1
+            yield x, y, [0, sy]
+
+def corner_step(cells, cols: int, x: int, y: int, move: list[int]) -> list[int] | None:
+    """
+    Returns the first cardinal move of a diagonal step taken as two cardinal moves, through whichever tile beside
+    the corner is open (horizontal first), or None if both are walls.
+    """
+    if cells[y * cols + x + move[0]] != WALL:
+        return [move[0], 0]
+    if cells[(y + move[1]) * cols + x] != WALL:
+        return [0, move[1]]
+    return None
+
+class LineOfSight:
+    """
+    Memoised line of sight between tiles of one grid. A line is blocked by any wall it passes through.
+    Where it passes exactly through a corner, with Diagonal movement it is blocked by either wall beside the corner,
+    like a diagonal move (see config.diagonal_check); with Cardinal movement only if both are walls,
+    since the line must then step around the corner through one of them.
+    Results are kept per pair of cells and movement, the least recently used dropped first,
+    and forgotten whenever a wall is edited.
+
+    The cache keeps no reference to its grid, so it is dropped along with the grid.
+
+    Attributes:
+        results (dict[tuple[int, int, bool], bool]): Line of sight of each cached pair of packed cells (lowest cell first)
+            and whether movement is Cardinal.
+        lock (threading.Lock): Guards results, since grids are shared between searches (see Core/service.py).
+    """
+    def __init__(self, grid):
+        """
+        Parameters:
+            grid (GridModel): The grid. If it has edit_listeners, the cache listens for wall edits.
+        """
+        self.results = {}
+        self.lock = threading.Lock()
+        if hasattr(grid, 'edit_listeners'):
+            grid.edit_listeners.append(self.on_edit)
+
+    def lookup(self, key: tuple[int, int, bool]) -> bool | None:
+        """Returns the cached line of sight of a pair of packed cells and movement, or None if it is not cached."""
+        with self.lock:
+            seen = self.results.pop(key, None)
+            if seen is not None:
+                self.results[key] = seen # Most recently used last
+            return seen
+
+    def trace(self, grid, key: tuple[int, int, bool]) -> bool:
+        """
+        Walks the line between a pair of packed cells, caching the result.
+
+        Parameters:
+            grid (GridModel): The grid the cache belongs to.
+            key (tuple[int, int, bool]): The packed cells, lowest first, and whether movement is Cardinal.
+
+        Returns:
+            bool: True if no wall blocks the line.
+        """
+        cells = grid.cells
+        cols = grid.cols
+        a, b, cardinal = key
+        x, y = a % cols, a // cols
+        seen = True
+        for nx, ny, move in line_cells(x, y, b % cols, b // cols):
+            if cells[ny * cols + nx] == WALL:
+                seen = False
+            elif move[0] and move[1]:
+                if cardinal:
+                    seen = corner_step(cells, cols, x, y, move) is not None
+                else:
+                    seen = cells[y * cols + nx] != WALL and cells[ny * cols + x] != WALL
+            if not seen:
+                break
+            x, y = nx, ny
+        with self.lock:
+            self.results[key] = seen
+            while len(self.results) > LOS_CACHE_SIZE:
+                del self.results[next(iter(self.results))]
+        return seen
+
+    def on_edit(self, changes: list[tuple[int, int, int]] | None):
+        """Forgets every cached result if an edit added or removed a wall, or the grid was cleared (None)."""
+        if changes is None or any(old == WALL or new == WALL for _, old, new in changes):
+            with self.lock:
+                self.results = {}
+
+def get_line_of_sight(grid) -> LineOfSight:
+    """Returns the line of sight cache of a grid, creating it on first use."""
+    los = _caches.get(grid)
+    if los is None:
+        los = _caches[grid] = LineOfSight(grid)
+    return los
+
+class Pathfinder(A_Star.Pathfinder):
+    """
+    Implements Lazy Theta* on a 2D grid: weighted A* in which a node's parent may be any tile it can see,
+    so routes run at any angle between corners instead of following the moves of the grid.
+    With Cardinal movement each straight segment is walked as a staircase of cardinal moves and costs its
+    Manhattan length, so routes stay legal and their costs comparable with the other searches.
+    With Diagonal movement a segment costs its length, and is walked with a diagonal move wherever the line
+    crosses a row and a column in turn and the corner is not cut.
+
+    When a node is enqueued it is given its neighbour's parent on trust. Line of sight is only checked
+    when the node is expanded, and if it is blocked the node falls back to its best expanded neighbour,
+    so most nodes that are enqueued but never expanded cost no check at all.
+
+    Attributes (in addition to those of A_Star.Pathfinder):
+        los (LineOfSight): Line of sight cache of the grid, shared with other searches on it.
+        nodes (dict[tuple[int, int], Node]): Best node found for each enqueued cell. Frontier entries for older nodes are skipped.
+        los_checks (int): Lines of sight looked up by this search.
+        los_traced (int): Lines of sight that were not cached and had to be walked.
+        waypoints (list[Node]): Corners of the route, from goal back to start. Each move is the offset from the previous corner.
+        cardinal (bool): Whether movement is Cardinal.
+        stale (bool): Whether a node was dropped because walls were drawn during the search, so the search must start
+            over rather than fail if the frontier empties.
+    """
+    def __init__(self, grid, sx, sy, gx, gy, heuristic, w, context: SearchContext | None=None, use_table: bool=False,
+                 prune: bytes | None=None):
+        """
+        Initializes the search. See A_Star.Pathfinder for the arguments.
+        The heuristic should not overestimate straight lines (Euclidean does not, nor does Manhattan with Cardinal
+        movement), or routes may not be shortest.
+        """
+        super().__init__(grid, sx, sy, gx, gy, heuristic, w, context, use_table, prune)
+        self.cardinal = self.context.movement_type == 'Cardinal'
+        self.los = get_line_of_sight(grid)
+        self.nodes = {self.start: self.current}
+        self.los_checks = 0
+        self.los_traced = 0
+        self.waypoints = []
+        self.stale = False
+
+    def step(self):
+        """
+        Performs a single iteration of the search.
+
+        Returns:
+            bool: True if search should continue, false if complete or aborted.
+        """
+        self.last_popped = None
+        self.last_enqueued = []
+        if not self.context.simulating:
+            return False # Search is stopped externally
+        while self.frontier:
+            node = heapq.heappop(self.frontier)[2]
+            if self.nodes[(node.x, node.y)] is node and (node.x, node.y) not in self.visited:
+                break
+        else:
+            if self.stale:
+                self._restart() # Cells closed before the walls changed may hide the route
+                return True
+            self.context.simulating = False
+            self.context.failed = True
+            return False # Search failed
+
+        if not self._set_parent(node):
+            node.g = math.inf # Walled off since it was enqueued. Any neighbour that still reaches it may enqueue it again
+            self.stale = True
+            return True
+        self.current = node
+        x, y = node.x, node.y
+        self.last_popped = (x, y)
+
+        if (x, y) == self.goal:
+            if self._goal_found():
+                return False # Search completed successfully
+            self._restart() # Walls drawn since the route's corners were expanded block it
+            return True
+
+        self.visited.add((x, y))
+        self._expansion(x, y)
+        return True
+
+    def _visible(self, a: Node, b: Node) -> bool:
+        """Helper method that checks line of sight between two nodes through the shared cache."""
+        cols = self.grid.cols
+        key = (*sorted((a.y * cols + a.x, b.y * cols + b.x)), self.cardinal)
+        self.los_checks += 1
+        seen = self.los.lookup(key)
+        if seen is None:
+            self.los_traced += 1
+            seen = self.los.trace(self.grid, key)
+        return seen
+
+    def _set_parent(self, node: Node) -> bool:
+        """
+        Helper method that checks the parent a node was given on trust. If the parent cannot see the node,
+        the node is attached to the expanded neighbour that reaches it most cheaply instead.
+
+        Returns:
+            bool: False if no expanded neighbour can reach the node any more, because walls were drawn since it was enqueued.
+        """
+        cells = self.grid.cells
+        cols = self.grid.cols
+        parent = node.parent
+        if parent is None:
+            return True
+        if cells[node.y * cols + node.x] == WALL:
+            return False
+        if self._visible(parent, node):
+            return True
+        best = None
+        for move in self.moves:
+            px, py = node.x - move[0], node.y - move[1]
+            if (px, py) not in self.visited or cells[py * cols + px] == WALL:
+                continue
+            if not config.diagonal_check(px, py, move, self.grid):
+                continue
+            neighbour = self.nodes[(px, py)]
+            g = neighbour.g + config.get_move_cost(move)
+            if best is None or g < best[0]:
+                best = (g, neighbour, move)
+        if best is None:
+            return False
+        node.g, node.parent, node.move = best[0], best[1], list(best[2])
+        node.f = node.g + node.h
+        return True
+
+    def _restart(self):
+        """
+        Helper method that forgets every node and searches again from the start, on the grid as it is now.
+        The line of sight cache is cleared too, since grids without edit_listeners cannot tell it about the edits.
+        """
+        self.los.on_edit(None)
+        self.stale = False
+        self.frontier = []
+        self.enqueued = {self.start}
+        self.visited = set()
+        self.current = Node(*self.start, None, [], 0, self.h(*self.start))
+        self.nodes = {self.start: self.current}
+        heapq.heappush(self.frontier, (self.current.f, self.counter, self.current))
+        self.counter += 1
+
+    def _expansion(self, x, y):
+        """
+        Helper method that enqueues the neighbours of the current node, assuming the current node's parent can see them.
+        A neighbour already in the frontier is enqueued again if this reaches it more cheaply.
+        """
+        cells = self.grid.cells
+        cols = self.grid.cols
+        parent = self.current.parent or self.current
+        for move in self.moves:
+            nx = x + move[0]
+            ny = y + move[1]
+            if self.grid.is_OOB(nx, ny) or cells[ny * cols + nx] == WALL or (nx, ny) in self.visited:
+                continue
+            if not config.diagonal_check(x, y, move, self.grid):
+                continue
+            if self.prune and self.prune[ny * cols + nx]:
+                continue # Dead end that cannot lie on the route
+            g = parent.g + self._segment_cost(nx - parent.x, ny - parent.y)
+            old = self.nodes.get((nx, ny))
+            if old is not None and g >= old.g:
+                continue
+            node = Node(nx, ny, parent, [nx - parent.x, ny - parent.y], g, self.h(nx, ny))
+            self.nodes[(nx, ny)] = node
+            heapq.heappush(self.frontier, (node.f, self.counter, node))
+            self.counter += 1
+            if old is None:
+                self.enqueued.add((nx, ny))
+                self.last_enqueued.append((nx, ny))
+
+    def _segment_cost(self, dx: int, dy: int) -> float:
+        """Helper method that returns the cost of a straight segment: its length, or its Manhattan length with Cardinal movement."""
+        if self.cardinal:
+            return 100 * (abs(dx) + abs(dy))
+        return 100 * math.hypot(dx, dy)
+
+    def _goal_found(self) -> bool:
+        """
+        Helper method that collects the route's corners, then expands each straight segment between them
+        into tiles and builds the route from goal back to start. With Cardinal movement, each corner the
+        segment passes exactly through is stepped around through an open tile beside it. With Diagonal movement,
+        a horizontal and a vertical step in a row are merged into one diagonal move where diagonal_check allows.
+        Segments are walked on the grid as it is now, so walls drawn since their corners were expanded are noticed.
+
+        Returns:
+            bool: True if the route was built, False if a wall now blocks one of its segments.
+        """
+        cells = self.grid.cells
+        cols = self.grid.cols
+        waypoints = []
+        node = self.current
+        while node:
+            waypoints.append(node)
+            node = node.parent
+
+        start = waypoints[-1]
+        node = Node(start.x, start.y, None, [], 0, 0)
+        route = [node]
+        for a, b in zip(reversed(waypoints), reversed(waypoints[:-1])):
+            merge = None # Last step of the segment, if a diagonal move may replace it and the next step
+            for x, y, move in line_cells(a.x, a.y, b.x, b.y):
+                if cells[y * cols + x] == WALL:
+                    return False
+                if merge is not None and not (move[0] and move[1]) and bool(move[0]) != bool(merge.move[0]):
+                    diagonal = [merge.move[0] + move[0], merge.move[1] + move[1]]
+                    corner = merge.parent
+                    if config.diagonal_check(corner.x, corner.y, diagonal, self.grid):
+                        route.pop()
+                        node = Node(x, y, corner, diagonal, corner.g + config.get_move_cost(diagonal), 0)
+                        route.append(node)
+                        merge = None
+                        continue
+                if move[0] and move[1]:
+                    if not self.cardinal:
+                        if not config.diagonal_check(node.x, node.y, move, self.grid):
+                            return False
+                    else:
+                        side = corner_step(cells, cols, node.x, node.y, move)
+                        if side is None:
+                            return False
+                        node = Node(node.x + side[0], node.y + side[1], node, side, node.g + 100, 0)
+                        route.append(node)
+                        move = [move[0] - side[0], move[1] - side[1]]
+                node = Node(x, y, node, move, node.g + config.get_move_cost(move), 0)
+                route.append(node)
+                merge = node if not self.cardinal and not (move[0] and move[1]) else None
+        self.context.simulating = False
+        self.waypoints = waypoints
+        self.route = route[::-1]
+        return True
+
+    def get_frontier(self):
+        """
+        Returns the coordinates of nodes currently in the frontier.
+
+        Returns:
+            list[list[int, int]]: List of [x, y] positions.
+        """
+        return [[node.x, node.y] for _, _, node in self.frontier
+                if self.nodes[(node.x, node.y)] is node and (node.x, node.y) not in self.visited]
+
+    def get_route_cost(self) -> float:
+        """
+        Returns the length of the any-angle route through its corners, scaled like config.get_move_cost()
+        (the Manhattan length with Cardinal movement). With Diagonal movement this is less than the cost of the
+        moves in get_route(), which only approximate the straight segments.
+
+        Returns:
+            float: The cost, or 0 if no route was found.
+        """
+        return self.waypoints[0].g if self.waypoints else 0
@@ -0,0 +1,192 @@
+from collections import Counter
+import heapq
+import Core.config as config
+from Core.grid_model import STATE_CODES
+
+WALL = STATE_CODES['wall']
+
+class SearchTree:
+    """
+    An A* search tree grown from one endpoint and shared by every query that uses it.
+
+    Moves are symmetric (the corner rule checks the same two tiles in both directions), so a tree
+    rooted at a goal answers queries from any start, and a tree rooted at a start answers any goal.
+    Each query resumes the search only until its target is closed: closed cells and g-values are kept,
+    and the frontier is re-ordered for the new target. The heuristic is consistent for the moveset,
+    so closed cells always hold optimal g-values whichever target they were closed for.
+
+    Any non-wall tile is passable, so routes may cross the start and goal tiles of other queries.
+    A tree is only valid for the grid it was built on; build a new one after editing the grid.
+
+    Attributes:
+        grid (GridModel): Grid being searched.
+        root (tuple[int, int]): Shared endpoint the tree is rooted at.
+        movement (str): 'Cardinal' or 'Diagonal'.
+        moves (list[tuple[int, int, int]]): (dx, dy, cost) of each move.
+        g (dict[int, int]): Best known cost from the root, keyed by packed cell.
+        parent (dict[int, int | None]): Parent of each reached cell in the tree.
+        closed (set[int]): Cells whose g-value is final.
+        frontier (list): Heap of (f, counter, cell) entries. May hold stale entries for closed cells.
+        target (int | None): Packed cell the frontier is currently ordered for.
+        expansions (int): Total cells expanded by the tree.
+    """
+    def __init__(self, grid, root, movement: str | None=None):
+        """
+        Parameters:
+            grid (GridModel): Grid to search.
+            root (tuple[int, int]): Endpoint shared by the queries.
+            movement (str | None): 'Cardinal' or 'Diagonal'. Defaults to config.movement_type.
+        """
+        self.grid = grid
+        self.root = tuple(root)
+        self.movement = movement or config.movement_type
+        self.moves = [(move[0], move[1], config.get_move_cost(move)) for move in config.get_moves(self.movement)]
+        cell = self.root[1] * grid.cols + self.root[0]
+        self.g = {cell: 0}
+        self.parent = {cell: None}
+        self.closed = set()
+        self.frontier = [(0, 0, cell)]
+        self.counter = 1
+        self.target = None
+        self.expansions = 0
+
+    def compute_h(self, cell: int) -> int:
+        """Returns the heuristic from a packed cell to the current target: Manhattan or octile distance."""
+        cols = self.grid.cols
+        dx = abs(cell % cols - self.target % cols)
+        dy = abs(cell // cols - self.target // cols)
+        if self.movement == 'Cardinal':
+            return 100 * (dx + dy)
+        return 100 * (dx + dy) + (141 - 2 * 100) * min(dx, dy)
+
+    def query(self, target) -> tuple[list[tuple[int, int]], int]:
+        """
+        Finds the route between the root and a target, resuming the search as far as needed.
+
+        Parameters:
+            target (tuple[int, int]): The other endpoint of the query.
+
+        Returns:
+            tuple[list[tuple[int, int]], int]: Route from the target to the root (empty if unreachable),
+            and the number of cells expanded to answer this query.
+        """
+        tx, ty = target
+        grid = self.grid
+        if grid.is_OOB(tx, ty) or grid.cells[ty * grid.cols + tx] == WALL:
+            return [], 0
+        goal = ty * grid.cols + tx
+        if goal in self.closed:
+            return self.route_to(goal), 0
+        if goal != self.target:
+            self._retarget(goal)
+
+        cells = grid.cells
+        cols, rows = grid.cols, grid.rows
+        expansions = 0
+        while self.frontier:
+            cell = heapq.heappop(self.frontier)[2]
+            if cell in self.closed:
+                continue # Stale entry
+            self.closed.add(cell)
+            expansions += 1
+            self._expansion(cell, cells, cols, rows)
+            if cell == goal:
+                break
+        self.expansions += expansions
+        return self.route_to(goal), expansions
+
+    def _expansion(self, cell: int, cells, cols: int, rows: int):
+        """
+        Helper method that relaxes the neighbors of a closed cell.
+        Closed cells are always expanded, even the target, so the tree stays valid for later queries.
+        """
+        x, y = cell % cols, cell // cols
+        g = self.g[cell]
+        for dx, dy, cost in self.moves:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < cols and 0 <= ny < rows):
+                continue
+            next_cell = ny * cols + nx
+            if cells[next_cell] == WALL or next_cell in self.closed:
+                continue
+            # Diagonal moves may not cut the corner of a wall
+            if dx and dy and (cells[y * cols + nx] == WALL or cells[ny * cols + x] == WALL):
+                continue
+            next_g = g + cost
+            if next_g < self.g.get(next_cell, next_g + 1):
+                self.g[next_cell] = next_g
+                self.parent[next_cell] = cell
+                heapq.heappush(self.frontier, (next_g + self.compute_h(next_cell), self.counter, next_cell))
+                self.counter += 1
+
+    def _retarget(self, goal: int):
+        """
+        Helper method that re-orders the frontier for a new target, dropping stale entries.
+        """
+        self.target = goal
+        open_cells = dict.fromkeys(entry[2] for entry in self.frontier if entry[2] not in self.closed)
+        self.frontier = [(self.g[cell] + self.compute_h(cell), i, cell) for i, cell in enumerate(open_cells)]
+        heapq.heapify(self.frontier)
+        self.counter = len(self.frontier)
+
+    def route_to(self, cell: int) -> list[tuple[int, int]]:
+        """
+        Returns the tree route from a closed cell back to the root.
+
+        Returns:
+            list[tuple[int, int]]: Coordinates from the cell to the root, or [] if the cell is not closed.
+        """
+        if cell not in self.closed:
+            return []
+        cols = self.grid.cols
+        route = []
+        while cell is not None:
+            route.append((cell % cols, cell // cols))
+            cell = self.parent[cell]
+        return route
+
+    def cost_to(self, cell: int) -> int | None:
+        """Returns the route cost from the root to a closed cell, or None if it is not closed."""
+        return self.g[cell] if cell in self.closed else None
+
+def batch_query(grid, queries, movement: str | None=None, trees: dict | None=None) -> list[dict]:
+    """
+    Answers many start/goal queries, sharing one search tree between all queries with a common endpoint.
+
+    Each query is rooted at whichever of its endpoints is shared by more queries (the goal on ties).
+    Within a group, nearer targets are answered first so later queries resume a tree that is already grown.
+
+    Parameters:
+        grid (GridModel): Grid to search.
+        queries (list[tuple[tuple[int, int], tuple[int, int]]]): (start, goal) pairs.
+        movement (str | None): 'Cardinal' or 'Diagonal'. Defaults to config.movement_type.
+        trees (dict[tuple[int, int], SearchTree] | None): Trees to resume, keyed by root.
+            New trees are added to it, so passing the same dict to later batches keeps resuming them.
+
+    Returns:
+        list[dict]: One result per query, in query order, with 'start', 'goal',
+        'route' (coordinates from start to goal, empty if unreachable), 'cost' and 'expansions'.
+    """
+    trees = trees if trees is not None else {}
+    queries = [(tuple(start), tuple(goal)) for start, goal in queries]
+    counts = Counter(point for query in queries for point in query)
+
+    groups = {}
+    for i, (start, goal) in enumerate(queries):
+        root, target = (goal, start) if counts[goal] >= counts[start] else (start, goal)
+        groups.setdefault(root, []).append((i, target))
+
+    results = [None] * len(queries)
+    for root, members in groups.items():
+        tree = trees.get(root)
+        if tree is None:
+            tree = trees[root] = SearchTree(grid, root, movement)
+        members.sort(key=lambda member: abs(member[1][0] - root[0]) + abs(member[1][1] - root[1]))
+        for i, target in members:
+            route, expansions = tree.query(target)
+            start, goal = queries[i]
+            if root == start:
+                route.reverse()
+            cost = tree.cost_to(target[1] * grid.cols + target[0]) if route else None
+            results[i] = {'start': start, 'goal': goal, 'route': route, 'cost': cost, 'expansions': expansions}
+    return results
@@ -0,0 +1,43 @@
+import threading
+from Core.grid_model import STATE_CODES
+
+WALL = STATE_CODES['wall']
+
+# Maps every state code to 1 for walls and 0 for anything passable.
+WALL_MASK = bytes(1 if code == WALL else 0 for code in range(256))
+
+# Largest number of entries kept in each session cache (subgoal graphs, dead-end indexes).
+CACHE_SIZE = 8
+
+# Guards the session caches, and the lock of each entry being built (see get_cached()).
+_cache_lock = threading.Lock()
+_building = {}
+
+def get_cached(cache: dict, key, build):
+    """
+    Returns an entry of a session cache, calling build() to make it if it is missing, and drops the least recently
+    used entries past CACHE_SIZE. Searches share the caches across threads (see Core/service.py): each entry is built
+    once, and other threads asking for it meanwhile wait for that build instead of repeating it.
+
+    Parameters:
+        cache (dict): The cache, most recently used entry last.
+        key: Key of the entry.
+        build (Callable[[], object]): Makes the entry.
+    """
+    with _cache_lock:
+        value = cache.get(key)
+        build_lock = _building.setdefault((id(cache), key), threading.Lock()) if value is None else None
+    if build_lock is not None:
+        with build_lock:
+            with _cache_lock:
+                value = cache.get(key)
+            if value is None:
+                value = build()
+    with _cache_lock:
+        cache.pop(key, None)
+        cache[key] = value # Most recently used last
+        while len(cache) > CACHE_SIZE:
+            del cache[next(iter(cache))]
+        if build_lock is not None and _building.get((id(cache), key)) is build_lock:
+            del _building[(id(cache), key)]
+    return value
@@ -0,0 +1,72 @@
+from array import array
+from functools import lru_cache
+import math
+import numpy as np
+
+# Heuristics selectable in the UI. Costs are scaled like config.get_move_cost(): 100 per straight move, 141 per diagonal.
+HEURISTICS = ['Manhattan', 'Diagonal', 'Euclidean', 'Chebyshev', 'None']
+
+def resolve(name: str, goal, weight: float=1, table_shape: tuple[int, int] | None=None):
+    """
+    Resolves a heuristic name into a function h(x, y) that estimates the weighted cost from (x, y) to the goal.
+    The name is looked up once, so the returned function does no string comparisons.
+
+    Parameters:
+        name (str): One of HEURISTICS. Unknown names estimate 0.
+        goal (tuple[int, int]): Goal coordinates.
+        weight (float): Weight the estimate is multiplied by.
+        table_shape (tuple[int, int] | None): (rows, cols) of the grid to precompute a table of every cell's
+            estimate for, making h a single lookup. Tables are cached per goal.
+
+    Returns:
+        Callable[[int, int], float]: The heuristic.
+    """
+    gx, gy = goal
+    if name not in HEURISTICS or name == 'None':
+        return lambda x, y: 0
+    if table_shape is not None:
+        rows, cols = table_shape
+        table = heuristic_table(name, gx, gy, rows, cols, weight)
+        return lambda x, y: table[y * cols + x]
+
+    if name == 'Manhattan':
+        def h(x, y):
+            return (100 * (abs(x - gx) + abs(y - gy))) * weight
+    elif name == 'Diagonal':
+        def h(x, y):
+            dx = abs(x - gx)
+            dy = abs(y - gy)
+            return (100 * (dx + dy) + (141 - 2 * 100) * min(dx, dy)) * weight
+    elif name == 'Euclidean':
+        def h(x, y):
+            return 100 * math.hypot(x - gx, y - gy) * weight
+    else:
+        def h(x, y):
+            return 100 * max(abs(x - gx), abs(y - gy)) * weight
+    return h
+
+@lru_cache(maxsize=8)
+def heuristic_table(name: str, gx: int, gy: int, rows: int, cols: int, weight: float=1) -> array:
+    """
+    Computes the weighted estimate of every cell of a grid for a goal with array operations.
+
+    Parameters:
+        name (str): One of HEURISTICS other than 'None'.
+        gx, gy (int, int): Goal coordinates.
+        rows, cols (int, int): Grid dimensions.
+        weight (float): Weight the estimates are multiplied by.
+
+    Returns:
+        array['d']: Estimate of each cell, packed row by row (y * cols + x).
+    """
+    dx = np.abs(np.arange(cols, dtype=np.float64) - gx)[np.newaxis, :]
+    dy = np.abs(np.arange(rows, dtype=np.float64) - gy)[:, np.newaxis]
+    if name == 'Manhattan':
+        table = 100 * (dx + dy)
+    elif name == 'Diagonal':
+        table = 100 * (dx + dy) + (141 - 2 * 100) * np.minimum(dx, dy)
+    elif name == 'Euclidean':
+        table = 100 * np.hypot(dx, dy)
+    else:
+        table = 100 * np.maximum(dx, dy)
+    return array('d', (table * weight).tobytes())
@@ -0,0 +1,321 @@
+from array import array
+import threading
+import weakref
+import zlib
+import numpy as np
+from Algorithms.grid_cache import WALL, WALL_MASK, get_cached
+
+# Indexes built this session, keyed by signature. The oldest are dropped past grid_cache.CACHE_SIZE.
+_indexes = {}
+
+# Index trackers of the edited grids searched this session. Dropped with their grid.
+_trackers = weakref.WeakKeyDictionary()
+
+def grid_signature(grid) -> int:
+    """Returns a checksum of the grid's walls and dimensions, used to detect a stale index."""
+    return _signature(grid.rows, grid.cols, bytes(grid.cells).translate(WALL_MASK))
+
+def _signature(rows: int, cols: int, walls: bytes) -> int:
+    """Helper function that returns grid_signature() of a wall mask."""
+    return zlib.crc32(f'{rows}x{cols}'.encode() + walls)
+
+class DeadEndIndex:
+    """
+    Splits the passable cells of a grid into nested pockets: regions joined to the rest of the map through
+    a single cell (dead ends, and corridors leading only to them). A route between two cells outside
+    a pocket never enters it, since it would have to leave through the cell it came in by.
+
+    Pockets are found on cardinal moves only. A diagonal move is only legal when both cells beside it
+    are passable, so it never joins cells that cardinal moves could not, and the index holds for both movements.
+
+    Wall edits are applied with updated(), which only relabels the smallest pocket holding every edited cell
+    and its neighbours: nothing outside a pocket can change while it is joined to the rest through the same cell.
+
+    Attributes:
+        rows, cols (int, int): Dimensions of the grid the index was built on.
+        signature (int): grid_signature() of the grid the index was built on.
+        walls (bytearray): Wall mask of the grid (1 for walls).
+        labels (array['i']): Innermost pocket of every cell (0 for walls).
+        pocket (np.ndarray): The labels as an int32 array, sharing their memory.
+        pocket_parent (list[int]): Pocket each pocket lies in (0 for a whole connected area).
+            A pocket's parent always has a lower number.
+        pocket_depth (list[int]): Nesting depth of each pocket.
+        pocket_entrance (list[int]): Packed cell each pocket is joined to its parent through (-1 for a whole connected area).
+    """
+    def __init__(self, grid):
+        """
+        Builds the index of a grid.
+
+        Parameters:
+            grid (GridModel): Grid to index.
+        """
+        self.rows = grid.rows
+        self.cols = grid.cols
+        self._build(bytearray(bytes(grid.cells).translate(WALL_MASK)))
+
+    def _build(self, walls: bytearray):
+        """Helper method that labels every pocket of a wall mask from scratch."""
+        self.walls = walls
+        self.signature = _signature(self.rows, self.cols, bytes(walls))
+        self.pocket_parent = [0]
+        self.pocket_depth = [0]
+        self.pocket_entrance = [-1]
+        self.labels = array('i', bytes(4 * len(walls)))
+        self.pocket = np.frombuffer(self.labels, dtype=np.int32)
+        self._find_pockets(bytes(walls), range(len(walls)))
+
+    def updated(self, changes: list[tuple[int, int, int]]) -> 'DeadEndIndex':
+        """
+        Returns the index of the grid after some edits, leaving this one unchanged for searches still using it.
+
+        Parameters:
+            changes (list[tuple[int, int, int]]): (cell, old code, new code) of each edited tile, oldest first.
+
+        Returns:
+            DeadEndIndex: The updated index, or this one if no wall was added or removed.
+        """
+        flips = {}
+        for cell, _, new in changes:
+            flips[cell] = 1 if new == WALL else 0
+        flips = {cell: wall for cell, wall in flips.items() if self.walls[cell] != wall}
+        if not flips:
+            return self
+        index = object.__new__(DeadEndIndex)
+        index.rows, index.cols = self.rows, self.cols
+        index.walls = bytearray(self.walls)
+        index.pocket_parent = list(self.pocket_parent)
+        index.pocket_depth = list(self.pocket_depth)
+        index.pocket_entrance = list(self.pocket_entrance)
+        index.labels = array('i', self.labels)
+        index.pocket = np.frombuffer(index.labels, dtype=np.int32)
+        index._relabel(flips)
+        if len(index.pocket_parent) > 2 * len(index.walls) + 1:
+            index._build(index.walls) # Drop the pockets left unused by earlier updates
+        index.signature = _signature(index.rows, index.cols, bytes(index.walls))
+        return index
+
+    def _relabel(self, flips: dict[int, int]):
+        """
+        Helper method that applies wall changes and labels the pockets again, within the smallest pocket holding
+        every changed cell and the passable cells beside them. If no single pocket holds them,
+        the whole connected areas they touch are labelled again.
+
+        Parameters:
+            flips (dict[int, int]): New wall mask value of each changed cell.
+        """
+        touched = set()
+        for cell in flips:
+            touched.add(self.labels[cell])
+            touched.update(self.labels[next_cell] for next_cell in self._neighbors(cell, self.walls))
+        touched.discard(0)
+        for cell, wall in flips.items():
+            self.walls[cell] = wall
+
+        outer = self._common_pocket(touched)
+        if outer:
+            tops, entrance = [outer], self.pocket_entrance[outer]
+        else:
+            tops, entrance = {self._top_pocket(label) for label in touched}, -1
+        inside = np.zeros(len(self.pocket_parent), dtype=bool)
+        inside[list(tops)] = True
+        parents = self.pocket_parent
+        for label in range(min(tops, default=len(parents)) + 1, len(parents)):
+            if inside[parents[label]]:
+                inside[label] = True
+        region = np.flatnonzero(inside[self.pocket])
+        region = np.union1d(region, [cell for cell, wall in flips.items() if not wall]).astype(np.int64)
+        if 2 * len(region) > len(self.walls) - self.walls.count(1):
+            self._build(self.walls) # Most passable cells change anyway, and a fresh build has less overhead
+            return
+        self.pocket[region] = 0
+
+        blocked = np.ones(len(self.walls), dtype=np.uint8)
+        blocked[region] = np.frombuffer(self.walls, dtype=np.uint8)[region]
+        roots = region.tolist()
+        if entrance != -1:
+            blocked[entrance] = 0
+            roots.insert(0, entrance)
+        self._find_pockets(blocked.tobytes(), roots, entrance)
+
+    def _common_pocket(self, labels: set[int]) -> int:
+        """Helper method that returns the innermost pocket holding every given pocket, or 0 if there is none."""
+        if not labels:
+            return 0
+        labels = iter(labels)
+        a = next(labels)
+        for b in labels:
+            while a != b:
+                if self.pocket_depth[a] >= self.pocket_depth[b]:
+                    a = self.pocket_parent[a]
+                else:
+                    b = self.pocket_parent[b]
+        return a
+
+    def _top_pocket(self, label: int) -> int:
+        """Helper method that returns the whole connected area a pocket lies in."""
+        while self.pocket_parent[label]:
+            label = self.pocket_parent[label]
+        return label
+
+    def _neighbors(self, cell: int, walls: bytes) -> tuple:
+        """Helper method that returns the passable cells a cardinal move away from a packed cell."""
+        cols = self.cols
+        x = cell % cols
+        candidates = []
+        if cell >= cols:
+            candidates.append(cell - cols)
+        if x > 0:
+            candidates.append(cell - 1)
+        if x < cols - 1:
+            candidates.append(cell + 1)
+        if cell + cols < len(walls):
+            candidates.append(cell + cols)
+        return tuple(next_cell for next_cell in candidates if not walls[next_cell])
+
+    def _find_pockets(self, walls: bytes, roots, entrance: int=-1):
+        """
+        Helper method that runs an iterative depth-first search for cut cells and labels every cell's innermost pocket.
+        A child whose subtree has no back edge above its parent starts a pocket hanging off that parent.
+
+        Parameters:
+            walls (bytes): Wall mask of the cells to label (1 for walls and for cells to leave alone).
+            roots (Iterable[int]): Cells to start searches from, in order.
+            entrance (int): Cell the labelled cells hang off. It keeps its own label. -1 if there is none.
+        """
+        size = len(walls)
+        disc = array('i', bytes(4 * size))
+        low = array('i', bytes(4 * size))
+        parent = array('i', [-1]) * size
+        order = []
+        timer = 0
+        for root in roots:
+            if walls[root] or disc[root]:
+                continue
+            timer += 1
+            disc[root] = low[root] = timer
+            order.append(root)
+            stack = [(root, self._neighbors(root, walls), 0)]
+            while stack:
+                cell, neighbors, i = stack[-1]
+                if i < len(neighbors):
+                    stack[-1] = (cell, neighbors, i + 1)
+                    next_cell = neighbors[i]
+                    if not disc[next_cell]:
+                        timer += 1
+                        disc[next_cell] = low[next_cell] = timer
+                        parent[next_cell] = cell
+                        order.append(next_cell)
+                        stack.append((next_cell, self._neighbors(next_cell, walls), 0))
+                    elif next_cell != parent[cell] and disc[next_cell] < low[cell]:
+                        low[cell] = disc[next_cell]
+                else:
+                    stack.pop()
+                    if stack and low[cell] < low[stack[-1][0]]:
+                        low[stack[-1][0]] = low[cell]
+
+        pocket = self.labels
+        for cell in order:
+            if cell == entrance:
+                continue
+            above = parent[cell]
+            if above == -1 or low[cell] >= disc[above]:
+                outer = pocket[above] if above != -1 else 0
+                self.pocket_parent.append(outer)
+                self.pocket_depth.append(self.pocket_depth[outer] + 1)
+                self.pocket_entrance.append(above)
+                pocket[cell] = len(self.pocket_parent) - 1
+            else:
+                pocket[cell] = pocket[above]
+
+    def skip_mask(self, start: tuple[int, int], goal: tuple[int, int]) -> bytes | None:
+        """
+        Returns the cells a search between two cells can skip: every cell outside the pockets leading
+        from the smallest pocket holding both cells down to the start's and the goal's own pockets,
+        except the cell that smallest pocket hangs off, which a route may pass through and come straight back.
+
+        Parameters:
+            start, goal (tuple[int, int], tuple[int, int]): Start and goal coordinates.
+
+        Returns:
+            bytes | None: 1 for each skippable cell, packed row by row. None if the start or goal is a wall.
+        """
+        a = int(self.pocket[start[1] * self.cols + start[0]])
+        b = int(self.pocket[goal[1] * self.cols + goal[0]])
+        if not a or not b:
+            return None
+        keep = np.zeros(len(self.pocket_parent), dtype=bool)
+        keep[0] = True # Walls are never expanded anyway
+        while a != b:
+            if self.pocket_depth[a] >= self.pocket_depth[b]:
+                keep[a] = True
+                a = self.pocket_parent[a]
+            else:
+                keep[b] = True
+                b = self.pocket_parent[b]
+        keep[a] = True
+        skip = (~keep[self.pocket]).astype(np.uint8)
+        if self.pocket_entrance[a] != -1:
+            skip[self.pocket_entrance[a]] = 0
+        return skip.tobytes()
+
+class IndexTracker:
+    """
+    Follows the wall edits of a grid with edit_listeners, so its dead-end index is updated rather than rebuilt.
+    Edits are collected as they happen and applied to the index the next time it is needed.
+    Keeps no reference to its grid, so it is dropped along with the grid.
+
+    Attributes:
+        index (DeadEndIndex | None): Index of the grid as of the last search, or None once the grid was replaced.
+        changes (list[tuple[int, int, int]]): Wall edits made since then.
+        lock (threading.Lock): Guards index and changes.
+    """
+    def __init__(self):
+        self.index = None
+        self.changes = []
+        self.lock = threading.Lock()
+
+    def on_edit(self, changes: list[tuple[int, int, int]] | None):
+        """Collects the edits that added or removed a wall. None (the whole grid was replaced) drops the index."""
+        with self.lock:
+            if changes is None:
+                self.index, self.changes = None, []
+                return
+            self.changes.extend(change for change in changes if (change[1] == WALL) != (change[2] == WALL))
+
+    def sync(self, index: DeadEndIndex):
+        """Sets the index of the grid's current walls."""
+        with self.lock:
+            self.index, self.changes = index, []
+
+    def current(self) -> DeadEndIndex | None:
+        """Returns the index with the edits collected so far applied, or None if there is no index."""
+        with self.lock:
+            if self.index is not None and self.changes:
+                self.index, self.changes = self.index.updated(self.changes), []
+            return self.index
+
+def get_index(grid) -> DeadEndIndex:
+    """
+    Returns the dead-end index of a grid, reused while a grid with the same walls is still in the cache.
+    An edited grid (or a snapshot of one) gets its previous index updated for the edits instead of a new build.
+    Concurrent searches of the same walls wait for a single build.
+
+    Parameters:
+        grid (GridModel): Grid to search. If it has edit_listeners, the index follows its edits.
+    """
+    key = grid_signature(grid)
+
+    def build():
+        for tracker in list(_trackers.values()):
+            index = tracker.current()
+            if index is not None and index.signature == key:
+                return index
+        return DeadEndIndex(grid)
+    index = get_cached(_indexes, key, build)
+    if hasattr(grid, 'edit_listeners'):
+        tracker = _trackers.get(grid)
+        if tracker is None:
+            tracker = _trackers[grid] = IndexTracker()
+            grid.edit_listeners.append(tracker.on_edit)
+        tracker.sync(index)
+    return index
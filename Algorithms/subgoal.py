@@ -0,0 +1,402 @@
+from collections import deque
+import heapq
+import json
+import os
+import threading
+import zlib
+import numpy as np
+import Core.config as config
+import Core.level_io as level_io
+from Algorithms.A_Star import Node
+from Algorithms.grid_cache import WALL_MASK, get_cached
+from Core.context import SearchContext
+
+# Graphs loaded or built this session, keyed by (movement, signature). The oldest are dropped past grid_cache.CACHE_SIZE.
+_graphs = {}
+
+def grid_signature(grid, movement: str) -> int:
+    """Returns a checksum of the grid's walls and dimensions for a moveset, used to detect stale graphs."""
+    walls = bytes(grid.cells).translate(WALL_MASK)
+    return zlib.crc32(f'{grid.rows}x{grid.cols}:{movement}'.encode() + walls)
+
+def find_subgoals(grid) -> list[int]:
+    """
+    Finds the corner cells of a grid: passable cells with a wall diagonally next to them
+    whose two cells next to that wall are both passable.
+
+    Parameters:
+        grid (GridModel): Grid to search.
+
+    Returns:
+        list[int]: Packed subgoal cells.
+    """
+    walls = np.frombuffer(bytes(grid.cells).translate(WALL_MASK), dtype=np.uint8).reshape(grid.rows, grid.cols)
+    padded = np.pad(walls, 1, constant_values=1).astype(bool)
+    rows, cols = grid.rows, grid.cols
+    free = ~padded
+    corners = np.zeros((rows, cols), dtype=bool)
+    for dx in (-1, 1):
+        for dy in (-1, 1):
+            corners |= (padded[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols]
+                        & free[1:1 + rows, 1 + dx:1 + dx + cols]
+                        & free[1 + dy:1 + dy + rows, 1:1 + cols])
+    corners &= free[1:1 + rows, 1:1 + cols]
+    return np.flatnonzero(corners).tolist()
+
+class SubgoalGraph:
+    """
+    A simple subgoal graph: the corner cells of a grid, joined wherever one corner can reach another
+    along a path whose cost equals the heuristic distance without passing another corner.
+
+    Any shortest route bends only at corners, so the optimal route between two cells is found by
+    joining them to the graph, searching the graph, and expanding each edge back into tiles.
+    Moves follow the same rules as config.get_moves() and config.diagonal_check().
+
+    Attributes:
+        rows, cols (int, int): Dimensions of the grid the graph was built on.
+        movement (str): 'Cardinal' or 'Diagonal'.
+        signature (int): grid_signature() of the grid the graph was built on.
+        cells (bytearray): Wall mask of the grid (1 for walls).
+        subgoals (set[int]): Packed subgoal cells.
+        edges (dict[int, list[int]]): Neighboring subgoals of each subgoal.
+    """
+    def __init__(self, grid, movement: str | None=None, edges: dict | None=None):
+        """
+        Builds the graph for a grid, unless its edges are given.
+
+        Parameters:
+            grid (GridModel): Grid to build the graph on.
+            movement (str | None): 'Cardinal' or 'Diagonal'. Defaults to config.movement_type.
+            edges (dict[int, list[int]] | None): Previously built edges, keyed by subgoal.
+        """
+        self.rows = grid.rows
+        self.cols = grid.cols
+        self.movement = movement or config.movement_type
+        self.signature = grid_signature(grid, self.movement)
+        self.cells = bytearray(bytes(grid.cells).translate(WALL_MASK))
+        if edges is None:
+            self.subgoals = set(find_subgoals(grid))
+            self.edges = {subgoal: self.direct_subgoals(subgoal, self.subgoals) for subgoal in self.subgoals}
+        else:
+            self.subgoals = set(edges)
+            self.edges = edges
+
+    def sectors(self) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+        """
+        Returns the pairs of moves whose combinations give every path with a cost equal to the heuristic:
+        the four quadrants for cardinal movement, the eight octants for diagonal movement.
+        """
+        if self.movement == 'Cardinal':
+            return [((dx, 0), (0, dy)) for dx in (-1, 1) for dy in (-1, 1)]
+        return [((dx, dy), cardinal) for dx in (-1, 1) for dy in (-1, 1) for cardinal in ((dx, 0), (0, dy))]
+
+    def compute_h(self, a: int, b: int) -> int:
+        """Returns the heuristic distance between two packed cells, which is the cost of any edge between them."""
+        dx = abs(a % self.cols - b % self.cols)
+        dy = abs(a // self.cols - b // self.cols)
+        if self.movement == 'Cardinal':
+            return 100 * (dx + dy)
+        return 100 * (dx + dy) + (141 - 2 * 100) * min(dx, dy)
+
+    def can_step(self, cell: int, dx: int, dy: int) -> bool:
+        """Checks whether a move from a packed cell is legal: in bounds, not into a wall, and not cutting a corner."""
+        x, y = cell % self.cols + dx, cell // self.cols + dy
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return False
+        if self.cells[y * self.cols + x]:
+            return False
+        return not (dx and dy) or not (self.cells[cell + dx] or self.cells[cell + dy * self.cols])
+
+    def _sweep(self, origin: int, a, b, stop, limit=None, target=None):
+        """
+        Helper method that searches the cells reachable from origin using only moves a and b.
+
+        Parameters:
+            origin (int): Packed cell to sweep from.
+            a, b (tuple[int, int], tuple[int, int]): The two moves allowed.
+            stop (set[int]): Cells that are recorded but not swept past.
+            limit (tuple[int, int] | None): Maximum number of a and b moves.
+            target (int | None): Cell to stop at.
+
+        Returns:
+            tuple[list[int], dict[int, int]]: Stop cells reached, and the parent of every cell reached.
+        """
+        step_a = a[1] * self.cols + a[0]
+        step_b = b[1] * self.cols + b[0]
+        parents = {origin: None}
+        found = []
+        queue = deque([(origin, 0, 0)])
+        while queue:
+            cell, i, j = queue.popleft()
+            if cell == target:
+                break
+            if cell != origin and cell in stop:
+                found.append(cell)
+                continue
+            for move, step, ni, nj in ((a, step_a, i + 1, j), (b, step_b, i, j + 1)):
+                next_cell = cell + step
+                if next_cell in parents or (limit and (ni > limit[0] or nj > limit[1])):
+                    continue
+                if self.can_step(cell, *move):
+                    parents[next_cell] = cell
+                    queue.append((next_cell, ni, nj))
+        return found, parents
+
+    def direct_subgoals(self, cell: int, stop) -> list[int]:
+        """
+        Returns the cells in stop that can be reached from a cell along a heuristic-cost path
+        that passes no other cell in stop.
+
+        Parameters:
+            cell (int): Packed cell.
+            stop (set[int]): Candidate cells, usually the subgoals.
+        """
+        found = set()
+        for a, b in self.sectors():
+            found.update(self._sweep(cell, a, b, stop)[0])
+        found.discard(cell)
+        return list(found)
+
+    def expand_edge(self, a: int, b: int) -> list[int]:
+        """
+        Expands a graph edge into tiles.
+
+        Returns:
+            list[int]: Packed cells from a to b, including both ends.
+        """
+        dx = b % self.cols - a % self.cols
+        dy = b // self.cols - a // self.cols
+        sx, sy = (dx > 0) - (dx < 0), (dy > 0) - (dy < 0)
+        if self.movement == 'Cardinal':
+            moves, limit = ((sx, 0), (0, sy)), (abs(dx), abs(dy))
+        elif abs(dx) >= abs(dy):
+            moves, limit = ((sx, sy), (sx, 0)), (abs(dy), abs(dx) - abs(dy))
+        else:
+            moves, limit = ((sx, sy), (0, sy)), (abs(dx), abs(dy) - abs(dx))
+        parents = self._sweep(a, *moves, set(), limit, b)[1]
+        tiles = []
+        cell = b
+        while cell is not None:
+            tiles.append(cell)
+            cell = parents[cell]
+        tiles.reverse()
+        return tiles
+
+    def save(self, file_name: str):
+        """Writes the graph to a file, replacing it in one step so readers never see half of it."""
+        index = {subgoal: i for i, subgoal in enumerate(sorted(self.subgoals))}
+        edges = [[index[a], index[b]] for a, neighbors in self.edges.items() for b in neighbors if a < b]
+        temp_file = f'{file_name}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump({'rows': self.rows, 'cols': self.cols, 'movement': self.movement, 'signature': self.signature,
+                       'subgoals': sorted(self.subgoals), 'edges': edges}, f)
+        os.replace(temp_file, file_name)
+
+    @classmethod
+    def load(cls, file_name: str, grid):
+        """
+        Reads a graph from a file.
+
+        Parameters:
+            file_name (str): Graph file.
+            grid (GridModel): Grid the graph is used on.
+
+        Returns:
+            SubgoalGraph | None: The graph, or None if it was built for different walls or dimensions,
+                or the file cannot be read (such as one cut short by a crash), so that it is rebuilt.
+        """
+        try:
+            with open(file_name, 'r') as f:
+                data = json.load(f)
+            if data['signature'] != grid_signature(grid, data['movement']):
+                return None
+            subgoals = data['subgoals']
+            edges = {subgoal: [] for subgoal in subgoals}
+            for a, b in data['edges']:
+                edges[subgoals[a]].append(subgoals[b])
+                edges[subgoals[b]].append(subgoals[a])
+        except (ValueError, KeyError, IndexError, TypeError):
+            return None
+        return cls(grid, data['movement'], edges)
+
+def graph_file(level_name: str, movement: str) -> str:
+    """Returns the path of a level's subgoal graph, saved next to the level file."""
+    base = os.path.splitext(level_io.level_path(level_name))[0]
+    return f'{base}.{movement.lower()}.sgraph'
+
+def matches_level(grid, level_name: str) -> bool:
+    """Returns whether a level file on disk has the same walls and dimensions as a grid, e.g. one not edited since loading."""
+    try:
+        level = level_io.read_level(level_name)
+    except (OSError, ValueError, KeyError, IndexError, TypeError, zlib.error):
+        return False
+    return grid_signature(level, '') == grid_signature(grid, '')
+
+def get_graph(grid, level_name: str='', movement: str | None=None) -> SubgoalGraph:
+    """
+    Returns the subgoal graph of a grid: reused from this session, loaded from next to the level,
+    or built (and saved next to the level, when there is one and the grid's walls still match the file,
+    so a graph built for unsaved edits never replaces the level's own).
+
+    Parameters:
+        grid (GridModel): Grid to search.
+        level_name (str): Level file the grid was loaded from, if any.
+        movement (str | None): 'Cardinal' or 'Diagonal'. Defaults to config.movement_type.
+    """
+    movement = movement or config.movement_type
+    file_name = graph_file(level_name, movement) if level_name else None
+
+    def build():
+        graph = None
+        if file_name and os.path.exists(file_name):
+            graph = SubgoalGraph.load(file_name, grid)
+        if graph is None:
+            graph = SubgoalGraph(grid, movement)
+            if file_name and matches_level(grid, level_name):
+                graph.save(file_name)
+        return graph
+    return get_cached(_graphs, (movement, grid_signature(grid, movement)), build)
+
+class Pathfinder:
+    """
+    Implements A* over a subgoal graph, with the start and goal joined to it for the query.
+    The route found is expanded back into tiles.
+
+    Attributes:
+        graph (SubgoalGraph): The preprocessed graph.
+        start, goal (int, int): Packed start and goal cells.
+        goal_edges (set[int]): Subgoals joined to the goal.
+        route (list[Node]): List of nodes along the solution route, from goal to start.
+        frontier (list): Heap of (f, counter, cell) entries.
+        g (dict[int, int]): Best known cost of each graph node.
+        parent (dict[int, int | None]): Parent of each graph node.
+        visited (set[int]): Graph nodes expanded.
+        counter (int): Counter used for the frontier.
+        last_popped (tuple[int, int] | None): Coordinates popped from the frontier by the last step.
+        last_enqueued (list[tuple[int, int]]): Coordinates enqueued by the last step.
+        context (SearchContext): Run state of the search.
+    """
+    def __init__(self, grid, sx, sy, gx, gy, graph: SubgoalGraph, context: SearchContext | None=None):
+        """
+        Initializes the search and joins the start and goal to the graph.
+
+        Args:
+            grid (GridModel): The grid environment.
+            sx, sy (int, int): Starting coordinates of the search agent.
+            gx, gy (int, int): Goal coordinates.
+            graph (SubgoalGraph): Subgoal graph of the grid.
+            context (SearchContext | None): Run state of the search. Defaults to a new context for the graph's movement.
+        """
+        self.grid = grid
+        self.graph = graph
+        self.context = context or SearchContext(graph.movement)
+        self.start = sy * grid.cols + sx
+        self.goal = gy * grid.cols + gx
+
+        self.context.simulating = True
+        self.route = []
+        self.visited = set()
+        self.last_popped = None
+        self.last_enqueued = []
+        self.g = {self.start: 0}
+        self.parent = {self.start: None}
+        self.frontier = [(graph.compute_h(self.start, self.goal), 0, self.start)]
+        self.counter = 1
+        self.start_edges = graph.direct_subgoals(self.start, graph.subgoals | {self.goal})
+        self.goal_edges = set(graph.direct_subgoals(self.goal, graph.subgoals))
+
+    def unpack(self, cell: int) -> tuple[int, int]:
+        return cell % self.grid.cols, cell // self.grid.cols
+
+    def step(self):
+        """
+        Expands a single graph node.
+
+        Returns:
+            bool: True if search should continue, false if complete or aborted.
+        """
+        self.last_popped = None
+        self.last_enqueued = []
+        if not self.context.simulating:
+            return False # Search is stopped externally
+        while self.frontier and self.frontier[0][2] in self.visited:
+            heapq.heappop(self.frontier) # Stale entry
+        if not self.frontier:
+            self.context.simulating = False
+            self.context.failed = True
+            return False # Search failed
+
+        cell = heapq.heappop(self.frontier)[2]
+        self.last_popped = self.unpack(cell)
+        if cell == self.goal:
+            self._goal_found()
+            return False # Search completed successfully
+        self.visited.add(cell)
+
+        neighbors = self.start_edges if cell == self.start else self.graph.edges.get(cell, [])
+        if cell in self.goal_edges:
+            neighbors = [*neighbors, self.goal]
+        for next_cell in neighbors:
+            if next_cell in self.visited:
+                continue
+            g = self.g[cell] + self.graph.compute_h(cell, next_cell)
+            if g < self.g.get(next_cell, g + 1):
+                self.g[next_cell] = g
+                self.parent[next_cell] = cell
+                heapq.heappush(self.frontier, (g + self.graph.compute_h(next_cell, self.goal), self.counter, next_cell))
+                self.counter += 1
+                self.last_enqueued.append(self.unpack(next_cell))
+        return True # Search should continue
+
+    def _goal_found(self):
+        """
+        Helper method that expands the graph route into tiles and builds the route from goal back to start.
+        """
+        self.context.simulating = False
+        corners = []
+        cell = self.goal
+        while cell is not None:
+            corners.append(cell)
+            cell = self.parent[cell]
+        corners.reverse()
+
+        tiles = [self.start]
+        for a, b in zip(corners, corners[1:]):
+            tiles.extend(self.graph.expand_edge(a, b)[1:])
+        node = None
+        for cell in tiles:
+            x, y = self.unpack(cell)
+            if node is None:
+                node = Node(x, y, None, [], 0, 0)
+            else:
+                move = [x - node.x, y - node.y]
+                node = Node(x, y, node, move, node.g + config.get_move_cost(move), 0)
+            self.route.append(node)
+        self.route.reverse()
+
+    def get_frontier(self):
+        """
+        Returns the coordinates of graph nodes currently in the frontier.
+
+        Returns:
+            list[list[int, int]]: List of [x, y] positions.
+        """
+        return [list(self.unpack(entry[2])) for entry in self.frontier if entry[2] not in self.visited]
+
+    def get_visited(self):
+        """
+        Returns the coordinates of graph nodes that have been expanded.
+
+        Returns:
+            list[tuple[int, int]]: List of visited [x, y] coordinates.
+        """
+        return [self.unpack(cell) for cell in self.visited]
+
+    def get_route(self):
+        """
+        Returns the reconstructed route from start to goal.
+
+        Returns:
+            list[Node]: Ordered list of nodes representing the final route, from goal back to start.
+        """
+        return self.route
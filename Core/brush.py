@@ -0,0 +1,88 @@
+from functools import lru_cache
+
+def bresenham(x0: int, y0: int, x1: int, y1: int) -> list[tuple[int, int]]:
+    """
+    Rasterises the line between two tiles with Bresenham's algorithm.
+
+    Parameters:
+        x0, y0 (int, int): First tile.
+        x1, y1 (int, int): Last tile.
+
+    Returns:
+        list[tuple[int, int]]: Tiles along the line, including both ends.
+    """
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    step_x = 1 if x0 < x1 else -1
+    step_y = 1 if y0 < y1 else -1
+    err = dx + dy
+    line = []
+    while True:
+        line.append((x0, y0))
+        if x0 == x1 and y0 == y1:
+            return line
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += step_x
+        if e2 <= dx:
+            err += dx
+            y0 += step_y
+
+@lru_cache(maxsize=None)
+def brush_offsets(radius: int) -> tuple[tuple[int, int], ...]:
+    """
+    Returns the tile offsets covered by a round brush.
+
+    Parameters:
+        radius (int): Brush radius in tiles. 0 covers a single tile.
+
+    Returns:
+        tuple[tuple[int, int], ...]: (dx, dy) offsets from the brush center.
+    """
+    limit = radius * radius + radius
+    return tuple((dx, dy)
+                 for dy in range(-radius, radius + 1)
+                 for dx in range(-radius, radius + 1)
+                 if dx * dx + dy * dy <= limit)
+
+class BrushStroke:
+    """
+    Buffers the mouse positions of a brush stroke until they are applied once per frame.
+
+    Attributes:
+        mode             (str): 'draw' or 'erase'.
+        points (list[tuple[int, int]]): Buffered canvas positions (px) not yet applied.
+        last (tuple[int, int] | None): Last tile applied, which the next position is connected to.
+    """
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.points = []
+        self.last = None
+
+    def add(self, px: int, py: int):
+        """Buffers a canvas position (px)."""
+        self.points.append((px, py))
+
+    def take_path(self, grid) -> list[tuple[int, int]]:
+        """
+        Converts the buffered positions into a connected path of tiles and clears the buffer.
+        Consecutive positions are joined by Bresenham lines, starting from the last tile already applied.
+
+        Parameters:
+            grid (Grid): Grid whose viewport maps positions to tiles.
+
+        Returns:
+            list[tuple[int, int]]: Tiles along the stroke, in drawing order, without repeats.
+        """
+        path = []
+        for px, py in self.points:
+            x = (px - grid.offset_x) // grid.tile_size
+            y = (py - grid.offset_y) // grid.tile_size
+            if self.last is None:
+                path.append((x, y))
+            elif (x, y) != self.last:
+                path.extend(bresenham(*self.last, x, y)[1:])
+            self.last = (x, y)
+        self.points = []
+        return list(dict.fromkeys(path))
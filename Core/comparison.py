@@ -0,0 +1,160 @@
+import time
+from Core.context import SearchContext
+from Core.grid_model import GridModel, STATE_CODES
+from Core.pathfinders import create_pathfinder, get_route_cost
+from Core.timeline import OPEN, CLOSED, ROUTE
+
+# Maps simulation tiles to empty, so a snapshot holds only walls, start and goal.
+SNAPSHOT_MAP = bytes(code if code <= STATE_CODES['goal'] else STATE_CODES['empty'] for code in range(256))
+
+# Number of steps a search takes per turn of the scheduler.
+STEP_CHUNK = 32
+
+def snapshot(grid) -> GridModel:
+    """
+    Returns a read-only copy of a grid's walls, start and goal.
+    Its cells are immutable bytes, so every search given the snapshot can share it safely.
+
+    Parameters:
+        grid (GridModel): Grid to copy.
+    """
+    return GridModel(grid.rows, grid.cols, bytes(grid.cells).translate(SNAPSHOT_MAP))
+
+class Entry:
+    """
+    One search taking part in a comparison, with its statistics and display frame.
+
+    Attributes:
+        label (str): Name shown in the results, e.g. 'A* (Manhattan, 1)'.
+        search (Pathfinder): The search.
+        steps, expansions (int, int): Steps taken and cells expanded so far.
+        seconds (float): Time spent inside the search's own steps.
+        frame (bytearray): Timeline frame code (EMPTY, OPEN, CLOSED or ROUTE) of every packed cell.
+        dirty (bool): Whether the frame changed since the display last read it.
+    """
+    def __init__(self, label: str, search, size: int):
+        self.label = label
+        self.search = search
+        self.steps = 0
+        self.expansions = 0
+        self.seconds = 0.0
+        self.frame = bytearray(size)
+        self.dirty = True
+
+    @property
+    def running(self) -> bool:
+        return self.search.context.simulating
+
+    def result(self) -> dict:
+        """
+        Returns:
+            dict: Label, status, steps, expansions, milliseconds, route length and route cost.
+        """
+        route = self.search.get_route()
+        if self.running:
+            status = 'running'
+        elif route:
+            status = 'found'
+        else:
+            status = 'cancelled' if self.search.context.cancelled else 'failed'
+        return {
+            'label': self.label,
+            'status': status,
+            'steps': self.steps,
+            'expansions': self.expansions,
+            'ms': round(self.seconds * 1000, 3),
+            'route_length': len(route),
+            'route_cost': get_route_cost(self.search),
+        }
+
+class Comparison:
+    """
+    Runs several searches on one shared snapshot of a grid, interleaving their steps under a time budget.
+
+    Every search reads the same immutable snapshot, so the map is copied once however many searches
+    take part. Each search gets its own SearchContext and display frame.
+
+    Attributes:
+        snapshot (GridModel): Read-only walls, start and goal shared by every search.
+        entries (list[Entry]): The searches, in the order they were given.
+    """
+    def __init__(self, grid, configs, level_name: str='', movement: str='Cardinal'):
+        """
+        Takes the snapshot and creates the searches.
+
+        Parameters:
+            grid (GridModel): Grid to compare on. Must have a start and a goal.
+            configs (list[tuple[str, str, str]]): (algorithm, heuristic, weight) of each search.
+            level_name (str): Level file the grid was loaded from, if any.
+            movement (str): 'Cardinal' or 'Diagonal'.
+        """
+        self.snapshot = snapshot(grid)
+        start = self.snapshot.get_start()
+        goal = self.snapshot.get_goal()
+        size = grid.rows * grid.cols
+        self.entries = []
+        for algo, heuristic, weight in configs:
+            search = create_pathfinder(algo, self.snapshot, start, goal, heuristic, weight, level_name,
+                                       SearchContext(movement))
+            label = f'{algo} ({heuristic}, {weight})' if algo in ['A*', 'IDA*'] else algo
+            self.entries.append(Entry(label, search, size))
+            self.entries[-1].frame[self.snapshot.sy * grid.cols + self.snapshot.sx] = OPEN
+
+    @property
+    def running(self) -> bool:
+        return any(entry.running for entry in self.entries)
+
+    def run_slice(self, budget: float) -> bool:
+        """
+        Steps the unfinished searches in turn, STEP_CHUNK steps each, until the budget is spent.
+        Each search is only charged for the time spent in its own steps.
+
+        Parameters:
+            budget (float): Seconds to spend.
+
+        Returns:
+            bool: True while any search is still running.
+        """
+        deadline = time.perf_counter() + budget
+        while time.perf_counter() < deadline:
+            running = [entry for entry in self.entries if entry.running]
+            if not running:
+                return False
+            for entry in running:
+                self._advance(entry)
+        return self.running
+
+    def _advance(self, entry: Entry):
+        """Helper method that takes up to STEP_CHUNK steps of a search and records them in its frame."""
+        search = entry.search
+        frame = entry.frame
+        cols = self.snapshot.cols
+        elapsed = 0.0
+        for _ in range(STEP_CHUNK):
+            begin = time.perf_counter()
+            running = search.step()
+            elapsed += time.perf_counter() - begin
+            entry.steps += 1
+            for x, y in search.last_enqueued:
+                frame[y * cols + x] = OPEN
+            if search.last_popped is not None:
+                entry.expansions += 1
+                x, y = search.last_popped
+                frame[y * cols + x] = CLOSED
+            if not running:
+                search.context.simulating = False
+                for node in search.get_route():
+                    frame[node.y * cols + node.x] = ROUTE
+                break
+        entry.seconds += elapsed
+        entry.dirty = True
+
+    def cancel(self):
+        """Cancels every search still running."""
+        for entry in self.entries:
+            if entry.running:
+                entry.search.context.cancel()
+
+    def results(self) -> list[dict]:
+        """Returns Entry.result() of every search."""
+        return [entry.result() for entry in self.entries]
@@ -1,19 +1,28 @@
-simulating = False
-failed = False
-
 # Simulation config
+# Movement type selected in the GUI. Each search copies it into its own SearchContext.
 movement_type = 'Cardinal'
 sx, sy = None, None
 gx, gy = None, None
 level_name = ''
 heuristic = 'Diagonal Manhattan'
 heuristic_weight = 1
-paused = False
+# Whether A*-style searches precompute a per-goal table of heuristic estimates.
+heuristic_table = False
+# Whether A*, BFS and DFS skip dead ends that cannot lie on the route (see Algorithms/pruning.py).
+dead_end_pruning = False
+# Whether searches and level loads are traced with tracemalloc and their memory is reported (see Core/memory.py).
+memory_report = False
 delay = 1
 speed = 'Normal'
+execution_mode = 'Inline'
+node_cap = 100000
+anytime_weight = 3.0
+anytime_weight_step = 0.5
+anytime_deadline = 10.0
 
 # Editor config
 draw_type = 'wall'
+brush_radius = 0
 editor_has_start = False
 editor_has_goal = False
 
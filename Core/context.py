@@ -0,0 +1,34 @@
+import Core.config as config
+
+class SearchContext:
+    """
+    The run state of a single search, shared by its Pathfinder and whatever drives it (the GUI, a worker thread,
+    the headless runner). Every search gets its own context, so any number of searches can exist at once
+    and run in separate threads without touching module state.
+
+    Attributes:
+        movement_type (str): 'Cardinal' or 'Diagonal'.
+        simulating   (bool): True while the search is running. Cleared when it finishes or is cancelled.
+        failed       (bool): True if the search finished without finding a route.
+        paused       (bool): True while the driver has paused the search.
+        cancelled    (bool): True once the search has been cancelled.
+    """
+    def __init__(self, movement_type: str='Cardinal'):
+        """
+        Parameters:
+            movement_type (str): 'Cardinal' or 'Diagonal'.
+        """
+        self.movement_type = movement_type
+        self.simulating = False
+        self.failed = False
+        self.paused = False
+        self.cancelled = False
+
+    def get_moves(self):
+        """Returns the list of moves of this context's movement type."""
+        return config.get_moves(self.movement_type)
+
+    def cancel(self):
+        """Stops the search. Its next step() returns False."""
+        self.cancelled = True
+        self.simulating = False
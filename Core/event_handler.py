@@ -1,9 +1,22 @@
 import Core.config as config
-import json
 import os
+import queue
+import time
 from customtkinter import filedialog, CTkInputDialog
-import Algorithms.BFSDFS as BFSDFS, Algorithms.A_Star as A_Star
+import Algorithms.BFSDFS as BFSDFS
+from Core.context import SearchContext
+from Core.pathfinders import ALGORITHMS, create_pathfinder
+from Core.comparison import Comparison
+from Core.memory import MemoryReport
+import Core.level_io as level_io
+import Core.generators as generators
+from Core.search_worker import SearchWorker, DELTA
+from Core.trace import SearchTrace
+from Core.timeline import TraceTimeline, frame_changes, ROUTE
 from UI.grid import Grid
+from UI.comparison import ComparisonWindow
+from Core.grid_model import STATE_CODES
+from Core.brush import BrushStroke, brush_offsets
 from tkinter import messagebox
 
 # Delay is the delay (ms) in performing search steps.
@@ -27,98 +40,219 @@ SPEED_TO_STEP_RATE = {
     'Very Slow': 1,
 }
 
+# Delay (ms) between drains of a background search's update queue.
+FRAME_DELAY = 16
+# Time budget (ms) spent applying background search updates per frame.
+FRAME_BUDGET = 12
+
+# Run state of the search or replay shown by the GUI.
+context = SearchContext(config.movement_type)
+worker = None
+replay = None
+last_trace = None
+timeline = None
+shown_frame = None
+pending_seek = None
+stroke = None
+brush_pending = False
+comparison = None
+comparison_window = None
+# Memory report of the running search, when config.memory_report is on.
+search_memory = None
+
+# Grids with at least this many tiles are saved compressed unless an extension is given.
+COMPRESS_CELLS = 250000
+
+# Algorithms compared when none are entered.
+DEFAULT_COMPARISON = ['BFS', 'A*', 'GBeFS']
+
+# Tile states of timeline frame codes.
+FRAME_STATES = ('empty', 'open', 'closed', 'route')
+
 def draw(event, GUI):
     """
-    Draw on grid when mouse clicked.
+    Draw on grid when mouse clicked or dragged.
+    The position is buffered and applied with the rest of the stroke once per frame.
     
     Paramaters:
-        grid (Grid): Grid to draw on.
+        event: Mouse event.
+        GUI  : Contains the grid to draw on.
     """
-    if config.draw_type in ['start', 'goal'] and config.simulating:
-        return
-    if config.draw_type == 'start' and config.editor_has_start:
-        config.draw_type = 'wall'
-    if config.draw_type == 'goal' and config.editor_has_goal:
-        config.draw_type = 'wall'
-    
-    canvas = GUI.canvas
-    grid = GUI.grid
+    _buffer_brush(event, GUI, 'draw')
 
-    canvas_width = canvas.winfo_width()
-    canvas_height = canvas.winfo_height()
-    grid_width = grid.cols * grid.tile_size
-    grid_height = grid.rows * grid.tile_size
-    offset_x = (canvas_width - grid_width) // 2
-    offset_y = (canvas_height - grid_height) // 2
+def erase(event, GUI):
+    """
+    Erase on grid when mouse clicked or dragged.
+    The position is buffered and applied with the rest of the stroke once per frame.
 
-    x = (event.x - offset_x) // grid.tile_size
-    y = (event.y - offset_y) // grid.tile_size
-    try:
-        state = grid.grid[y][x].state
-    except:
-        return
-    if state == 'start' and config.draw_type == 'wall':
+    Paramaters:
+        event: Mouse event.
+        GUI  : Contains the grid to erase on.
+    """
+    _buffer_brush(event, GUI, 'erase')
+
+def end_stroke(event, GUI):
+    """Applies the rest of the current brush stroke when the mouse is released, and ends the stroke."""
+    global stroke
+    if stroke is not None:
+        _apply_brush(GUI)
+        GUI.grid.history.commit()
+        stroke = None
+
+def undo(GUI):
+    """
+    Ends the current brush stroke, if any, and reverts the most recent stroke.
+    Does nothing while a search is running, since the stroke may have moved the start or goal.
+    """
+    end_stroke(None, GUI)
+    if context.simulating:
         return
-    if state == 'goal' and config.draw_type == 'wall':
+    GUI.grid.undo()
+
+def redo(GUI):
+    """
+    Ends the current brush stroke, if any, and applies the most recently undone stroke again.
+    Does nothing while a search is running, since the stroke may move the start or goal.
+    """
+    end_stroke(None, GUI)
+    if context.simulating:
         return
-    if config.draw_type in ['start', 'goal']:
-        grid.set_obj(x, y)
-        grid.draw()
-    grid.update_tile(x, y, config.draw_type)
-    canvas.update_idletasks()
+    GUI.grid.redo()
 
-def erase(event, GUI):
+def _buffer_brush(event, GUI, mode):
     """
-    Erase on grid when mouse clicked.
+    Buffers a mouse position of a brush stroke and schedules the buffer to be applied on the next frame.
 
-    Paramaters:
-        grid (Grid): Grid to draw on.
+    Parameters:
+        event: Mouse event.
+        GUI  : Reference to the GUI used for scheduling.
+        mode (str): 'draw' or 'erase'.
+    """
+    global stroke, brush_pending
+    if stroke is None or stroke.mode != mode:
+        if stroke is not None:
+            _apply_brush(GUI)
+            GUI.grid.history.commit()
+        stroke = BrushStroke(mode)
+    stroke.add(event.x, event.y)
+    if not brush_pending:
+        brush_pending = True
+        GUI.after(FRAME_DELAY, lambda: _apply_brush(GUI))
+
+def _apply_brush(GUI):
+    """
+    Rasterises the buffered positions of the current stroke and commits
+    every resulting tile change to the grid as one batch.
     """
-    canvas = GUI.canvas
+    global brush_pending
+    brush_pending = False
+    if stroke is None:
+        return
     grid = GUI.grid
+    path = stroke.take_path(grid)
+    if stroke.mode == 'draw':
+        edits = _draw_path(grid, path)
+    else:
+        edits = _erase_path(grid, path)
+    grid.apply_edits(edits)
 
-    canvas_width = canvas.winfo_width()
-    canvas_height = canvas.winfo_height()
+def _draw_path(grid, path):
+    """
+    Returns the edits made by drawing along a path with the current brush.
+    Start and goal positions are placed immediately on the first tile of the path, after which the stroke draws walls.
 
-    grid_width = grid.cols * grid.tile_size
-    grid_height = grid.rows * grid.tile_size
+    Parameters:
+        grid (Grid): Grid to draw on.
+        path (list[tuple[int, int]]): Tiles along the stroke.
 
-    offset_x = (canvas_width - grid_width) // 2
-    offset_y = (canvas_height - grid_height) // 2
+    Returns:
+        dict[int, str]: New state of each edited tile, keyed by packed cell.
+    """
+    offsets = brush_offsets(config.brush_radius)
+    edits = {}
+    for x, y in path:
+        if grid.is_OOB(x, y):
+            continue
+        if config.draw_type in ['start', 'goal']:
+            if context.simulating:
+                return edits
+            if config.draw_type == 'start' and config.editor_has_start:
+                config.draw_type = 'wall'
+            elif config.draw_type == 'goal' and config.editor_has_goal:
+                config.draw_type = 'wall'
+            else:
+                if grid.get(x, y) not in ['start', 'goal']:
+                    grid.apply_edits({y * grid.cols + x: config.draw_type})
+                continue
+        for dx, dy in offsets:
+            nx, ny = x + dx, y + dy
+            if grid.get(nx, ny) in ['start', 'goal'] or grid.is_OOB(nx, ny):
+                continue
+            edits[ny * grid.cols + nx] = config.draw_type
+    return edits
+
+def _erase_path(grid, path):
+    """
+    Returns the edits made by erasing along a path with the current brush.
+    Start and goal positions are only erased while placing them.
 
-    x = (event.x - offset_x) // grid.tile_size
-    y = (event.y - offset_y) // grid.tile_size
+    Parameters:
+        grid (Grid): Grid to erase on.
+        path (list[tuple[int, int]]): Tiles along the stroke.
 
-    if config.draw_type in ['start', 'goal']:
-        grid.clear_obj(x, y)
-        grid.draw()
-        
-    grid.update_tile(x, y, 'empty')
-    canvas.update_idletasks()
+    Returns:
+        dict[int, str]: New state of each edited tile, keyed by packed cell.
+    """
+    offsets = brush_offsets(config.brush_radius)
+    erase_objectives = config.draw_type in ['start', 'goal']
+    edits = {}
+    for x, y in path:
+        for dx, dy in offsets:
+            nx, ny = x + dx, y + dy
+            if grid.is_OOB(nx, ny):
+                continue
+            if grid.get(nx, ny) in ['start', 'goal'] and not erase_objectives:
+                continue
+            edits[ny * grid.cols + nx] = 'empty'
+    return edits
 
 def run_algorithm(algo, grid: Grid, GUI, speed, heuristic: str, weight):
+    stop_search()
+
+    shown_route = None
+
     def update():
-        grid.show_open(search.get_frontier())
-        grid.show_closed(search.get_visited())
-        route = search.get_route()
-        if route and not config.simulating:
-                grid.visualize_route(route, GUI, 1)
+        nonlocal shown_route
+        grid.show_open(current.get_frontier())
+        grid.show_closed(current.get_visited())
+        route = current.get_route()
+        # Anytime searches publish a new route list for every improvement while they keep running
+        if route and (not current.context.simulating or route is not shown_route):
+                shown_route = route
+                grid.visualize_route(route, GUI, 1, SPEED_TO_STEP_RATE.get(config.speed, 10))
         GUI.canvas.update_idletasks()
 
     def simulation_step():
         global steps
 
-        if not config.simulating:
+        if current.context.cancelled:
+            return # Search was stopped or replaced
+        if not current.context.simulating:
             update()
             return
 
-        if not config.paused:
+        if not current.context.paused:
             steps += 1
             if steps % SPEED_TO_STEP_RATE.get(config.speed, 10) == 0:
                 update()
-            if not search.step():
-                config.simulating = False
-                if config.failed:
+            running = current.step()
+            trace.record(current)
+            if not running:
+                current.context.simulating = False
+                _finish_memory_report(GUI)
+                trace.finish(current.get_route())
+                _store_trace(trace, GUI)
+                if current.context.failed:
                     messagebox.showinfo(title='Search failed to find a path.', message='The search has completed and failed to find a path.')
                 update()
                 return
@@ -126,20 +260,6 @@ def run_algorithm(algo, grid: Grid, GUI, speed, heuristic: str, weight):
         GUI.after(SPEED_TO_DELAY.get(config.speed, 50), simulation_step)
 
     _clear_sim_results(grid)
-    grid.draw()
-
-
-    canvas_width = GUI.canvas.winfo_width()
-    canvas_height = GUI.canvas.winfo_height()
-    grid.tile_size = min(canvas_width // grid.cols, canvas_height // grid.rows)
-    grid.draw()
-
-    if algo == 'GBeFS' or weight == 'Infinity':
-        weight = 100000
-    if algo == 'UCS':
-        weight = 1
-        heuristic = 'None'
-    weight = float(weight)
 
     sx, sy = grid.get_start()
     gx, gy = grid.get_goal()
@@ -148,31 +268,321 @@ def run_algorithm(algo, grid: Grid, GUI, speed, heuristic: str, weight):
         print("ERROR: Invalid start or goal!")
         return
 
-    global search
-    if algo in ['A*', 'GBeFS', 'UCS']:
-        search = A_Star.Pathfinder(grid, sx, sy, gx, gy, heuristic, weight)
-    else:
-        search = BFSDFS.Pathfinder(grid, sx, sy, gx, gy, algo)
+    global search, context, search_memory
+    context = SearchContext(config.movement_type)
+    if config.memory_report:
+        search_memory = MemoryReport(f'search {algo}').start()
+    search = create_pathfinder(algo, grid, (sx, sy), (gx, gy), heuristic, weight, config.level_name, context)
+    current = search
 
     global steps
     steps = 0
-
-    config.simulating = True
-    config.paused = False
+    trace = SearchTrace(grid.rows, grid.cols, (sx, sy), algo)
 
     config.delay = SPEED_TO_DELAY.get(speed, 50)
     speed = SPEED_TO_STEP_RATE.get(speed, 10)
+    if config.execution_mode == 'Background':
+        _start_worker(search, grid, GUI, trace)
+        return
     simulation_step()
 
+def _start_worker(search, grid, GUI, trace=None):
+    """
+    Runs the search in a SearchWorker thread and starts draining its updates on the Tk loop.
+
+    Parameters:
+        search       (Pathfinder): The search to run.
+        grid               (Grid): Grid to display the search on.
+        GUI                      : Reference to the GUI used for scheduling.
+        trace (SearchTrace | None): Optional trace to record the search into.
+    """
+    global worker
+    worker = SearchWorker(search, delay=config.delay, trace=trace)
+    worker.start()
+    _drain_worker(worker, grid, GUI)
+
+def _drain_worker(current, grid, GUI):
+    """
+    Applies the delta batches queued by a background search, for at most FRAME_BUDGET ms,
+    then reschedules itself for the next frame until the search is done.
+
+    Parameters:
+        current (SearchWorker): The worker to drain.
+        grid            (Grid): Grid to display the search on.
+        GUI                   : Reference to the GUI used for scheduling.
+    """
+    global worker
+    if current is not worker:
+        return # Search was stopped or replaced
+    deadline = time.perf_counter() + FRAME_BUDGET / 1000
+    while time.perf_counter() < deadline:
+        try:
+            message = current.updates.get_nowait()
+        except queue.Empty:
+            break
+        if message[0] == DELTA:
+            _, opened, closed = message
+            grid.show_open(opened)
+            grid.show_closed(closed)
+            continue
+
+        _, route, error = message
+        worker = None
+        current.search.context.simulating = False
+        _finish_memory_report(GUI)
+        if current.trace is not None:
+            _store_trace(current.trace, GUI)
+        if error:
+            messagebox.showerror(title='Search failed', message=f'The search stopped with an error: {error}')
+        elif route:
+            grid.visualize_route(route, GUI, 1, SPEED_TO_STEP_RATE.get(config.speed, 10))
+        else:
+            messagebox.showinfo(title='Search failed to find a path.', message='The search has completed and failed to find a path.')
+        GUI.canvas.update_idletasks()
+        return
+    GUI.canvas.update_idletasks()
+    GUI.after(FRAME_DELAY, lambda: _drain_worker(current, grid, GUI))
+
+def _finish_memory_report(GUI):
+    """Finishes the memory report of the search that just ended, if one was taken, and shows it."""
+    global search_memory
+    if search_memory is None:
+        return
+    report, search_memory = search_memory, None
+    GUI.show_memory_report(report.finish())
+
+def stop_search():
+    """Stops the search, trace replay or comparison, if one is running."""
+    global worker, replay, comparison, search_memory
+    context.cancel()
+    if search_memory is not None:
+        search_memory.finish() # Stops tracing; a stopped search's report is not shown
+        search_memory = None
+    if worker is not None:
+        worker.stop()
+        worker = None
+    replay = None
+    if comparison is not None:
+        comparison.cancel()
+        comparison = None
+
+def compare_algorithms(GUI, heuristic: str, weight):
+    """
+    Asks for a list of algorithms and runs them side by side on a snapshot of the grid,
+    each in its own panel of a comparison window.
+
+    Parameters:
+        GUI            : Contains the grid to compare on.
+        heuristic (str): Heuristic used by A*, IDA* and ARA*.
+        weight         : Heuristic weight used by A* and IDA*.
+    """
+    global comparison, comparison_window
+    grid = GUI.grid
+    if grid.sx == -1 or grid.gx == -1:
+        messagebox.showerror(title='Comparison failed', message='Missing Start or Goal position.')
+        return
+    dialog = CTkInputDialog(title='Compare Algorithms',
+                            text=f'Algorithms to compare, separated by commas (blank for {", ".join(DEFAULT_COMPARISON)}):')
+    names = dialog.get_input()
+    if names is None:
+        return
+    algos = [name.strip() for name in names.split(',') if name.strip()] or DEFAULT_COMPARISON
+    unknown = [algo for algo in algos if algo not in ALGORITHMS]
+    if unknown:
+        messagebox.showerror(title='Comparison failed', message=f'Unknown algorithms: {", ".join(unknown)}.')
+        return
+
+    stop_search()
+    if comparison_window is not None and comparison_window.winfo_exists():
+        comparison_window.destroy()
+    current = Comparison(grid, [(algo, heuristic, weight) for algo in algos], config.level_name, config.movement_type)
+    comparison = current
+    comparison_window = ComparisonWindow(current, on_close=lambda: _end_comparison(current))
+    _comparison_frame(current, GUI)
+
+def _comparison_frame(current, GUI):
+    """
+    Steps a comparison's searches for at most FRAME_BUDGET ms, redraws its window,
+    then reschedules itself for the next frame until every search is done.
+    """
+    global comparison
+    if current is not comparison:
+        return # Comparison was stopped or replaced
+    running = current.run_slice(FRAME_BUDGET / 1000)
+    comparison_window.render()
+    if running:
+        GUI.after(FRAME_DELAY, lambda: _comparison_frame(current, GUI))
+    else:
+        comparison = None
+
+def _end_comparison(current):
+    """Forgets a comparison whose window was closed."""
+    global comparison, comparison_window
+    if current is comparison:
+        comparison = None
+    comparison_window = None
+
+def _store_trace(trace, GUI):
+    """
+    Keeps a completed trace for replay and seeking, and writes it to the Assets/Traces folder.
+
+    Parameters:
+        trace (SearchTrace): The completed trace.
+        GUI               : Contains the timeline slider to configure.
+    """
+    global last_trace
+    last_trace = trace
+    GUI.set_timeline(len(trace))
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    trace_dir = os.path.abspath(os.path.join(current_dir, '..', 'Assets', 'Traces'))
+    os.makedirs(trace_dir, exist_ok=True)
+    level = os.path.splitext(config.level_name)[0] or 'untitled'
+    algo = trace.algorithm.replace('*', '_Star')
+    trace.save(os.path.join(trace_dir, f'{level}_{algo}.trace'))
+
+def replay_trace(GUI, trace=None):
+    """
+    Replays a recorded search on the grid at the current simulation speed, without recomputing the search.
+
+    Parameters:
+        GUI                      : Contains the grid to replay on.
+        trace (SearchTrace | None): Trace to replay. Defaults to the most recently completed run.
+    """
+    global replay, context
+    trace = trace or last_trace
+    if trace is None or context.simulating:
+        return
+    grid = GUI.grid
+    if (trace.rows, trace.cols) != (grid.rows, grid.cols):
+        messagebox.showerror(title='Replay failed', message='The trace was recorded on a grid of a different size.')
+        return
+
+    _clear_sim_results(grid)
+    context = SearchContext(config.movement_type)
+    context.simulating = True
+    replay = trace
+    grid.show_open([trace.unpack(trace.start)])
+    _replay_step(trace, 0, grid, GUI)
+
+def _replay_step(trace, index, grid, GUI):
+    """
+    Applies the next batch of recorded steps, then reschedules itself until the trace is exhausted.
+
+    Parameters:
+        trace (SearchTrace): The trace being replayed.
+        index        (int): Index of the next step to apply.
+        grid        (Grid): Grid to replay on.
+        GUI             : Reference to the GUI used for scheduling.
+    """
+    global replay
+    if trace is not replay:
+        return # Replay was stopped or replaced
+    if not context.paused:
+        end = min(index + SPEED_TO_STEP_RATE.get(config.speed, 10), len(trace))
+        for i in range(index, end):
+            popped, enqueued = trace.step(i)
+            grid.show_open(enqueued)
+            if popped is not None:
+                grid.show_closed([popped])
+        index = end
+        GUI.canvas.update_idletasks()
+        if index >= len(trace):
+            replay = None
+            context.simulating = False
+            route = _trace_route(trace)
+            if route:
+                grid.visualize_route(route, GUI, 1, SPEED_TO_STEP_RATE.get(config.speed, 10))
+            return
+    GUI.after(SPEED_TO_DELAY.get(config.speed, 50), lambda: _replay_step(trace, index, grid, GUI))
+
+def seek_timeline(GUI, value):
+    """
+    Requests that the grid show the last trace as it was after `value` steps.
+    Requests are coalesced so that dragging the slider seeks at most once per idle period.
+
+    Parameters:
+        GUI          : Contains the grid to display on.
+        value (float): Target step from the timeline slider.
+    """
+    global pending_seek
+    first = pending_seek is None
+    pending_seek = int(value)
+    if first:
+        GUI.after_idle(lambda: _apply_seek(GUI))
+
+def _apply_seek(GUI):
+    """
+    Rebuilds the display at the pending step from the nearest timeline checkpoint,
+    updating only the tiles that differ from the frame currently shown.
+    """
+    global pending_seek, timeline, shown_frame
+    step = pending_seek
+    pending_seek = None
+    trace = last_trace
+    grid = GUI.grid
+    if step is None or trace is None or context.simulating:
+        return
+    if (trace.rows, trace.cols) != (grid.rows, grid.cols):
+        return
+
+    if timeline is None or timeline.trace is not trace:
+        timeline = TraceTimeline(trace)
+        shown_frame = None
+    if shown_frame is None:
+        shown_frame = _frame_from_grid(grid)
+
+    target = timeline.frame(step)
+    moves = {}
+    if step >= len(trace):
+        for x, y, move in trace.get_route()[1:-1]:
+            cell = trace.pack(x, y)
+            target[cell] = ROUTE
+            moves[cell] = move
+
+    for cell in frame_changes(shown_frame, target):
+        x, y = trace.unpack(cell)
+        if grid.get(x, y) in ('wall', 'start', 'goal'):
+            continue
+        if target[cell] == ROUTE:
+            grid.moves[cell] = moves[cell]
+        grid.update_tile(x, y, FRAME_STATES[target[cell]])
+    shown_frame = target
+    grid.sim_present = True
+    GUI.set_timeline_step(step)
+
+def _frame_from_grid(grid):
+    """
+    Returns the timeline frame currently displayed by the grid.
+
+    Returns:
+        bytearray: One frame code per packed cell.
+    """
+    codes = {STATE_CODES['open']: 1, STATE_CODES['closed']: 2, STATE_CODES['route']: ROUTE}
+    return grid.cells.translate(bytes(codes.get(code, 0) for code in range(256)))
+
+def _trace_route(trace):
+    """
+    Rebuilds the route nodes of a trace in the form returned by Pathfinder.get_route().
+
+    Returns:
+        list[BFSDFS.Node]: Route nodes from goal back to start.
+    """
+    route = []
+    parent = None
+    for x, y, move in reversed(trace.get_route()):
+        parent = BFSDFS.Node(x, y, parent, move or [])
+        route.append(parent)
+    route.reverse()
+    return route
+
 def _clear_sim_results(grid):
     """
-    Clears any previous simulation visualization (open list, closed list, and route), and resets config.failed to False.
+    Clears any previous simulation visualization (open list, closed list, and route).
     """
-    config.failed = False
-    for row in grid.grid:
-        for tile in row:
-            if tile.state in ('open', 'closed', 'route'):
-                tile.state = 'empty'
+    global shown_frame
+    shown_frame = None
+    grid.clear_simulation()
 
 
 def clear_grid(grid):
@@ -185,15 +595,19 @@ def clear_grid(grid):
         grid (Grid): Grid to modify.
     
     """
+    stop_search()
     if grid.sim_present:
         _clear_sim_results(grid)
         grid.sim_present = False
     else:
         grid.reset()
-    grid.draw()
+        grid.draw()
 
 def save_level(GUI):
-    """Saves the grid as a .JSON file to a user specified route."""
+    """
+    Saves the grid as a level file to a user specified route.
+    Names without an extension are saved as .json, or compressed as .lvz for grids of COMPRESS_CELLS or more tiles.
+    """
     if not config.editor_has_start or not config.editor_has_goal:
         print('no start or goal')
         messagebox.showerror(title='File failed to save', message='Missing Start or Goal position.')
@@ -203,100 +617,67 @@ def save_level(GUI):
 
     if not file_name:
         return
-    if not file_name.endswith('.json'):
-        file_name += '.json'
+    if not file_name.endswith(level_io.LEVEL_EXTENSIONS):
+        large = GUI.grid.rows * GUI.grid.cols >= COMPRESS_CELLS
+        file_name += level_io.COMPRESSED_EXTENSION if large else '.json'
 
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    level_dir = os.path.abspath(os.path.join(current_dir, '..', 'assets', 'levels'))
-    os.makedirs(level_dir, exist_ok=True)
-    level_path = os.path.join(level_dir, file_name)
+    os.makedirs(level_io.LEVEL_DIR, exist_ok=True)
 
     if GUI.grid.sim_present:
         _clear_sim_results(GUI.grid)
         GUI.grid.sim_present = False
 
-    _save_grid(GUI.grid, file_name=level_path)
+    level_io.write_level(GUI.grid, file_name)
     GUI.retrieve_levels()
 
-def _save_grid(grid, file_name='level.json'):
-    """Writes the grid into a .JSON.
-    
-    Parameters:
-        grid     (Grid): Grid to write.
-        file_name (str): File name.
-    """
-    save_map = {
-        'empty': 0,
-        'wall' : 1,
-        'start': 2,
-        'goal' : 3 
-    }
-    serialized_grid = []
-    for row in grid.grid:
-        serialized_row = []
-        for node in row:
-            serialized_row.append(save_map[node.state])
-        serialized_grid.append(serialized_row)
-    with open(file_name, 'w') as f:
-        json.dump(serialized_grid, f)
-
 def load_level(GUI, file_name):
-    """Loads level from .JSON file."""
-    import json
-    import os
-
+    """Loads level from a .json or .lvz file. With config.memory_report on, reports the memory of reading and showing it."""
+    stop_search()
     config.level_name = file_name
+    if not config.memory_report:
+        show_level(GUI, level_io.read_level(file_name))
+        return
+    with MemoryReport(f'load {file_name}') as report:
+        show_level(GUI, level_io.read_level(file_name))
+    GUI.show_memory_report(report)
 
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-
-    level_dir = os.path.abspath(os.path.join(current_dir, '..', 'assets', 'levels'))
-    level_path = os.path.join(level_dir, file_name)
-
-    with open(level_path, 'r') as f:
-        serialized_grid = json.load(f)
-
-    rows = len(serialized_grid)
-    cols = len(serialized_grid[0]) if rows > 0 else 0
+def show_level(GUI, level):
+    """
+    Replaces the GUI grid with a level and fits the view to it.
 
+    Parameters:
+        GUI             : Contains the grid to replace.
+        level (GridModel): The level to show.
+    """
     GUI.update_idletasks()
-    canvas_width = GUI.canvas.winfo_width()
-    canvas_height = GUI.canvas.winfo_height()
+    GUI.grid = Grid(rows=level.rows, cols=level.cols, canvas=GUI.canvas, cells=level.cells)
+    GUI.grid.fit()
 
-    cell_size_w = canvas_width // cols
-    cell_size_h = canvas_height // rows
-    cell_size = min(cell_size_w, cell_size_h)
-
-
-    GUI.grid = Grid(rows=rows, cols=cols, canvas=GUI.canvas, cell_size=cell_size)
-
-    apply_grid_data(GUI.grid, serialized_grid)
-
-    config.editor_has_goal = True
-    config.editor_has_start = True
+    config.editor_has_start = GUI.grid.sx != -1
+    config.editor_has_goal = GUI.grid.gx != -1
     GUI.grid.draw()
 
-def apply_grid_data(grid, serialized_grid):
+def generate_level(GUI, kind):
     """
-    Applies grid data to the existing GUI grid.
+    Fills a grid of the current size with a generated map.
+    Asks for a seed; the same seed always generates the same map.
 
     Parameters:
-        serialized_grid: Grid as read in by load_level().
-    """
-    load_map = {
-        0: 'empty',
-        1: 'wall',
-        2: 'start',
-        3: 'goal'
-    }
-
-    for r, row in enumerate(serialized_grid):
-        for c, val in enumerate(row):
-            state = load_map.get(val, 'empty')
-            grid.grid[r][c].state = state
-            if state == 'start':
-                grid.sx, grid.sy = c, r
-            elif state == 'goal':
-                grid.gx, grid.gy = c, r
+        GUI       : Contains the grid to replace.
+        kind (str): Generator name (see generators.GENERATORS).
+    """
+    dialog = CTkInputDialog(title="Generate Level", text="Enter a seed (blank for 0):")
+    seed = dialog.get_input()
+    if seed is None:
+        return
+    try:
+        seed = int(seed or 0)
+    except ValueError:
+        messagebox.showerror(title='Invalid seed', message='The seed must be a whole number.')
+        return
+    stop_search()
+    config.level_name = ''
+    show_level(GUI, generators.generate(kind, GUI.grid.rows, GUI.grid.cols, seed))
 
 def algo_selection(GUI, algo):
     GUI.toggle_weight_option(algo)
@@ -308,34 +689,73 @@ def size_select(GUI, size):
     
     Parameters:
         GUI: Contains the grid to be redrawn.
-        size (str): Grid dimensions.
+        size (str): Grid dimensions as 'COLSxROWS', e.g. '10x10' or '1920x1080'.
     
     """
-    size = int(size.split('x')[0])
-    grid = []
-    for row in range(size):
-        grid_row = []
-        for node in range(row):
-            grid_row.append(0)
-        grid.append(grid_row)
-    
-    GUI.update_idletasks()
-    canvas_width = GUI.canvas.winfo_width()
-    canvas_height = GUI.canvas.winfo_height()
+    try:
+        cols, rows = (int(val) for val in size.lower().split('x'))
+    except ValueError:
+        messagebox.showerror(title='Invalid grid size', message='Enter the grid size as COLSxROWS, e.g. 200x100.')
+        return
+    if cols < 1 or rows < 1:
+        messagebox.showerror(title='Invalid grid size', message='The grid must have at least one row and one column.')
+        return
+    stop_search()
 
-    cell_size_w = canvas_width // size
-    cell_size_h = canvas_height // size
-    GUI.cell_size = min(cell_size_w, cell_size_h)
-    GUI.grid = Grid(rows=size, cols = size, canvas=GUI.canvas, cell_size=GUI.cell_size)
+    GUI.update_idletasks()
+    GUI.grid = Grid(rows=rows, cols=cols, canvas=GUI.canvas)
+    GUI.grid.fit()
     GUI.grid.draw()
 
     config.editor_has_start = False
     config.editor_has_goal = False
 
+def zoom(event, GUI):
+    """
+    Zooms the viewport around the mouse on mouse wheel events.
+
+    Parameters:
+        event: Mouse wheel event. Uses event.delta, or event.num 4/5 on X11.
+    """
+    zoom_in = event.num == 4 or getattr(event, 'delta', 0) > 0
+    GUI.grid.zoom(1.25 if zoom_in else 0.8, event.x, event.y)
+
+def start_pan(event, GUI):
+    """Remembers where a viewport pan started."""
+    GUI.pan_anchor = (event.x, event.y)
+
+def pan(event, GUI):
+    """Pans the viewport by the mouse movement since the last pan event."""
+    ax, ay = GUI.pan_anchor
+    GUI.pan_anchor = (event.x, event.y)
+    GUI.grid.pan(event.x - ax, event.y - ay)
+
+def end_pan(event, GUI):
+    """Draws the tiles exposed by a viewport pan."""
+    GUI.grid.draw()
+
 def toggle_pause():
     """Pauses and unpauses the simulation."""
-    config.paused = not config.paused
+    context.paused = not context.paused
+    if worker is not None:
+        if context.paused:
+            worker.pause()
+        else:
+            worker.resume()
 
 def set_speed(speed):
     """Sets simulation speed"""
     config.speed = speed
+
+def set_brush_size(size):
+    """
+    Sets the brush size.
+
+    Parameters:
+        size (str): Brush diameter in tiles ('1', '3', '5', ...).
+    """
+    config.brush_radius = (int(size) - 1) // 2
+
+def set_execution_mode(mode):
+    """Sets whether searches run inline on the Tk loop or in a background worker."""
+    config.execution_mode = mode
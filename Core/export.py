@@ -0,0 +1,199 @@
+"""
+Renders search runs to animations without a display: every frame is built from the grid buffer and
+the search's step deltas with numpy, one pixel block per tile, and encoded with PIL.
+
+In GIF and animated PNG output, tiles that did not change since the previous frame are written as
+transparent, so the encoders only compress the tiles the search touched.
+
+Examples:
+    python -m Core.headless export --level Example1.json --algorithm BFS --out BFS.gif --scale 16
+    python -m Core.headless export --generate Maze --size 1001x1001 --algorithm A* --out maze.png --frames 120
+    python -m Core.headless export --generate Caves --size 500x500 --algorithm BFS --out frames/ --every 500
+"""
+import os
+import time
+import numpy as np
+from PIL import Image, ImageColor, PngImagePlugin
+from Core.comparison import snapshot
+from Core.context import SearchContext
+from Core.grid_model import STATES, TILE_COLORS
+from Core.pathfinders import create_pathfinder
+from Core.timeline import OPEN, CLOSED, ROUTE
+from Core.trace import SearchTrace
+
+# Palette of tile colors, indexed by state code.
+PALETTE = [channel for state in STATES for channel in ImageColor.getrgb(TILE_COLORS[state])]
+# Code of tiles left unchanged from the previous frame of an animation, and the palette with it.
+TRANSPARENT = len(STATES)
+DELTA_PALETTE = PALETTE + [255, 255, 255]
+
+# Frames kept when no sampling interval is given, and the display time (ms) of each frame and of the last one.
+MAX_FRAMES = 200
+FRAME_DURATION = 40
+FINAL_DURATION = 2000
+
+def compose(base: np.ndarray, frame: np.ndarray) -> np.ndarray:
+    """
+    Combines a grid's saved tiles with a timeline frame into state codes, ready to show with PALETTE.
+
+    Parameters:
+        base (np.ndarray): State codes of the walls, start and goal (uint8).
+        frame (np.ndarray): Timeline codes (EMPTY, OPEN, CLOSED or ROUTE) of the same cells.
+
+    Returns:
+        np.ndarray: State code of every cell (uint8).
+    """
+    # Frame codes 1-3 (open, closed, route) follow the four saved states in STATES
+    return np.where((base == 0) & (frame > 0), frame + 3, base).astype(np.uint8)
+
+def render(codes: np.ndarray, scale: int=1, palette: list[int]=PALETTE) -> Image.Image:
+    """
+    Returns a palette image of state codes, with every tile drawn as a scale x scale pixel block.
+
+    Parameters:
+        codes (np.ndarray): State codes, shaped (rows, cols).
+        scale (int): Pixels per tile along each side.
+        palette (list[int]): RGB channels of each code.
+    """
+    if scale > 1:
+        codes = codes.repeat(scale, axis=0).repeat(scale, axis=1)
+    image = Image.fromarray(codes, 'P')
+    image.putpalette(palette)
+    return image
+
+def trace_search(grid, algo: str, heuristic: str='Manhattan', weight='1', movement: str='Cardinal',
+                 level_name: str='') -> SearchTrace:
+    """
+    Runs a search to completion on a snapshot of a grid, recording every step.
+
+    Returns:
+        SearchTrace: The steps and route of the search.
+    """
+    grid = snapshot(grid)
+    start = grid.get_start()
+    search = create_pathfinder(algo, grid, start, grid.get_goal(), heuristic, weight, level_name, SearchContext(movement))
+    trace = SearchTrace(grid.rows, grid.cols, start, algo)
+    running = True
+    while running:
+        running = search.step()
+        trace.record(search)
+    trace.finish(search.get_route())
+    return trace
+
+def frame_count(trace: SearchTrace, every: int) -> int:
+    """Returns the number of frames frame_codes() yields: the start, one every `every` steps, and the route."""
+    return 2 + len(range(every, len(trace), every))
+
+def frame_codes(grid, trace: SearchTrace, every: int):
+    """
+    Builds the state codes of a trace every `every` steps, ending with a frame that shows the route.
+
+    All events of the trace are put in step order once (enqueues before the pop of the same step),
+    so each frame is brought up to date with a single array assignment, whatever the number of steps in between.
+
+    Parameters:
+        grid (GridModel): Grid the trace was recorded on.
+        trace (SearchTrace): The trace.
+        every (int): Steps between frames.
+
+    Yields:
+        np.ndarray: State codes of each frame, shaped (rows, cols).
+    """
+    base = np.frombuffer(bytes(snapshot(grid).cells), dtype=np.uint8).reshape(grid.rows, grid.cols)
+    frame = np.zeros(grid.rows * grid.cols, dtype=np.uint8)
+    frame[trace.start] = OPEN
+    steps = len(trace)
+
+    enqueued = np.frombuffer(trace.enqueued, dtype=np.int32)
+    offsets = np.frombuffer(trace.offsets, dtype=np.int32)
+    popped = np.frombuffer(trace.popped, dtype=np.int32)
+    enqueue_steps = np.repeat(np.arange(steps, dtype=np.int64), np.diff(offsets))
+    popped_steps = np.flatnonzero(popped >= 0)
+    order = np.concatenate([enqueue_steps * 2, popped_steps * 2 + 1]).argsort(kind='stable')
+    cells = np.concatenate([enqueued, popped[popped_steps]])[order]
+    codes = np.concatenate([np.full(len(enqueued), OPEN, np.uint8), np.full(len(popped_steps), CLOSED, np.uint8)])[order]
+    event_steps = np.concatenate([enqueue_steps, popped_steps])[order]
+
+    yield compose(base, frame.reshape(base.shape))
+    begin = 0
+    for step in range(every, steps + every, every):
+        end = np.searchsorted(event_steps, min(step, steps))
+        frame[cells[begin:end]] = codes[begin:end]
+        begin = end
+        if step < steps:
+            yield compose(base, frame.reshape(base.shape))
+    frame[np.frombuffer(trace.route, dtype=np.int32)] = ROUTE
+    yield compose(base, frame.reshape(base.shape))
+
+def delta_images(codes, scale: int=1):
+    """
+    Renders frames for an animation, with the tiles that did not change since the previous frame set to TRANSPARENT.
+
+    Parameters:
+        codes (Iterable[np.ndarray]): State codes of each frame, from frame_codes().
+        scale (int): Pixels per tile along each side.
+
+    Yields:
+        Image.Image: Palette image of each frame, using DELTA_PALETTE.
+    """
+    previous = None
+    for frame in codes:
+        delta = frame if previous is None else np.where(frame == previous, TRANSPARENT, frame).astype(np.uint8)
+        previous = frame
+        yield render(delta, scale, DELTA_PALETTE)
+
+def export_animation(grid, path: str, algo: str, heuristic: str='Manhattan', weight='1', movement: str='Cardinal',
+                     level_name: str='', every: int | None=None, max_frames: int=MAX_FRAMES, scale: int=1,
+                     duration: int=FRAME_DURATION) -> dict:
+    """
+    Runs a search and writes it as an animation.
+
+    Parameters:
+        grid (GridModel): Grid to search. Must have a start and a goal.
+        path (str): Output file. '.gif' writes a GIF, '.png' or '.apng' an animated PNG,
+            and a path ending in a separator (or an existing folder) a numbered PNG per frame.
+        algo, heuristic, weight, movement, level_name: The search, as for create_pathfinder().
+        every (int | None): Steps between frames. Defaults to spreading max_frames over the search.
+        max_frames (int): Frames kept when every is not given.
+        scale (int): Pixels per tile along each side.
+        duration (int): Display time (ms) of each frame. The last frame, with the route, is held for FINAL_DURATION.
+
+    Returns:
+        dict: Steps, frames, image size and the seconds spent searching and rendering.
+    """
+    folder = path.endswith(os.sep) or path.endswith('/') or os.path.isdir(path)
+    if not folder and not path.lower().endswith(('.gif', '.png', '.apng')):
+        raise ValueError(f'unknown animation format {path!r} (use .gif, .png, .apng or a folder)')
+    start_time = time.perf_counter()
+    trace = trace_search(grid, algo, heuristic, weight, movement, level_name)
+    search_seconds = time.perf_counter() - start_time
+    every = max(1, every or -(-len(trace) // max(1, max_frames - 2)))
+
+    start_time = time.perf_counter()
+    count = frame_count(trace, every)
+    durations = [duration] * (count - 1) + [FINAL_DURATION]
+    if folder:
+        os.makedirs(path, exist_ok=True)
+        for i, codes in enumerate(frame_codes(grid, trace, every), start=1):
+            render(codes, scale).save(os.path.join(path, f'frame_{i:05d}.png'))
+    elif path.lower().endswith('.gif'):
+        images = delta_images(frame_codes(grid, trace, every), scale)
+        # Unchanged tiles are already transparent, so PIL's own (much slower) frame optimisation is skipped
+        next(images).save(path, save_all=True, append_images=images, duration=durations, loop=0,
+                          optimize=False, transparency=TRANSPARENT, disposal=1)
+    else:
+        # The PNG writer walks append_images twice (once to check modes), so a generator would lose every frame
+        images = list(delta_images(frame_codes(grid, trace, every), scale))
+        images[0].save(path, format='PNG', save_all=True, append_images=images[1:], duration=durations, loop=0,
+                          transparency=TRANSPARENT, blend=PngImagePlugin.Blend.OP_OVER,
+                          disposal=PngImagePlugin.Disposal.OP_NONE)
+    return {
+        'algorithm': algo,
+        'steps': len(trace),
+        'every': every,
+        'frames': count,
+        'width': grid.cols * scale,
+        'height': grid.rows * scale,
+        'search_seconds': round(search_seconds, 6),
+        'render_seconds': round(time.perf_counter() - start_time, 6),
+    }
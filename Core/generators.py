@@ -0,0 +1,176 @@
+from itertools import permutations
+import numpy as np
+from Core.grid_model import GridModel, STATE_CODES
+
+EMPTY = STATE_CODES['empty']
+WALL = STATE_CODES['wall']
+
+def random_fill(rows: int, cols: int, seed: int=0, density: float=0.3) -> np.ndarray:
+    """
+    Scatters walls independently over the map.
+
+    Parameters:
+        rows, cols (int, int): Map dimensions.
+        seed            (int): Random seed.
+        density       (float): Probability of each cell being a wall.
+
+    Returns:
+        np.ndarray: (rows, cols) array of state codes.
+    """
+    rng = np.random.default_rng(seed)
+    return np.where(rng.random((rows, cols)) < density, WALL, EMPTY).astype(np.uint8)
+
+def maze(rows: int, cols: int, seed: int=0) -> np.ndarray:
+    """
+    Carves a perfect maze with an iterative recursive backtracker.
+    Maze cells sit on odd coordinates, with walls between them.
+
+    Parameters:
+        rows, cols (int, int): Map dimensions.
+        seed            (int): Random seed.
+
+    Returns:
+        np.ndarray: (rows, cols) array of state codes.
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.full((rows, cols), WALL, dtype=np.uint8)
+    maze_rows, maze_cols = (rows - 1) // 2, (cols - 1) // 2
+    if maze_rows < 1 or maze_cols < 1:
+        return grid
+
+    # Walk a lattice of maze cells, packed with a border of pre-visited cells so the walk needs no bounds checks.
+    # The walk carves every cell once and backtracks from every cell once, so 2 * cells random orders are enough.
+    width = maze_cols + 2
+    visited = bytearray([1]) * (width * (maze_rows + 2))
+    for y in range(1, maze_rows + 1):
+        visited[y * width + 1:y * width + 1 + maze_cols] = bytes(maze_cols)
+    orders = [tuple((-width, 1, width, -1)[d] for d in order) for order in permutations(range(4))]
+    choices = [orders[roll] for roll in rng.integers(0, len(orders), size=2 * maze_rows * maze_cols).tolist()]
+    came_from = [0] * len(visited)
+    cell = width + 1
+    visited[cell] = 1
+    stack = []
+    for order in choices:
+        for step in order:
+            neighbor = cell + step
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                came_from[neighbor] = step
+                stack.append(cell)
+                cell = neighbor
+                break
+        else:
+            if not stack:
+                break
+            cell = stack.pop()
+
+    # Open every maze cell, then the wall between each carved cell and the cell it was carved from.
+    grid[1:2 * maze_rows:2, 1:2 * maze_cols:2] = EMPTY
+    came_from = np.array(came_from).reshape(maze_rows + 2, width)
+    ys, xs = np.nonzero(came_from)
+    steps = came_from[ys, xs]
+    dy = np.where(np.abs(steps) == width, np.sign(steps), 0)
+    dx = np.where(np.abs(steps) == 1, steps, 0)
+    grid[2 * ys - 1 - dy, 2 * xs - 1 - dx] = EMPTY
+    return grid
+
+def caves(rows: int, cols: int, seed: int=0, density: float=0.45, iterations: int=5) -> np.ndarray:
+    """
+    Grows caves with a cellular automaton: a cell becomes a wall when at least 5 of the 9 cells
+    around it (including itself) are walls. Cells beyond the map edge count as walls.
+
+    Parameters:
+        rows, cols (int, int): Map dimensions.
+        seed            (int): Random seed.
+        density       (float): Initial wall density.
+        iterations      (int): Number of automaton steps.
+
+    Returns:
+        np.ndarray: (rows, cols) array of state codes.
+    """
+    rng = np.random.default_rng(seed)
+    walls = rng.random((rows, cols)) < density
+    for _ in range(iterations):
+        padded = np.pad(walls, 1, constant_values=True).astype(np.uint8)
+        neighbors = sum(padded[dy:dy + rows, dx:dx + cols] for dy in range(3) for dx in range(3))
+        walls = neighbors >= 5
+    return np.where(walls, WALL, EMPTY).astype(np.uint8)
+
+def rooms_and_corridors(rows: int, cols: int, seed: int=0, room_attempts: int | None=None,
+                        min_room: int=4, max_room: int=16) -> np.ndarray:
+    """
+    Places non-overlapping rectangular rooms and joins them with L-shaped corridors,
+    visiting the rooms band by band in a serpentine order so corridors stay short.
+
+    Parameters:
+        rows, cols (int, int): Map dimensions.
+        seed            (int): Random seed.
+        room_attempts (int | None): Number of rooms to try placing. Defaults to one per 300 cells.
+        min_room, max_room (int, int): Range of room side lengths.
+
+    Returns:
+        np.ndarray: (rows, cols) array of state codes.
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.full((rows, cols), WALL, dtype=np.uint8)
+    max_room = min(max_room, rows - 2, cols - 2)
+    if max_room < 1:
+        return grid
+    min_room = min(min_room, max_room)
+    attempts = room_attempts if room_attempts is not None else max(1, rows * cols // 300)
+
+    # Rooms keep a one cell margin from the map edge and from each other.
+    taken = np.zeros((rows, cols), dtype=bool)
+    heights = rng.integers(min_room, max_room + 1, size=attempts)
+    widths = rng.integers(min_room, max_room + 1, size=attempts)
+    tops = (rng.random(attempts) * (rows - heights - 1)).astype(int) + 1
+    lefts = (rng.random(attempts) * (cols - widths - 1)).astype(int) + 1
+    centers = []
+    for top, left, height, width in zip(tops, lefts, heights, widths):
+        if taken[top - 1:top + height + 1, left - 1:left + width + 1].any():
+            continue
+        taken[top:top + height, left:left + width] = True
+        grid[top:top + height, left:left + width] = EMPTY
+        centers.append((top + height // 2, left + width // 2))
+
+    band = 2 * max_room
+    centers.sort(key=lambda center: (center[0] // band, center[1] if center[0] // band % 2 == 0 else -center[1]))
+    for (y0, x0), (y1, x1) in zip(centers, centers[1:]):
+        grid[y0, min(x0, x1):max(x0, x1) + 1] = EMPTY
+        grid[min(y0, y1):max(y0, y1) + 1, x1] = EMPTY
+    return grid
+
+GENERATORS = {
+    'Random': random_fill,
+    'Maze': maze,
+    'Caves': caves,
+    'Rooms': rooms_and_corridors,
+}
+
+def generate(kind: str, rows: int, cols: int, seed: int=0, **params) -> GridModel:
+    """
+    Generates a map and places the start on the first empty cell and the goal on the last (in row-major order).
+
+    Parameters:
+        kind       (str): Generator name, one of GENERATORS.
+        rows, cols (int, int): Map dimensions.
+        seed       (int): Random seed. The same seed and parameters always give the same map.
+        params          : Extra generator parameters (e.g. density).
+
+    Returns:
+        GridModel: The generated map.
+    """
+    codes = GENERATORS[kind](rows, cols, seed, **params)
+    model = GridModel(rows, cols, bytearray(codes.tobytes()))
+    place_objectives(model)
+    return model
+
+def place_objectives(model: GridModel):
+    """Places the start on the first empty cell and the goal on the last empty cell of a map, if it has two."""
+    first = model.cells.find(EMPTY)
+    last = model.cells.rfind(EMPTY)
+    if first < 0 or first == last:
+        return
+    model.cells[first] = STATE_CODES['start']
+    model.cells[last] = STATE_CODES['goal']
+    model.find_objectives()
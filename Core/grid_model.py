@@ -0,0 +1,106 @@
+# Tile states, indexed by their code in GridModel.cells.
+# The first four codes match the values used by saved levels.
+STATES = ('empty', 'wall', 'start', 'goal', 'open', 'closed', 'route')
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+# Color of each tile state, shared by the canvas and the image renderers.
+TILE_COLORS = {
+    'empty': 'white',
+    'wall': 'black',
+    'start': 'orange',
+    'goal': 'purple',
+    'open': 'green',
+    'closed': 'red',
+    'route': 'blue'
+}
+
+class GridModel:
+    """
+    The 2D grid environment searched by the pathfinders, stored as one state code per cell.
+
+    Cells are packed row by row, so the tile at (x, y) is cells[y * cols + x].
+    GridModel holds no rendering state and can be used without a display.
+
+    Attributes:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        cells (bytearray): State code of every cell (see STATES). Read-only searches also accept bytes,
+            or a memoryview of shared memory (see Core/portfolio.py).
+        sx, sy (int): Coordinates of the start node.
+        gx, gy (int): Coordinates of the goal node.
+        moves (dict[int, list[int, int]]): Move taken to reach each route cell, keyed by packed cell.
+    """
+    def __init__(self, rows: int, cols: int, cells=None):
+        """
+        Initializes an empty grid, or one backed by existing cell data.
+
+        Parameters:
+            rows (int): Number of rows in the grid.
+            cols (int): Number of columns in the grid.
+            cells (bytearray | bytes | memoryview | None): Optional state codes to use as the grid buffer.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells if cells is not None else bytearray(rows * cols)
+        self.sx, self.sy = -1, -1
+        self.gx, self.gy = -1, -1
+        self.moves = {}
+        self.find_objectives()
+
+    def find_objectives(self):
+        """Locates the start and goal tiles in the cell buffer."""
+        cells = self.cells if hasattr(self.cells, 'find') else bytes(self.cells) # memoryviews cannot search
+        start = cells.find(STATE_CODES['start'])
+        goal = cells.find(STATE_CODES['goal'])
+        self.sx, self.sy = (start % self.cols, start // self.cols) if start >= 0 else (-1, -1)
+        self.gx, self.gy = (goal % self.cols, goal // self.cols) if goal >= 0 else (-1, -1)
+
+    def is_OOB(self, x: int, y: int):
+        """
+        Checks if the given tile coordinates are out of bounds.
+
+        Paramaters:
+            x, y (int, int): Tile coordinates.
+
+        Returns:
+            bool: True if out of bounds, False otherwise.
+        """
+        return not (0 <= x < self.cols and 0 <= y < self.rows)
+
+    def get(self, x: int, y: int):
+        """
+        Gets the state of the tile at the given coordinates.
+
+        Paramaters:
+            x, y (int, int): Tile coordinates.
+
+        Returns:
+            str: The tile state (e.g., 'wall', 'empty').
+        """
+        if self.is_OOB(x, y):
+            return 'wall'
+        return STATES[self.cells[y * self.cols + x]]
+
+    def set(self, x: int, y: int, state: str):
+        """
+        Sets the state of the tile at the given coordinates, without any checks.
+
+        Paramaters:
+            x, y (int, int): Tile coordinates.
+            state     (str): The new tile state.
+        """
+        self.cells[y * self.cols + x] = STATE_CODES[state]
+
+    def get_start(self):
+        """
+        Returns:
+            list[int, int]: The [x, y] coordinates of the start tile.
+        """
+        return [self.sx, self.sy]
+
+    def get_goal(self):
+        """
+        Returns:
+            list[int, int]: The [x, y] coordinates of the goal tile.
+        """
+        return [self.gx, self.gy]
@@ -0,0 +1,274 @@
+"""
+Runs the pathfinders without a display.
+
+Examples:
+    python -m Core.headless generate Maze --size 201x201 --seed 1 --out Maze.json
+    python -m Core.headless run --level Example1.json --algorithm A* --movement Diagonal
+    python -m Core.headless run --generate Caves --size 1000x1000 --seed 3 --algorithm BFS
+    python -m Core.headless run --level Example1.json --algorithm BFS --memory
+    python -m Core.headless batch --level Example1.json --queries queries.json
+    python -m Core.headless levels
+    python -m Core.headless compare --generate Caves --size 300x300 --algorithms BFS A* GBeFS
+    python -m Core.headless export --level Example1.json --algorithm BFS --out BFS.gif --scale 16
+    python -m Core.headless portfolio --generate Caves --size 1000x1000 --seed 3 --algorithms BFS A* GBeFS
+"""
+import argparse
+import json
+import sys
+import time
+import Core.config as config
+import Core.generators as generators
+import Core.level_io as level_io
+import Core.level_index as level_index
+from Core.memory import MemoryReport
+from Core.comparison import Comparison
+from Core.export import export_animation, MAX_FRAMES, FRAME_DURATION
+from Core.context import SearchContext
+from Core.portfolio import Portfolio
+from Core.pathfinders import ALGORITHMS, create_pathfinder, get_route_cost
+from Algorithms.batch import batch_query
+from Algorithms.heuristics import HEURISTICS
+
+def parse_size(size: str) -> tuple[int, int]:
+    """
+    Parses a grid size.
+
+    Parameters:
+        size (str): Grid dimensions as 'COLSxROWS'.
+
+    Returns:
+        tuple[int, int]: (cols, rows).
+    """
+    cols, rows = (int(val) for val in size.lower().split('x'))
+    return cols, rows
+
+def route_cost(route) -> int:
+    """
+    Returns the cost of a route, as returned by Pathfinder.get_route().
+    """
+    return sum(config.get_move_cost(list(node.move)) for node in route if node.move)
+
+def run_search(grid, algo: str, heuristic: str='Manhattan', weight='1', movement: str='Cardinal', level_name: str='',
+               start=None, goal=None, include_route: bool=False, memory: bool=False) -> dict:
+    """
+    Runs a search to completion.
+
+    Parameters:
+        grid (GridModel): Grid to search. Must have a start and a goal, unless both are given.
+        algo       (str): Algorithm name, one of ALGORITHMS.
+        heuristic  (str): Heuristic used by A*.
+        weight (str | float): Heuristic weight used by A*.
+        movement   (str): 'Cardinal' or 'Diagonal'.
+        level_name (str): Level file the grid was loaded from, if any.
+        start, goal (tuple[int, int] | None): Coordinates to search between instead of the grid's start and goal.
+        include_route (bool): Add the route's [x, y] coordinates, from start to goal, to the statistics.
+        memory (bool): Trace allocations and add a memory report of the search to the statistics.
+            The report is taken while the search is still alive, so retained memory is what it holds at the end.
+            Tracing slows the search down, so its time is not comparable with untraced runs.
+
+    Returns:
+        dict: Search statistics.
+    """
+    context = SearchContext(movement)
+    report = MemoryReport(f'search {algo}').start() if memory else None
+    start_time = time.perf_counter()
+    search = create_pathfinder(algo, grid, start or grid.get_start(), goal or grid.get_goal(), heuristic, weight,
+                               level_name, context)
+    steps = 0
+    expansions = 0
+    running = True
+    while running:
+        running = search.step()
+        steps += 1
+        if search.last_popped is not None:
+            expansions += 1
+    seconds = time.perf_counter() - start_time
+    if report is not None:
+        report.finish()
+    route = search.get_route()
+    stats = {
+        'algorithm': algo,
+        'movement': movement,
+        'found': bool(route),
+        'steps': steps,
+        'expansions': expansions,
+        'route_length': len(route),
+        'route_cost': get_route_cost(search),
+        'seconds': round(seconds, 6),
+    }
+    if include_route:
+        stats['route'] = [[node.x, node.y] for node in reversed(route)]
+    if getattr(search, 'prune', None):
+        stats['pruned_cells'] = search.prune.count(1)
+    if hasattr(search, 'get_budget'):
+        stats['budget'] = search.get_budget()
+    if hasattr(search, 'solutions'):
+        stats['solutions'] = search.solutions
+    if hasattr(search, 'los_checks'):
+        stats['tile_cost'] = route_cost(route) # Cost of the moves along the tiles, not the straight segments
+        stats['waypoints'] = len(search.waypoints)
+        stats['los_checks'] = search.los_checks
+        stats['los_traced'] = search.los_traced
+        if include_route:
+            stats['waypoint_route'] = [[node.x, node.y] for node in reversed(search.waypoints)]
+    if report is not None:
+        stats['memory'] = report.to_dict()
+    return stats
+
+def load_grid(args):
+    """Returns the grid described by the --level or --generate arguments."""
+    if args.level:
+        return level_io.read_level(args.level)
+    cols, rows = parse_size(args.size)
+    return generators.generate(args.generate, rows, cols, args.seed)
+
+def _add_map_arguments(parser):
+    parser.add_argument('--level', help='Level file name (in Assets/Levels) or path.')
+    parser.add_argument('--generate', choices=list(generators.GENERATORS), help='Generate the map instead of loading a level.')
+    parser.add_argument('--size', default='100x100', help='Generated map size as COLSxROWS.')
+    parser.add_argument('--seed', type=int, default=0, help='Generator seed.')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m Core.headless', description='Run pathfinders without a display.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help='Generate a level file.')
+    generate.add_argument('kind', choices=list(generators.GENERATORS))
+    generate.add_argument('--size', default='100x100', help='Map size as COLSxROWS.')
+    generate.add_argument('--seed', type=int, default=0, help='Generator seed.')
+    generate.add_argument('--out', required=True, help='Level file name (in Assets/Levels) or path.')
+
+    run = commands.add_parser('run', help='Run a search and print its statistics as JSON.')
+    _add_map_arguments(run)
+    run.add_argument('--algorithm', choices=ALGORITHMS, default='A*')
+    run.add_argument('--heuristic', choices=HEURISTICS, default='Manhattan')
+    run.add_argument('--heuristic-table', action='store_true', help='Precompute a per-goal table of heuristic estimates.')
+    run.add_argument('--prune', action='store_true', help='Skip dead ends and corridors that cannot lie on the route.')
+    run.add_argument('--weight', default='1')
+    run.add_argument('--movement', choices=['Cardinal', 'Diagonal'], default='Cardinal')
+    run.add_argument('--node-cap', type=int, default=config.node_cap, help='Maximum nodes stored by memory-bounded searches.')
+    run.add_argument('--deadline', type=float, default=None, help='Seconds anytime searches may run for (default: no limit).')
+    run.add_argument('--anytime-weight', type=float, default=config.anytime_weight, help='First weight of anytime searches.')
+    run.add_argument('--memory', action='store_true', help='Report peak and retained memory of loading the map and of the search.')
+
+    batch = commands.add_parser('batch', help='Answer many queries with shared search trees and print the results as JSON.')
+    _add_map_arguments(batch)
+    batch.add_argument('--queries', required=True, help='JSON file with a list of [[sx, sy], [gx, gy]] queries.')
+    batch.add_argument('--movement', choices=['Cardinal', 'Diagonal'], default='Cardinal')
+
+    compare = commands.add_parser('compare', help='Run several searches side by side on one snapshot and print a results table as JSON.')
+    _add_map_arguments(compare)
+    compare.add_argument('--algorithms', nargs='+', choices=ALGORITHMS, default=['BFS', 'A*', 'GBeFS'])
+    compare.add_argument('--heuristic', choices=HEURISTICS, default='Manhattan')
+    compare.add_argument('--weight', default='1')
+    compare.add_argument('--movement', choices=['Cardinal', 'Diagonal'], default='Cardinal')
+
+    export = commands.add_parser('export', help='Run a search and write it as a GIF, animated PNG or folder of frames.')
+    _add_map_arguments(export)
+    export.add_argument('--algorithm', choices=ALGORITHMS, default='A*')
+    export.add_argument('--heuristic', choices=HEURISTICS, default='Manhattan')
+    export.add_argument('--weight', default='1')
+    export.add_argument('--movement', choices=['Cardinal', 'Diagonal'], default='Cardinal')
+    export.add_argument('--out', required=True, help='.gif, .png/.apng (animated PNG), or a folder ending in / for one PNG per frame.')
+    export.add_argument('--every', type=int, default=None, help='Steps between frames (default: spread --frames over the search).')
+    export.add_argument('--frames', type=int, default=MAX_FRAMES, help='Frames kept when --every is not given.')
+    export.add_argument('--scale', type=int, default=1, help='Pixels per tile along each side.')
+    export.add_argument('--duration', type=int, default=FRAME_DURATION, help='Display time (ms) of each frame.')
+
+    portfolio = commands.add_parser('portfolio', help='Race several searches in worker processes and print the first route as JSON.')
+    _add_map_arguments(portfolio)
+    portfolio.add_argument('--algorithms', nargs='+', choices=ALGORITHMS, default=['BFS', 'A*', 'GBeFS'])
+    portfolio.add_argument('--heuristic', choices=HEURISTICS, default='Manhattan')
+    portfolio.add_argument('--weight', default='1')
+    portfolio.add_argument('--movement', choices=['Cardinal', 'Diagonal'], default='Cardinal')
+    portfolio.add_argument('--deadline', type=float, default=None, help='Seconds to wait for a route (default: no limit).')
+    portfolio.add_argument('--best', action='store_true', help='Wait for every search (or the deadline) and keep the cheapest route.')
+    portfolio.add_argument('--route', action='store_true', help='Include the winning route in the output.')
+
+    commands.add_parser('levels', help='Refresh the level index and print every level\'s metadata as JSON.')
+
+    args = parser.parse_args(argv)
+    if args.command == 'generate':
+        cols, rows = parse_size(args.size)
+        start_time = time.perf_counter()
+        grid = generators.generate(args.kind, rows, cols, args.seed)
+        level_io.write_level(grid, args.out)
+        print(json.dumps({'kind': args.kind, 'cols': cols, 'rows': rows, 'seed': args.seed,
+                          'seconds': round(time.perf_counter() - start_time, 6)}))
+    elif args.command == 'run':
+        if not args.level and not args.generate:
+            parser.error('run needs --level or --generate')
+        config.node_cap = args.node_cap
+        config.heuristic_table = args.heuristic_table
+        config.dead_end_pruning = args.prune
+        config.anytime_deadline = args.deadline
+        config.anytime_weight = args.anytime_weight
+        load_report = MemoryReport(f'load {args.level or args.generate}').start() if args.memory else None
+        grid = load_grid(args)
+        if load_report is not None:
+            load_report.finish()
+        if grid.sx == -1 or grid.gx == -1:
+            parser.error('the map has no start or goal')
+        stats = run_search(grid, args.algorithm, args.heuristic, args.weight, args.movement, args.level or '',
+                           memory=args.memory)
+        if load_report is not None:
+            stats['load_memory'] = load_report.to_dict()
+        print(json.dumps(stats))
+    elif args.command == 'batch':
+        if not args.level and not args.generate:
+            parser.error('batch needs --level or --generate')
+        grid = load_grid(args)
+        with open(args.queries) as file:
+            queries = json.load(file)
+        start_time = time.perf_counter()
+        results = batch_query(grid, queries, args.movement)
+        print(json.dumps({'queries': results,
+                          'expansions': sum(result['expansions'] for result in results),
+                          'seconds': round(time.perf_counter() - start_time, 6)}))
+    elif args.command == 'export':
+        if not args.level and not args.generate:
+            parser.error('export needs --level or --generate')
+        grid = load_grid(args)
+        if grid.sx == -1 or grid.gx == -1:
+            parser.error('the map has no start or goal')
+        try:
+            stats = export_animation(grid, args.out, args.algorithm, args.heuristic, args.weight, args.movement,
+                                     args.level or '', args.every, args.frames, args.scale, args.duration)
+        except ValueError as error:
+            parser.error(str(error))
+        print(json.dumps({'out': args.out, **stats}))
+    elif args.command == 'portfolio':
+        if not args.level and not args.generate:
+            parser.error('portfolio needs --level or --generate')
+        grid = load_grid(args)
+        if grid.sx == -1 or grid.gx == -1:
+            parser.error('the map has no start or goal')
+        start_time = time.perf_counter()
+        with Portfolio([(algo, args.heuristic, args.weight) for algo in args.algorithms]) as workers:
+            startup = time.perf_counter() - start_time
+            result = workers.run(grid, args.movement, args.deadline, args.best, level_name=args.level or '')
+        if not args.route:
+            del result['route']
+        print(json.dumps({**result, 'startup_seconds': round(startup, 6)}))
+    elif args.command == 'levels':
+        start_time = time.perf_counter()
+        levels = level_index.refresh()
+        print(json.dumps({'levels': {name: {key: value for key, value in entry.items() if key != 'thumbnail'}
+                                     for name, entry in levels.items()},
+                          'seconds': round(time.perf_counter() - start_time, 6)}))
+    elif args.command == 'compare':
+        if not args.level and not args.generate:
+            parser.error('compare needs --level or --generate')
+        grid = load_grid(args)
+        if grid.sx == -1 or grid.gx == -1:
+            parser.error('the map has no start or goal')
+        comparison = Comparison(grid, [(algo, args.heuristic, args.weight) for algo in args.algorithms],
+                                args.level or '', args.movement)
+        start_time = time.perf_counter()
+        while comparison.run_slice(1.0):
+            pass
+        print(json.dumps({'results': comparison.results(), 'seconds': round(time.perf_counter() - start_time, 6)}))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+from array import array
+from collections import deque
+
+# Most strokes kept for undo, and most changed cells kept across all of them.
+HISTORY_LIMIT = 100
+HISTORY_CELLS = 2000000
+
+class Edit:
+    """
+    The tiles changed by one brush stroke, stored as parallel arrays rather than a grid snapshot.
+
+    Attributes:
+        cells (array['i']): Packed cell of every changed tile.
+        old (bytes): State code of each tile before the stroke.
+        new (bytes): State code of each tile after the stroke.
+    """
+    def __init__(self, cells: array, old: bytes, new: bytes):
+        self.cells = cells
+        self.old = old
+        self.new = new
+
+    def __len__(self):
+        return len(self.cells)
+
+class EditHistory:
+    """
+    Undo and redo history of a grid's edits, recorded as one Edit per brush stroke.
+    The oldest strokes are dropped once more than HISTORY_LIMIT strokes or HISTORY_CELLS changed tiles are kept.
+
+    Attributes:
+        undo_stack (deque[Edit]): Strokes that can be undone, most recent last.
+        redo_stack (list[Edit]): Undone strokes that can be redone, most recently undone last.
+        pending (dict[int, list[int, int]]): [old, new] code of each tile changed by the stroke in progress.
+        size (int): Changed tiles kept in undo_stack.
+    """
+    def __init__(self, limit: int=HISTORY_LIMIT, max_cells: int=HISTORY_CELLS):
+        """
+        Parameters:
+            limit     (int): Most strokes kept.
+            max_cells (int): Most changed tiles kept across all strokes.
+        """
+        self.limit = limit
+        self.max_cells = max_cells
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.pending = {}
+        self.size = 0
+
+    def record(self, changes: list[tuple[int, int, int]]):
+        """
+        Adds changes to the stroke in progress. A tile changed several times keeps its first old and last new code.
+
+        Parameters:
+            changes (list[tuple[int, int, int]]): (cell, old code, new code) of each changed tile, as returned by Grid.apply_edits().
+        """
+        for cell, old, new in changes:
+            entry = self.pending.get(cell)
+            if entry is None:
+                self.pending[cell] = [old, new]
+            else:
+                entry[1] = new
+
+    def commit(self):
+        """Ends the stroke in progress, making it the most recent stroke to undo. Clears the redo history."""
+        changed = [(cell, old, new) for cell, (old, new) in self.pending.items() if old != new]
+        self.pending = {}
+        if not changed:
+            return
+        edit = Edit(array('i', [cell for cell, _, _ in changed]),
+                    bytes(old for _, old, _ in changed), bytes(new for _, _, new in changed))
+        self.undo_stack.append(edit)
+        self.size += len(edit)
+        self.redo_stack = []
+        while len(self.undo_stack) > self.limit or (self.size > self.max_cells and len(self.undo_stack) > 1):
+            self.size -= len(self.undo_stack.popleft())
+
+    def undo(self) -> Edit | None:
+        """
+        Takes the most recent stroke off the undo history, ending any stroke in progress first.
+
+        Returns:
+            Edit | None: The stroke to revert, or None if there is nothing to undo.
+        """
+        self.commit()
+        if not self.undo_stack:
+            return None
+        edit = self.undo_stack.pop()
+        self.size -= len(edit)
+        self.redo_stack.append(edit)
+        return edit
+
+    def redo(self) -> Edit | None:
+        """
+        Takes the most recently undone stroke off the redo history.
+
+        Returns:
+            Edit | None: The stroke to apply again, or None if there is nothing to redo.
+        """
+        self.commit()
+        if not self.redo_stack:
+            return None
+        edit = self.redo_stack.pop()
+        self.undo_stack.append(edit)
+        self.size += len(edit)
+        return edit
+
+    def clear(self):
+        """Forgets every stroke, for when the grid is replaced as a whole."""
+        self.undo_stack.clear()
+        self.redo_stack = []
+        self.pending = {}
+        self.size = 0
@@ -0,0 +1,122 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import zlib
+import numpy as np
+import Core.level_io as level_io
+from Core.grid_model import STATE_CODES
+
+# Index of the levels folder, kept next to the levels. It is a cache and can be deleted at any time.
+INDEX_FILE = os.path.join(level_io.LEVEL_DIR, '.index.json')
+INDEX_VERSION = 1
+
+# Largest width or height (px) of a level thumbnail.
+THUMB_SIZE = 48
+
+def is_level(file_name: str) -> bool:
+    """Checks whether a file in the levels folder is a level."""
+    return file_name.endswith(level_io.LEVEL_EXTENSIONS) and not file_name.startswith('.')
+
+def thumbnail(grid) -> dict:
+    """
+    Returns a grayscale thumbnail of a level: each pixel's darkness is the share of walls in its block of tiles.
+
+    Parameters:
+        grid (GridModel): The level.
+
+    Returns:
+        dict: 'width', 'height' and 'data', the pixels as base64 encoded, zlib compressed bytes (row by row).
+    """
+    rows, cols = grid.rows, grid.cols
+    scale = min(1.0, THUMB_SIZE / max(rows, cols, 1))
+    height, width = max(1, round(rows * scale)), max(1, round(cols * scale))
+    walls = (np.frombuffer(bytes(grid.cells), dtype=np.uint8) == STATE_CODES['wall']).reshape(rows, cols)
+    row_edges = np.arange(height) * rows // height
+    col_edges = np.arange(width) * cols // width
+    counts = np.add.reduceat(np.add.reduceat(walls.astype(np.int32), row_edges, axis=0), col_edges, axis=1)
+    areas = np.outer(np.diff(np.append(row_edges, rows)), np.diff(np.append(col_edges, cols)))
+    pixels = (255 - 255 * counts // areas).astype(np.uint8)
+    return {'width': width, 'height': height,
+            'data': base64.b64encode(zlib.compress(pixels.tobytes())).decode('ascii')}
+
+def thumbnail_pixels(entry: dict) -> bytes:
+    """Returns the raw grayscale pixels of an index entry's thumbnail."""
+    return zlib.decompress(base64.b64decode(entry['thumbnail']['data']))
+
+def describe(file_name: str, stat: os.stat_result) -> dict:
+    """
+    Reads a level and returns its index entry.
+
+    Parameters:
+        file_name (str): Level file name in the levels folder.
+        stat (os.stat_result): The file's stat, recorded to detect later changes.
+
+    Returns:
+        dict: mtime, size, rows, cols, wall density, start, goal, content hash and thumbnail.
+    """
+    with open(level_io.level_path(file_name), 'rb') as f:
+        data = f.read()
+    grid = level_io.decode_level(io.BytesIO(data))
+    walls = bytes(grid.cells).count(STATE_CODES['wall'])
+    return {
+        'mtime': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'rows': grid.rows,
+        'cols': grid.cols,
+        'wall_density': round(walls / max(1, grid.rows * grid.cols), 4),
+        'start': grid.get_start() if grid.sx != -1 else None,
+        'goal': grid.get_goal() if grid.gx != -1 else None,
+        'hash': hashlib.sha1(data).hexdigest(),
+        'thumbnail': thumbnail(grid),
+    }
+
+def load_index() -> dict:
+    """Returns the saved index entries keyed by file name, or none if the index is missing or outdated."""
+    try:
+        with open(INDEX_FILE, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != INDEX_VERSION:
+        return {}
+    return data.get('levels', {})
+
+def save_index(levels: dict):
+    """Writes the index entries, replacing the index file in one step so readers never see half of it."""
+    temp_file = INDEX_FILE + '.tmp'
+    with open(temp_file, 'w') as f:
+        json.dump({'version': INDEX_VERSION, 'levels': levels}, f)
+    os.replace(temp_file, INDEX_FILE)
+
+def refresh() -> dict:
+    """
+    Brings the index up to date with the levels folder. Only levels whose modification time or size
+    changed since they were indexed are read; the rest cost one stat each.
+    Levels that cannot be read are left out.
+
+    Returns:
+        dict[str, dict]: Index entry of every level, keyed by file name, sorted by name.
+    """
+    old = load_index()
+    levels = {}
+    changed = False
+    for file_name in sorted(os.listdir(level_io.LEVEL_DIR)):
+        if not is_level(file_name):
+            continue
+        stat = os.stat(level_io.level_path(file_name))
+        entry = old.get(file_name)
+        if entry is None or entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            try:
+                entry = describe(file_name, stat)
+            except (OSError, ValueError, IndexError, TypeError, zlib.error):
+                continue # Not a level
+            changed = True
+        levels[file_name] = entry
+    if changed or levels.keys() != old.keys():
+        try:
+            save_index(levels)
+        except OSError:
+            pass # A read-only levels folder still gets an index for this session
+    return levels
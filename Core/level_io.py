@@ -0,0 +1,174 @@
+import json
+import os
+import struct
+import zlib
+import numpy as np
+from Core.grid_model import GridModel, STATE_CODES
+
+LEVEL_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Assets', 'Levels'))
+
+# Saved values are the state codes of empty, wall, start and goal. Anything else is saved as empty.
+SAVE_MAP = bytes(code if code <= STATE_CODES['goal'] else 0 for code in range(256))
+
+# Compressed levels: a zlib stream of a header, then every row as run-length encoded runs.
+# Each row is its run count (uint32), the value of every run (uint8 each), then the length of every run (uint32 each).
+COMPRESSED_EXTENSION = '.lvz'
+LEVEL_EXTENSIONS = ('.json', COMPRESSED_EXTENSION)
+COMPRESSED_MAGIC = b'PVLV'
+COMPRESSED_VERSION = 1
+COMPRESSED_HEADER = struct.Struct('<4sBII')
+RUN_COUNT = struct.Struct('<I')
+
+# Size (bytes) of the chunks compressed levels are read in.
+READ_CHUNK = 1 << 16
+
+def level_path(file_name: str) -> str:
+    """
+    Returns the path of a level file. Bare file names are looked up in the levels folder.
+
+    Parameters:
+        file_name (str): Level file name or path.
+    """
+    if os.path.dirname(file_name):
+        return file_name
+    return os.path.join(LEVEL_DIR, file_name)
+
+def serialize(grid) -> list[list[int]]:
+    """
+    Returns the level format of a grid: one list of saved values per row.
+
+    Parameters:
+        grid (GridModel): Grid to serialize.
+    """
+    cols = grid.cols
+    return [list(grid.cells[r * cols:(r + 1) * cols].translate(SAVE_MAP)) for r in range(grid.rows)]
+
+def write_level(grid, file_name: str):
+    """
+    Writes a grid to a level file. Files ending in COMPRESSED_EXTENSION are written compressed.
+
+    Parameters:
+        grid (GridModel): Grid to write.
+        file_name  (str): Level file name or path.
+    """
+    if file_name.endswith(COMPRESSED_EXTENSION):
+        with open(level_path(file_name), 'wb') as f:
+            write_compressed(grid, f)
+        return
+    with open(level_path(file_name), 'w') as f:
+        json.dump(serialize(grid), f)
+
+def write_compressed(grid, f):
+    """
+    Writes a grid in the compressed level format.
+
+    Parameters:
+        grid (GridModel): Grid to write.
+        f (BinaryIO): File to write to.
+    """
+    compressor = zlib.compressobj()
+    f.write(compressor.compress(COMPRESSED_HEADER.pack(COMPRESSED_MAGIC, COMPRESSED_VERSION, grid.rows, grid.cols)))
+    cols = grid.cols
+    for r in range(grid.rows):
+        row = np.frombuffer(grid.cells[r * cols:(r + 1) * cols].translate(SAVE_MAP), dtype=np.uint8)
+        starts = np.flatnonzero(np.diff(row)) + 1
+        starts = np.concatenate(([0], starts))
+        lengths = np.diff(np.append(starts, cols)).astype('<u4')
+        f.write(compressor.compress(RUN_COUNT.pack(len(starts)) + row[starts].tobytes() + lengths.tobytes()))
+    f.write(compressor.flush())
+
+def read_level(file_name: str) -> GridModel:
+    """
+    Reads a level file into a GridModel. Both the JSON and the compressed format are read.
+
+    Parameters:
+        file_name (str): Level file name or path.
+
+    Returns:
+        GridModel: The level.
+    """
+    with open(level_path(file_name), 'rb') as f:
+        return decode_level(f)
+
+def decode_level(f) -> GridModel:
+    """
+    Reads a level from a binary file object, telling the formats apart by their first byte:
+    JSON levels start with '[' (possibly after whitespace), compressed levels with a zlib header.
+
+    Parameters:
+        f (BinaryIO): File positioned at the start of the level.
+
+    Returns:
+        GridModel: The level.
+    """
+    head = f.read(1)
+    if head and head not in b'[ \t\r\n':
+        return _read_compressed(f, head)
+    serialized_grid = json.loads(head + f.read())
+    rows = len(serialized_grid)
+    cols = len(serialized_grid[0]) if rows > 0 else 0
+    grid = GridModel(rows, cols)
+    apply_grid_data(grid, serialized_grid)
+    return grid
+
+class _Decompressor:
+    """
+    Helper class that reads exact byte counts out of a zlib stream, decompressing the file in chunks as needed.
+    """
+    def __init__(self, f, head: bytes=b''):
+        self.f = f
+        self.zlib = zlib.decompressobj()
+        self.buffer = self.zlib.decompress(head)
+        self.offset = 0
+
+    def read(self, size: int) -> bytes:
+        while len(self.buffer) - self.offset < size:
+            chunk = self.f.read(READ_CHUNK)
+            if not chunk:
+                raise ValueError('Compressed level ended early.')
+            self.buffer = self.buffer[self.offset:] + self.zlib.decompress(chunk)
+            self.offset = 0
+        data = self.buffer[self.offset:self.offset + size]
+        self.offset += size
+        return data
+
+def _read_compressed(f, head: bytes=b'') -> GridModel:
+    """
+    Helper function that decodes a compressed level row by row straight into a new grid's cell buffer.
+    """
+    stream = _Decompressor(f, head)
+    magic, version, rows, cols = COMPRESSED_HEADER.unpack(stream.read(COMPRESSED_HEADER.size))
+    if magic != COMPRESSED_MAGIC or version != COMPRESSED_VERSION:
+        raise ValueError('Not a compressed level.')
+    grid = GridModel(rows, cols)
+    cells = grid.cells
+    for r in range(rows):
+        count, = RUN_COUNT.unpack(stream.read(RUN_COUNT.size))
+        values = np.frombuffer(stream.read(count), dtype=np.uint8)
+        lengths = np.frombuffer(stream.read(4 * count), dtype='<u4')
+        if lengths.sum() != cols:
+            raise ValueError(f'Row {r} of the compressed level has the wrong length.')
+        cells[r * cols:(r + 1) * cols] = np.repeat(values, lengths).tobytes().translate(SAVE_MAP)
+    grid.find_objectives()
+    return grid
+
+def apply_grid_data(grid, serialized_grid):
+    """
+    Applies level data to an existing grid.
+
+    Parameters:
+        grid (GridModel): Grid to fill.
+        serialized_grid: Grid as read from a level file.
+    """
+    load_map = {
+        0: STATE_CODES['empty'],
+        1: STATE_CODES['wall'],
+        2: STATE_CODES['start'],
+        3: STATE_CODES['goal']
+    }
+
+    cols = grid.cols
+    for r, row in enumerate(serialized_grid[:grid.rows]):
+        row = row[:cols]
+        grid.cells[r * cols:r * cols + len(row)] = bytes(load_map.get(val, 0) for val in row)
+    grid.find_objectives()
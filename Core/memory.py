@@ -0,0 +1,99 @@
+import os
+import tracemalloc
+
+# Paths in reports are shown relative to the repository.
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Number of allocation sites listed in a report.
+TOP_SITES = 10
+
+class MemoryReport:
+    """
+    Measures the Python memory allocated while some work runs, using tracemalloc.
+
+    Peak is the most memory held at once above what was allocated before the work started.
+    Retained is what is still allocated when the report finishes, grouped by the source line that allocated it,
+    so the structures a search keeps alive (nodes, visited sets, frontier entries) show up by name.
+    Memory allocated outside Python, such as Tk canvas items, is not traced.
+
+    Use it as a context manager, or call start() and finish() around work spread over several callbacks.
+
+    Attributes:
+        label (str): What was measured, e.g. 'search A*' or 'load Example1.json'.
+        peak_bytes (int): Peak memory above the starting point.
+        retained_bytes (int): Memory still allocated when the report finished.
+        sites (list[dict]): Largest retained allocations: 'site' (file:line), 'bytes' and 'blocks'.
+        started_tracing (bool): Whether this report turned tracemalloc on, and so turns it off again.
+    """
+    def __init__(self, label: str, top: int=TOP_SITES):
+        """
+        Parameters:
+            label (str): What is being measured.
+            top   (int): Number of allocation sites to keep.
+        """
+        self.label = label
+        self.top = top
+        self.peak_bytes = 0
+        self.retained_bytes = 0
+        self.sites = []
+        self.started_tracing = False
+        self._before = None
+        self._base = 0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.finish()
+        return False
+
+    def start(self):
+        """Starts tracing (if it is not on already) and records the starting point."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        self._before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        self._base = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def finish(self):
+        """Records the peak and retained memory, and the largest retained allocation sites."""
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak_bytes = max(0, peak - self._base)
+        self.retained_bytes = current - self._base
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+        stats = after.compare_to(self._before.filter_traces(filters), 'lineno')
+        stats = sorted((stat for stat in stats if stat.size_diff > 0), key=lambda stat: stat.size_diff, reverse=True)
+        self.sites = [{'site': _site(stat.traceback[0]), 'bytes': stat.size_diff, 'blocks': stat.count_diff}
+                      for stat in stats[:self.top]]
+        self._before = None
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+        return self
+
+    def to_dict(self) -> dict:
+        """Returns the report as JSON-serialisable data."""
+        return {'label': self.label, 'peak_bytes': self.peak_bytes, 'retained_bytes': self.retained_bytes,
+                'sites': self.sites}
+
+    def summary(self) -> str:
+        """Returns a one-line summary, e.g. 'search A*: 12.3 MB peak, 4.1 MB retained'."""
+        return f'{self.label}: {format_bytes(self.peak_bytes)} peak, {format_bytes(self.retained_bytes)} retained'
+
+def _site(frame) -> str:
+    """Helper function that names an allocation site as file:line, relative to the repository when inside it."""
+    file_name = frame.filename
+    if file_name.startswith(ROOT_DIR):
+        file_name = os.path.relpath(file_name, ROOT_DIR)
+    return f'{file_name}:{frame.lineno}'
+
+def format_bytes(size: int) -> str:
+    """Returns a byte count in the largest unit that keeps it above 1."""
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GB'
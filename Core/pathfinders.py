@@ -0,0 +1,67 @@
+import Core.config as config
+from Core.context import SearchContext
+import Algorithms.BFSDFS as BFSDFS, Algorithms.A_Star as A_Star, Algorithms.IDA_Star as IDA_Star, Algorithms.ARA_Star as ARA_Star, Algorithms.subgoal as subgoal
+import Algorithms.pruning as pruning, Algorithms.Theta_Star as Theta_Star
+
+# Algorithms selectable in the UI and the headless runner.
+ALGORITHMS = ['BFS', 'A*', 'DFS', 'UCS', 'GBeFS', 'IDA*', 'ARA*', 'Subgoal', 'Theta*']
+
+def get_route_cost(search) -> float:
+    """
+    Returns the cost of a finished search's route, scaled like config.get_move_cost(), for reporting and ranking searches.
+    Any-angle searches (Theta*) are costed by the straight segments between their corners rather than the moves
+    of the tiles drawn along them.
+
+    Parameters:
+        search (Pathfinder): The search.
+
+    Returns:
+        float: The cost, or 0 if no route was found.
+    """
+    if hasattr(search, 'get_route_cost'):
+        return round(search.get_route_cost(), 1)
+    return sum(config.get_move_cost(list(node.move)) for node in search.get_route() if node.move)
+
+def create_pathfinder(algo: str, grid, start, goal, heuristic: str='Manhattan', weight='1', level_name: str='',
+                      context: SearchContext | None=None):
+    """
+    Creates the pathfinder for an algorithm name, applying the heuristic settings each algorithm implies.
+
+    Parameters:
+        algo       (str): Algorithm name, one of ALGORITHMS.
+        grid (GridModel): Grid to search.
+        start, goal (tuple[int, int], tuple[int, int]): Start and goal coordinates.
+        heuristic  (str): Heuristic used by A*, IDA* and ARA*, one of heuristics.HEURISTICS.
+            Theta* always uses 'Euclidean', the only one that never overestimates an any-angle route,
+            or 'Manhattan' with Cardinal movement, where its routes are staircases of cardinal moves.
+        weight (str | float): Heuristic weight used by A*, IDA* and Theta*. 'Infinity' behaves like GBeFS.
+        level_name (str): Level file the grid was loaded from. Subgoal graphs are saved next to it.
+        context (SearchContext | None): Run state of the search. Defaults to a new context for config.movement_type.
+
+    Returns:
+        Pathfinder: The initialized search.
+    """
+    if algo == 'GBeFS' or weight == 'Infinity':
+        weight = 100000
+    if algo == 'UCS':
+        weight = 1
+        heuristic = 'None'
+    weight = float(weight)
+    context = context or SearchContext(config.movement_type)
+    if algo == 'Theta*':
+        heuristic = 'Manhattan' if context.movement_type == 'Cardinal' else 'Euclidean'
+
+    if algo == 'Subgoal':
+        graph = subgoal.get_graph(grid, level_name, context.movement_type)
+        return subgoal.Pathfinder(grid, *start, *goal, graph, context)
+    if algo == 'ARA*':
+        return ARA_Star.Pathfinder(grid, *start, *goal, heuristic, config.anytime_weight,
+                                   config.anytime_weight_step, config.anytime_deadline, context, config.heuristic_table)
+    if algo == 'IDA*':
+        return IDA_Star.Pathfinder(grid, *start, *goal, heuristic, weight, config.node_cap, context, config.heuristic_table)
+    prune = pruning.get_index(grid).skip_mask(start, goal) if config.dead_end_pruning else None
+    if algo in ['A*', 'GBeFS', 'UCS']:
+        return A_Star.Pathfinder(grid, *start, *goal, heuristic, weight, context, config.heuristic_table, prune)
+    if algo == 'Theta*':
+        return Theta_Star.Pathfinder(grid, *start, *goal, heuristic, weight, context, config.heuristic_table, prune)
+    return BFSDFS.Pathfinder(grid, *start, *goal, algo, context, prune)
@@ -0,0 +1,228 @@
+"""
+Races several pathfinder configurations on one query in worker processes, for queries with a latency target
+where it is not known in advance which algorithm finishes first on a given map.
+
+The grid is copied once into shared memory, and every worker searches that same buffer. The first valid route
+wins and the other searches are cancelled; with best=True the cheapest route found before the deadline wins instead.
+
+Examples:
+    python -m Core.headless portfolio --generate Caves --size 1000x1000 --seed 3 --algorithms BFS A* GBeFS
+    python -m Core.headless portfolio --level Example1.json --algorithms A* UCS Theta* --best --deadline 2
+"""
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+from Core.comparison import snapshot
+from Core.context import SearchContext
+from Core.grid_model import GridModel
+from Core.pathfinders import create_pathfinder, get_route_cost
+import Core.config as config
+
+# Steps a worker takes between checks for cancellation.
+CHECK_STEPS = 256
+
+# Config settings that affect searches, copied to the workers with every query.
+SEARCH_SETTINGS = ('node_cap', 'anytime_weight', 'anytime_weight_step', 'anytime_deadline', 'heuristic_table', 'dead_end_pruning')
+
+def _worker(index: int, tasks, results, cancelled):
+    """
+    Worker process loop: runs each search it is given on the shared grid and reports the result.
+
+    Parameters:
+        index (int): Position of the worker's configuration in the portfolio.
+        tasks (multiprocessing.Queue): Search tasks, or None to exit.
+        results (multiprocessing.Queue): (query, index, result) of every task.
+        cancelled (multiprocessing.Value): Highest query number that has been decided. Searches of it stop.
+    """
+    results.put((0, index, None)) # Ready
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        query = task['query']
+        if cancelled.value >= query:
+            results.put((query, index, {'status': 'cancelled'}))
+            continue
+        try:
+            memory = shared_memory.SharedMemory(name=task['memory'])
+        except FileNotFoundError:
+            results.put((query, index, {'status': 'cancelled'})) # Decided before this worker attached
+            continue
+        try:
+            results.put((query, index, _search(task, memory.buf, cancelled)))
+        except Exception as error:
+            results.put((query, index, {'status': 'error', 'error': f'{type(error).__name__}: {error}'}))
+        finally:
+            memory.close()
+
+def _search(task: dict, cells, cancelled) -> dict:
+    """Helper function that runs one search of a task on shared cells, stopping early if its query is decided."""
+    grid = GridModel(task['rows'], task['cols'], cells)
+    for name, value in task['settings'].items():
+        setattr(config, name, value)
+    context = SearchContext(task['movement'])
+    start_time = time.perf_counter()
+    search = create_pathfinder(task['algorithm'], grid, task['start'], task['goal'], task['heuristic'],
+                               task['weight'], task['level_name'], context)
+    steps = 0
+    expansions = 0
+    running = True
+    while running:
+        running = search.step()
+        steps += 1
+        if search.last_popped is not None:
+            expansions += 1
+        if steps % CHECK_STEPS == 0 and cancelled.value >= task['query']:
+            context.cancel()
+            return {'status': 'cancelled', 'steps': steps, 'expansions': expansions,
+                    'seconds': round(time.perf_counter() - start_time, 6)}
+    route = search.get_route()
+    return {
+        'status': 'found' if route else 'failed',
+        'steps': steps,
+        'expansions': expansions,
+        'seconds': round(time.perf_counter() - start_time, 6),
+        'route_cost': get_route_cost(search),
+        'route': [[node.x, node.y] for node in reversed(route)],
+    }
+
+class Portfolio:
+    """
+    A set of pathfinder configurations, each with its own worker process, kept running between queries.
+    Workers are started once, so a query only pays for copying the grid into shared memory.
+
+    Attributes:
+        configs (list[tuple[str, str, str]]): (algorithm, heuristic, weight) of each worker.
+        labels (list[str]): Name of each configuration in results, e.g. 'A* (Manhattan, 1)'.
+        processes (list[multiprocessing.Process]): The workers, one per configuration.
+        tasks (list[multiprocessing.Queue]): Task queue of each worker.
+        results (multiprocessing.Queue): Results of every worker.
+        cancelled (multiprocessing.Value): Highest query number that has been decided.
+        query (int): Number of the last query run.
+    """
+    def __init__(self, configs: list[tuple[str, str, str]]):
+        """
+        Starts a worker per configuration and waits until they are ready.
+        Workers are spawned rather than forked, so they are safe to start from the GUI process.
+
+        Parameters:
+            configs (list[tuple[str, str, str]]): (algorithm, heuristic, weight) of each configuration.
+        """
+        self.configs = configs
+        self.labels = [f'{algo} ({heuristic}, {weight})' if algo in ['A*', 'IDA*'] else algo
+                       for algo, heuristic, weight in configs]
+        context = multiprocessing.get_context('spawn')
+        self.results = context.Queue()
+        self.cancelled = context.Value('q', 0, lock=False)
+        self.tasks = [context.Queue() for _ in configs]
+        self.processes = [context.Process(target=_worker, args=(i, self.tasks[i], self.results, self.cancelled), daemon=True)
+                          for i in range(len(configs))]
+        self.query = 0
+        for process in self.processes:
+            process.start()
+        for _ in self.processes:
+            self.results.get()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def run(self, grid, movement: str='Cardinal', deadline: float | None=None, best: bool=False, start=None,
+            goal=None, level_name: str='') -> dict:
+        """
+        Races every configuration on one query.
+
+        Parameters:
+            grid (GridModel): Grid to search. Must have a start and a goal, unless both are given.
+            movement (str): 'Cardinal' or 'Diagonal'.
+            deadline (float | None): Seconds to wait for a route. Searches still running then are cancelled.
+            best (bool): Wait for every search (or the deadline) and pick the cheapest route,
+                instead of taking the first route found.
+            start, goal (tuple[int, int] | None): Coordinates to search between instead of the grid's start and goal.
+            level_name (str): Level file the grid was loaded from, if any.
+
+        Returns:
+            dict: 'winner' (label, or None if no route was found in time), 'route' ([x, y] coordinates from start
+                to goal), 'route_cost', 'seconds' until the winner was decided, and the 'results' of each configuration.
+        """
+        self.query += 1
+        query = self.query
+        begin = time.perf_counter()
+        cells = bytes(snapshot(grid).cells)
+        memory = shared_memory.SharedMemory(create=True, size=max(1, len(cells)))
+        try:
+            memory.buf[:len(cells)] = cells
+            task = {'query': query, 'memory': memory.name, 'rows': grid.rows, 'cols': grid.cols,
+                    'start': tuple(start or grid.get_start()), 'goal': tuple(goal or grid.get_goal()),
+                    'movement': movement, 'level_name': level_name,
+                    'settings': {name: getattr(config, name) for name in SEARCH_SETTINGS}}
+            for tasks, (algo, heuristic, weight) in zip(self.tasks, self.configs):
+                tasks.put({**task, 'algorithm': algo, 'heuristic': heuristic, 'weight': weight})
+            results = self._collect(query, begin, deadline, best)
+        finally:
+            self.cancelled.value = query
+            memory.close()
+            memory.unlink() # Workers still attached keep their mapping until they detach
+        seconds = time.perf_counter() - begin
+
+        found = [i for i, result in enumerate(results) if result and result['status'] == 'found']
+        winner = min(found, key=lambda i: results[i]['route_cost']) if best and found else \
+            min(found, key=lambda i: results[i]['order']) if found else None
+        report = []
+        for i, (label, result) in enumerate(zip(self.labels, results)):
+            result = dict(result or {'status': 'cancelled'})
+            result.pop('route', None)
+            result.pop('order', None)
+            if i == winner:
+                result['status'] = 'won'
+            report.append({'label': label, **result})
+        return {
+            'winner': self.labels[winner] if winner is not None else None,
+            'route': results[winner]['route'] if winner is not None else [],
+            'route_cost': results[winner]['route_cost'] if winner is not None else 0,
+            'seconds': round(seconds, 6),
+            'results': report,
+        }
+
+    def _collect(self, query: int, begin: float, deadline: float | None, best: bool) -> list[dict | None]:
+        """
+        Helper method that gathers results of a query until it is decided: the first route found (or every
+        search finished, with best), or the deadline. Results left over from earlier queries are dropped.
+
+        Returns:
+            list[dict | None]: Result of each configuration, None for those still running. Each has its arrival 'order'.
+        """
+        results = [None] * len(self.configs)
+        pending = len(self.configs)
+        order = 0
+        while pending:
+            timeout = None if deadline is None else deadline - (time.perf_counter() - begin)
+            if timeout is not None and timeout <= 0:
+                break
+            try:
+                result_query, index, result = self.results.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if result_query != query:
+                continue
+            result['order'] = order
+            order += 1
+            results[index] = result
+            pending -= 1
+            if result['status'] == 'found' and not best:
+                break
+        return results
+
+    def close(self):
+        """Stops the workers."""
+        self.cancelled.value = self.query
+        for tasks in self.tasks:
+            tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
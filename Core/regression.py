@@ -0,0 +1,221 @@
+"""
+Runs a pinned set of search scenarios headlessly and compares them against a committed baseline.
+
+Expansions and route costs must match the baseline exactly (unless a tolerance is given), and
+wall time, normalised by a calibration workload that does not touch the pathfinders, may grow by
+at most --time-tolerance. The workload is timed just before every run, and the median ratio is
+compared, so a machine that slows down or speeds up during the check shifts both alike. Animation exports are also written and read back, to check every frame is kept.
+The exit code is 1 if any scenario regressed.
+
+Examples:
+    python -m Core.regression
+    python -m Core.regression --scenario maze --repeat 5
+    python -m Core.regression --update
+"""
+import argparse
+import heapq
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from PIL import Image
+import Core.generators as generators
+import Core.level_io as level_io
+import Algorithms.heuristics as heuristics
+import Algorithms.pruning as pruning
+import Algorithms.subgoal as subgoal
+from Core.export import export_animation
+from Core.headless import run_search
+
+BASELINE_FILE = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Assets', 'Benchmarks',
+                                             'baseline.json'))
+
+# Default thresholds, as fractions of the baseline value.
+TIME_TOLERANCE = 0.5
+EXPANSION_TOLERANCE = 0.0
+COST_TOLERANCE = 0.0
+# Scenarios faster than this (s) in the baseline are too noisy to compare times for.
+MIN_TIMED_SECONDS = 0.005
+
+# The pinned scenarios. Maps are generated from fixed seeds, or read from a level file.
+SCENARIOS = [
+    {'name': 'maze-bfs', 'generate': 'Maze', 'size': (201, 201), 'seed': 1, 'algorithm': 'BFS'},
+    {'name': 'maze-dfs', 'generate': 'Maze', 'size': (201, 201), 'seed': 1, 'algorithm': 'DFS'},
+    {'name': 'caves-astar', 'generate': 'Caves', 'size': (201, 201), 'seed': 2, 'algorithm': 'A*'},
+    {'name': 'caves-astar-diagonal', 'generate': 'Caves', 'size': (201, 201), 'seed': 2, 'algorithm': 'A*',
+     'movement': 'Diagonal', 'heuristic': 'Diagonal'},
+    {'name': 'caves-ara', 'generate': 'Caves', 'size': (151, 151), 'seed': 3, 'algorithm': 'ARA*'},
+    {'name': 'caves-ida', 'generate': 'Caves', 'size': (61, 61), 'seed': 4, 'algorithm': 'IDA*'},
+    {'name': 'rooms-gbefs', 'generate': 'Rooms', 'size': (201, 201), 'seed': 5, 'algorithm': 'GBeFS'},
+    {'name': 'rooms-ucs-diagonal', 'generate': 'Rooms', 'size': (201, 201), 'seed': 5, 'algorithm': 'UCS',
+     'movement': 'Diagonal'},
+    {'name': 'rooms-subgoal', 'generate': 'Rooms', 'size': (201, 201), 'seed': 6, 'algorithm': 'Subgoal',
+     'movement': 'Diagonal'},
+    {'name': 'random-bfs-diagonal', 'generate': 'Random', 'size': (201, 201), 'seed': 11, 'algorithm': 'BFS',
+     'movement': 'Diagonal'},
+    {'name': 'example1-astar', 'level': 'Example1.json', 'algorithm': 'A*', 'movement': 'Diagonal',
+     'heuristic': 'Diagonal'},
+]
+
+def calibrate() -> float:
+    """
+    Times a fixed workload of heap, set and arithmetic operations that does not use any of the
+    pathfinding code, so scenario times can be compared across machines and runs.
+
+    Returns:
+        float: Time (s) of the workload.
+    """
+    start_time = time.perf_counter()
+    heap = []
+    seen = set()
+    for i in range(200000):
+        cell = (i * 7919) % 100003
+        if cell not in seen:
+            seen.add(cell)
+            heapq.heappush(heap, (cell % 977, i, cell))
+    while heap:
+        heapq.heappop(heap)
+    return time.perf_counter() - start_time
+
+def load_scenario_grid(scenario: dict):
+    """Returns the grid of a scenario."""
+    if 'level' in scenario:
+        return level_io.read_level(scenario['level'])
+    cols, rows = scenario['size']
+    return generators.generate(scenario['generate'], rows, cols, scenario['seed'])
+
+def clear_caches():
+    """
+    Empties the session caches of data derived from a map (subgoal graphs, dead-end indexes, heuristic tables),
+    so every run pays for building what it uses, as the first search on a map does.
+    """
+    subgoal._graphs.clear()
+    pruning._indexes.clear()
+    heuristics.heuristic_table.cache_clear()
+
+def run_scenario(scenario: dict, repeat: int=5) -> dict:
+    """
+    Runs a scenario several times, each on a fresh copy of its map and with cold caches,
+    timing the calibration workload just before each run.
+
+    Returns:
+        dict: Expansions, route cost, median wall time (s), the median ratio of wall time to calibration time
+            ('normalised'), and the median calibration time (s) of the scenario.
+    """
+    seconds = []
+    calibrations = []
+    for _ in range(repeat):
+        grid = load_scenario_grid(scenario)
+        clear_caches()
+        calibrations.append(calibrate())
+        stats = run_search(grid, scenario['algorithm'], scenario.get('heuristic', 'Manhattan'), scenario.get('weight', '1'),
+                           scenario.get('movement', 'Cardinal'), scenario.get('level', ''))
+        seconds.append(stats['seconds'])
+    return {'expansions': stats['expansions'], 'route_cost': stats['route_cost'],
+            'seconds': round(statistics.median(seconds), 6),
+            'normalised': round(statistics.median(t / c for t, c in zip(seconds, calibrations)), 4),
+            'calibration': statistics.median(calibrations)}
+
+def check_exports(level: str='Example1.json', algo: str='BFS') -> list[str]:
+    """
+    Exports a search in every animation format and reads each file back.
+
+    Returns:
+        list[str]: A description of every export whose frame count differs from the frames rendered.
+    """
+    grid = level_io.read_level(level)
+    problems = []
+    with tempfile.TemporaryDirectory() as folder:
+        for extension in ('gif', 'png', 'apng'):
+            path = os.path.join(folder, f'export.{extension}')
+            stats = export_animation(grid, path, algo, level_name=level)
+            with Image.open(path) as image:
+                frames = getattr(image, 'n_frames', 1)
+            if frames != stats['frames']:
+                problems.append(f"export-{extension}: file has {frames} frames, {stats['frames']} were rendered")
+    return problems
+
+def compare(name: str, result: dict, baseline: dict | None, thresholds: dict) -> list[str]:
+    """
+    Compares a scenario's result against its baseline.
+
+    Parameters:
+        name (str): Scenario name.
+        result (dict): The scenario's result, with 'normalised' time.
+        baseline (dict | None): The baseline result, or None if the scenario has none.
+        thresholds (dict): Allowed growth of 'time', 'expansions' and 'route_cost', as fractions.
+
+    Returns:
+        list[str]: A description of every regression. Empty if the scenario passed.
+    """
+    if baseline is None:
+        return [f'{name}: no baseline (run with --update to record one)']
+    problems = []
+    for key, limit in (('expansions', thresholds['expansions']), ('route_cost', thresholds['route_cost'])):
+        if abs(result[key] - baseline[key]) > limit * baseline[key]:
+            problems.append(f'{name}: {key} changed from {baseline[key]} to {result[key]}')
+    if baseline['seconds'] < MIN_TIMED_SECONDS:
+        return problems
+    if result['normalised'] > baseline['normalised'] * (1 + thresholds['time']):
+        problems.append(f"{name}: normalised time grew from {baseline['normalised']} to {result['normalised']} "
+                        f"({result['normalised'] / baseline['normalised'] - 1:+.0%})")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m Core.regression', description='Check the pathfinders against a stored baseline.')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Baseline file to compare against or update.')
+    parser.add_argument('--update', action='store_true', help='Record the current results as the new baseline.')
+    parser.add_argument('--scenario', action='append', default=[], help='Only run scenarios whose name contains this text.')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per scenario; the median is kept.')
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE, help='Allowed growth of normalised time.')
+    parser.add_argument('--expansion-tolerance', type=float, default=EXPANSION_TOLERANCE, help='Allowed change in expansions.')
+    parser.add_argument('--cost-tolerance', type=float, default=COST_TOLERANCE, help='Allowed change in route cost.')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON instead of a table.')
+    parser.add_argument('--skip-exports', action='store_true', help='Do not check the animation exports.')
+    args = parser.parse_args(argv)
+    thresholds = {'time': args.time_tolerance, 'expansions': args.expansion_tolerance, 'route_cost': args.cost_tolerance}
+
+    baseline = {'scenarios': {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+
+    calibrate() # Warm up before anything is timed
+    scenarios = [scenario for scenario in SCENARIOS
+                 if not args.scenario or any(text in scenario['name'] for text in args.scenario)]
+    results = {}
+    problems = []
+    calibrations = []
+    for scenario in scenarios:
+        result = run_scenario(scenario, args.repeat)
+        calibrations.append(result.pop('calibration'))
+        results[scenario['name']] = result
+        if not args.update:
+            problems += compare(scenario['name'], result, baseline['scenarios'].get(scenario['name']), thresholds)
+
+    calibration = statistics.median(calibrations) if calibrations else calibrate()
+    if not args.update and not args.skip_exports:
+        problems += check_exports()
+
+    if args.update:
+        baseline['scenarios'].update(results)
+        baseline['calibration_seconds'] = round(calibration, 6)
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if args.json:
+        print(json.dumps({'calibration_seconds': round(calibration, 6), 'results': results, 'problems': problems}))
+    else:
+        print(f'{"scenario":<24}{"expansions":>12}{"cost":>10}{"normalised":>12}{"baseline":>10}')
+        for name, result in results.items():
+            base = baseline['scenarios'].get(name, {}).get('normalised', '-')
+            print(f"{name:<24}{result['expansions']:>12}{result['route_cost']:>10}{result['normalised']:>12}{base:>10}")
+        print('\n'.join(problems) if problems else ('Baseline updated.' if args.update else 'No regressions.'))
+    return 1 if problems else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import queue
+import threading
+import time
+import traceback
+
+# Control messages understood by SearchWorker.
+PAUSE = 'pause'
+RESUME = 'resume'
+STOP = 'stop'
+
+# Kinds of update messages put on SearchWorker.updates.
+DELTA = 'delta'
+DONE = 'done'
+
+class SearchWorker(threading.Thread):
+    """
+    Runs a Pathfinder off the Tk thread and streams its progress as batched cell-state deltas.
+
+    Every step contributes the popped cell to the closed list and the newly enqueued cells to the open list.
+    Steps are grouped into batches which are put on the updates queue for the Tk loop to drain once per frame.
+
+    Attributes:
+        search       (Pathfinder): The search to run. Must expose context, last_popped and last_enqueued.
+        trace (SearchTrace | None): Optional trace that records every step of the search.
+        delay               (int): Delay (ms) between steps. Delays of 1ms or less run at full speed.
+        batch_size          (int): Maximum number of steps per delta batch.
+        batch_interval    (float): Maximum time (s) a batch is held before being sent.
+        updates     (queue.Queue): Outgoing ('delta', opened, closed) and ('done', route, error) messages.
+            The 'done' message is always sent last, even if the search raised.
+        controls    (queue.Queue): Incoming control messages (pause, resume, stop).
+        paused             (bool): Whether the worker is currently paused.
+        steps               (int): Number of steps performed so far.
+        error        (str | None): The exception the search raised, if it did, as 'Type: message'.
+    """
+    def __init__(self, search, delay=1, batch_size=500, batch_interval=0.015, max_pending=64, trace=None):
+        """
+        Initializes the worker. Call start() to begin the search.
+
+        Parameters:
+            search     (Pathfinder): The search to run.
+            delay             (int): Delay (ms) between steps.
+            batch_size        (int): Maximum number of steps per delta batch.
+            batch_interval  (float): Maximum time (s) a batch is held before being sent.
+            max_pending       (int): Maximum number of undrained batches before the worker waits for the UI.
+            trace (SearchTrace | None): Optional trace to record the search into.
+        """
+        super().__init__(daemon=True)
+        self.search = search
+        self.trace = trace
+        self.delay = delay
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.updates = queue.Queue(maxsize=max_pending)
+        self.controls = queue.Queue()
+        self.paused = False
+        self.stopped = False
+        self.steps = 0
+        self.error = None
+
+    def pause(self):
+        self.controls.put(PAUSE)
+
+    def resume(self):
+        self.controls.put(RESUME)
+
+    def stop(self):
+        self.controls.put(STOP)
+
+    def run(self):
+        route = []
+        try:
+            self._search()
+            route = self.search.get_route()
+            if self.trace is not None and not self.stopped:
+                self.trace.finish(route)
+        except Exception as error:
+            traceback.print_exc()
+            self.error = f'{type(error).__name__}: {error}'
+            self.search.context.simulating = False
+            self.search.context.failed = True
+            route = []
+        finally:
+            self._put((DONE, route, self.error))
+
+    def _search(self):
+        """Steps the search until it finishes or is stopped, sending its progress as delta batches."""
+        opened, closed = [], []
+        batch_steps = 0
+        batch_start = time.perf_counter()
+        running = True
+        while running:
+            self._handle_controls()
+            if self.stopped:
+                break
+            if self.paused:
+                self._flush(opened, closed)
+                opened, closed = [], []
+                time.sleep(0.01)
+                continue
+
+            running = self.search.step()
+            self.steps += 1
+            batch_steps += 1
+            if self.search.last_popped is not None:
+                closed.append(self.search.last_popped)
+            opened.extend(self.search.last_enqueued)
+            if self.trace is not None:
+                self.trace.record(self.search)
+
+            if batch_steps >= self.batch_size or time.perf_counter() - batch_start >= self.batch_interval:
+                self._flush(opened, closed)
+                opened, closed = [], []
+                batch_steps = 0
+                batch_start = time.perf_counter()
+            if self.delay > 1:
+                time.sleep(self.delay / 1000)
+
+        self._flush(opened, closed)
+
+    def _handle_controls(self):
+        """Applies any pending control messages."""
+        while True:
+            try:
+                message = self.controls.get_nowait()
+            except queue.Empty:
+                return
+            if message == PAUSE:
+                self.paused = True
+            elif message == RESUME:
+                self.paused = False
+            elif message == STOP:
+                self.stopped = True
+                self.search.context.cancel()
+
+    def _flush(self, opened, closed):
+        """Sends a delta batch if it holds any changes."""
+        if opened or closed:
+            self._put((DELTA, opened, closed))
+
+    def _put(self, message):
+        """Puts a message on the updates queue, waiting for the UI to catch up while honouring stop requests."""
+        while True:
+            try:
+                self.updates.put(message, timeout=0.05)
+                return
+            except queue.Full:
+                self._handle_controls()
+                if self.stopped:
+                    return
@@ -0,0 +1,267 @@
+"""
+Serves route queries to other tools as JSON lines, over stdin/stdout or a localhost socket.
+
+Every request is one JSON object per line, and every response carries the request's id:
+    {"id": 1, "op": "route", "level": "Example1.json", "algorithm": "A*", "start": [0, 0], "goal": [9, 9]}
+    {"id": 2, "op": "stats"}
+    {"id": 3, "op": "ping"}
+
+Examples:
+    python -m Core.service
+    python -m Core.service --port 8765 --workers 8
+"""
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import io
+import json
+import socketserver
+import sys
+import threading
+import time
+import Core.config as config
+import Core.level_io as level_io
+from Core.grid_model import GridModel, STATE_CODES
+from Core.headless import run_search
+from Core.pathfinders import ALGORITHMS
+
+# Saved objectives are served as empty tiles, so any pair of cells can be queried.
+QUERY_MAP = bytes(STATE_CODES['empty'] if code in (STATE_CODES['start'], STATE_CODES['goal']) else code
+                  for code in range(256))
+
+# Number of most recent requests whose latency is kept for the stats op.
+LATENCY_WINDOW = 10000
+
+class LevelCache:
+    """
+    Parsed levels kept in memory, keyed by level name and a hash of the file's contents.
+    An edited level file gets a new key, so stale grids are never served.
+
+    Attributes:
+        size (int): Maximum number of levels kept. The least recently used are dropped first.
+        levels (dict[tuple[str, str], tuple[GridModel, tuple, tuple]]): Query grid, start and goal of each level.
+        hits, misses (int, int): Lookups answered from memory and from disk.
+        lock (threading.Lock): Guards levels and the counters.
+    """
+    def __init__(self, size: int=16):
+        """
+        Parameters:
+            size (int): Maximum number of levels kept.
+        """
+        self.size = size
+        self.levels = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, level_name: str) -> tuple[GridModel, tuple, tuple]:
+        """
+        Returns a level's query grid with its saved start and goal.
+        The file is read and hashed on every call, but parsed only when its contents are new.
+
+        Parameters:
+            level_name (str): Level file name (in Assets/Levels) or path.
+
+        Returns:
+            tuple[GridModel, tuple, tuple]: Grid with the objectives cleared, and the saved start and goal.
+        """
+        with open(level_io.level_path(level_name), 'rb') as f:
+            data = f.read()
+        key = (level_name, hashlib.sha1(data).hexdigest())
+        with self.lock:
+            level = self.levels.pop(key, None)
+            if level is not None:
+                self.hits += 1
+                self.levels[key] = level # Most recently used last
+                return level
+
+        grid = level_io.decode_level(io.BytesIO(data))
+        start, goal = (grid.sx, grid.sy), (grid.gx, grid.gy)
+        grid = GridModel(grid.rows, grid.cols, grid.cells.translate(QUERY_MAP))
+        level = (grid, start, goal)
+        with self.lock:
+            self.misses += 1
+            self.levels[key] = level
+            while len(self.levels) > self.size:
+                del self.levels[next(iter(self.levels))]
+        return level
+
+class Service:
+    """
+    Answers requests with the existing pathfinders. Requests run concurrently on a thread pool.
+    Grids are only read by searches, so one cached grid serves any number of queries at once.
+
+    Attributes:
+        cache (LevelCache): Parsed levels.
+        executor (ThreadPoolExecutor): Runs requests.
+        latencies (deque[float]): Milliseconds taken by each of the last LATENCY_WINDOW answered requests, for the stats op.
+        requests (int): Number of requests answered.
+        lock (threading.Lock): Guards latencies and requests.
+    """
+    def __init__(self, workers: int=4, cache_size: int=16):
+        """
+        Parameters:
+            workers (int): Number of requests handled at once.
+            cache_size (int): Maximum number of levels kept in memory.
+        """
+        self.cache = LevelCache(cache_size)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def submit(self, line: str, respond):
+        """
+        Handles a request line on the thread pool.
+
+        Parameters:
+            line (str): JSON request.
+            respond (Callable[[dict], None]): Called with the response once the request is answered.
+        """
+        received = time.perf_counter()
+        self.executor.submit(lambda: respond(self.handle(line, received)))
+
+    def handle(self, line: str, received: float | None=None) -> dict:
+        """
+        Answers a request.
+
+        Parameters:
+            line (str): JSON request.
+            received (float | None): time.perf_counter() when the request arrived. Defaults to now.
+
+        Returns:
+            dict: The response. 'ok' is False and 'error' describes the problem if the request failed.
+        """
+        received = received or time.perf_counter()
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            op = request.get('op', 'route')
+            if op == 'route':
+                response = self.route(request)
+            elif op == 'stats':
+                response = self.stats()
+            elif op == 'ping':
+                response = {}
+            else:
+                raise ValueError(f'unknown op {op!r}')
+            response = {'id': request_id, 'ok': True, **response}
+        except Exception as error:
+            response = {'id': request_id, 'ok': False, 'error': f'{type(error).__name__}: {error}'}
+        latency = (time.perf_counter() - received) * 1000
+        response['latency_ms'] = round(latency, 3)
+        with self.lock:
+            self.latencies.append(latency)
+            self.requests += 1
+        return response
+
+    def route(self, request: dict) -> dict:
+        """
+        Answers a route query. 'level' is required; 'start' and 'goal' default to the level's saved objectives.
+
+        Returns:
+            dict: Search statistics, with the route as [x, y] coordinates from start to goal.
+        """
+        level_name = request['level']
+        algo = request.get('algorithm', 'A*')
+        if algo not in ALGORITHMS:
+            raise ValueError(f'unknown algorithm {algo!r}')
+        movement = request.get('movement', 'Cardinal')
+        if movement not in ('Cardinal', 'Diagonal'):
+            raise ValueError(f'unknown movement {movement!r}')
+        grid, start, goal = self.cache.get(level_name)
+        start = tuple(request.get('start', start))
+        goal = tuple(request.get('goal', goal))
+        for x, y in (start, goal):
+            if grid.is_OOB(x, y) or grid.get(x, y) == 'wall':
+                raise ValueError(f'[{x}, {y}] is not a passable tile')
+        return run_search(grid, algo, request.get('heuristic', 'Manhattan'), request.get('weight', '1'),
+                          movement, level_name, start, goal, include_route=True)
+
+    def stats(self) -> dict:
+        """
+        Returns the level cache counters, the number of requests answered, and latency percentiles in milliseconds
+        over the last LATENCY_WINDOW requests.
+        """
+        with self.lock:
+            latencies = sorted(self.latencies)
+            requests = self.requests
+        stats = {'levels_cached': len(self.cache.levels), 'cache_hits': self.cache.hits,
+                 'cache_misses': self.cache.misses, 'requests': requests}
+        if latencies:
+            for name, share in (('p50_ms', 0.5), ('p95_ms', 0.95), ('max_ms', 1.0)):
+                stats[name] = round(latencies[min(len(latencies) - 1, int(share * len(latencies)))], 3)
+        return stats
+
+    def serve_stream(self, lines, output):
+        """
+        Answers every request line from an input stream, writing responses as they complete.
+        Responses can arrive out of order; match them by id.
+
+        Parameters:
+            lines (Iterable[str]): Request lines.
+            output (TextIO): Stream the responses are written to.
+        """
+        write_lock = threading.Lock()
+        def respond(response):
+            with write_lock:
+                output.write(json.dumps(response) + '\n')
+                output.flush()
+        for line in lines:
+            if line.strip():
+                self.submit(line, respond)
+        self.executor.shutdown(wait=True)
+
+    def serve_socket(self, port: int):
+        """
+        Answers requests on a localhost TCP port until interrupted. Every connection is served concurrently.
+
+        Parameters:
+            port (int): Port to listen on, on 127.0.0.1.
+        """
+        service = self
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                write_lock = threading.Lock()
+                pending = []
+                def respond(response):
+                    with write_lock:
+                        self.wfile.write((json.dumps(response) + '\n').encode())
+                        self.wfile.flush()
+                for line in self.rfile:
+                    if line.strip():
+                        done = threading.Event()
+                        pending.append(done)
+                        service.submit(line.decode(), lambda response, done=done: (respond(response), done.set()))
+                for done in pending:
+                    done.wait() # Keep the connection open until every answer is written
+
+        socketserver.ThreadingTCPServer.daemon_threads = True
+        with socketserver.ThreadingTCPServer(('127.0.0.1', port), Handler) as server:
+            print(json.dumps({'listening': f'127.0.0.1:{server.server_address[1]}'}), flush=True)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        self.executor.shutdown(wait=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m Core.service', description='Serve route queries as JSON lines.')
+    parser.add_argument('--port', type=int, default=None, help='Listen on this localhost port instead of stdin/stdout.')
+    parser.add_argument('--workers', type=int, default=4, help='Number of requests handled at once.')
+    parser.add_argument('--cache-size', type=int, default=16, help='Maximum number of levels kept in memory.')
+    parser.add_argument('--prune', action='store_true', help='Skip dead ends and corridors that cannot lie on the route.')
+    args = parser.parse_args(argv)
+    config.dead_end_pruning = args.prune
+
+    service = Service(args.workers, args.cache_size)
+    if args.port is None:
+        service.serve_stream(sys.stdin, sys.stdout)
+    else:
+        service.serve_socket(args.port)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import re
+import zlib
+
+# Cell codes of a timeline frame.
+EMPTY = 0
+OPEN = 1
+CLOSED = 2
+ROUTE = 3
+
+# Bounds on how many steps are replayed after restoring a checkpoint.
+MIN_INTERVAL = 256
+MAX_CHECKPOINTS = 256
+
+_TO_BITS = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_BITS = bytes.maketrans(b'01', b'\x00\x01')
+_NONZERO = re.compile(b'[^\x00]')
+
+class TraceTimeline:
+    """
+    Seekable view of a SearchTrace, backed by periodic checkpoints of the open and closed lists.
+
+    Each checkpoint stores the open and closed lists as zlib compressed bitsets, so seeking restores
+    the nearest earlier checkpoint and replays at most `interval` steps from the trace.
+
+    Attributes:
+        trace        (SearchTrace): The trace being viewed.
+        interval             (int): Number of steps between checkpoints.
+        checkpoints (list[tuple[bytes, bytes]]): Compressed (open, closed) bitsets at steps 0, interval, 2 * interval, ...
+    """
+    def __init__(self, trace, interval: int | None=None):
+        """
+        Builds the checkpoints in a single pass over the trace.
+
+        Parameters:
+            trace (SearchTrace): The trace to view.
+            interval (int | None): Steps between checkpoints. Defaults to a value that keeps at most MAX_CHECKPOINTS.
+        """
+        self.trace = trace
+        self.size = trace.rows * trace.cols
+        self.interval = interval or max(MIN_INTERVAL, -(-len(trace) // MAX_CHECKPOINTS))
+        self.checkpoints = []
+
+        opened = bytearray(self.size)
+        closed = bytearray(self.size)
+        opened[trace.start] = 1
+        for i in range(len(trace)):
+            if i % self.interval == 0:
+                self.checkpoints.append((self._pack(opened), self._pack(closed)))
+            self._apply(i, opened, closed)
+
+    def __len__(self):
+        return len(self.trace)
+
+    def frame(self, step: int) -> bytearray:
+        """
+        Returns the state of every cell after the first `step` steps of the search.
+
+        Parameters:
+            step (int): Number of steps applied, from 0 to len(trace).
+
+        Returns:
+            bytearray: One code (EMPTY, OPEN or CLOSED) per packed cell.
+        """
+        step = max(0, min(step, len(self.trace)))
+        index = min(step // self.interval, len(self.checkpoints) - 1) if self.checkpoints else -1
+        if index < 0:
+            opened = bytearray(self.size)
+            closed = bytearray(self.size)
+            opened[self.trace.start] = 1
+            first = 0
+        else:
+            opened = self._unpack(self.checkpoints[index][0])
+            closed = self._unpack(self.checkpoints[index][1])
+            first = index * self.interval
+        for i in range(first, step):
+            self._apply(i, opened, closed)
+
+        frame = bytearray(self.size)
+        for cell in _set_positions(opened):
+            frame[cell] = OPEN
+        for cell in _set_positions(closed):
+            frame[cell] = CLOSED
+        return frame
+
+    def _apply(self, i: int, opened: bytearray, closed: bytearray):
+        """Applies step i of the trace to the open and closed flags."""
+        trace = self.trace
+        for cell in trace.enqueued[trace.offsets[i]:trace.offsets[i + 1]]:
+            opened[cell] = 1
+        cell = trace.popped[i]
+        if cell >= 0:
+            opened[cell] = 0
+            closed[cell] = 1
+
+    def _pack(self, flags: bytearray) -> bytes:
+        """Packs one-byte flags into a compressed bitset."""
+        if not self.size:
+            return b''
+        bits = int(flags.translate(_TO_BITS), 2)
+        return zlib.compress(bits.to_bytes((self.size + 7) // 8, 'big'))
+
+    def _unpack(self, packed: bytes) -> bytearray:
+        """Unpacks a compressed bitset into one-byte flags."""
+        if not self.size:
+            return bytearray()
+        bits = int.from_bytes(zlib.decompress(packed), 'big')
+        return bytearray(format(bits, f'0{self.size}b').encode('ascii').translate(_FROM_BITS))
+
+def frame_changes(old: bytearray, new: bytearray):
+    """
+    Yields the packed cells whose codes differ between two frames.
+
+    Parameters:
+        old, new (bytearray): Frames of equal length.
+    """
+    diff = (int.from_bytes(old, 'big') ^ int.from_bytes(new, 'big')).to_bytes(len(old), 'big')
+    return _set_positions(diff)
+
+def _set_positions(flags):
+    """Yields the indices of non-zero bytes."""
+    return (match.start() for match in _NONZERO.finditer(flags))
@@ -0,0 +1,181 @@
+from array import array
+import struct
+import zlib
+
+# File header: magic, version, rows, cols, start, steps, enqueued, route, name length.
+MAGIC = b'PVTR'
+VERSION = 1
+HEADER = struct.Struct('<4sHiiiiiiH')
+
+class SearchTrace:
+    """
+    A compact record of a search run that can be replayed without recomputing the search.
+
+    Cells are packed into single integers (y * cols + x). Step i popped popped[i] (-1 if it popped nothing)
+    and enqueued the cells enqueued[offsets[i]:offsets[i + 1]].
+
+    Attributes:
+        rows, cols  (int, int): Dimensions of the grid the search ran on.
+        algorithm        (str): Name of the algorithm that produced the trace.
+        start            (int): Packed start cell, enqueued before the first step.
+        popped    (array['i']): Packed cell popped by each step.
+        offsets   (array['i']): Start of each step's slice in enqueued, with one trailing end offset.
+        enqueued  (array['i']): Packed cells enqueued by every step, concatenated.
+        route     (array['i']): Packed route cells, from goal back to start.
+    """
+    def __init__(self, rows: int, cols: int, start: tuple[int, int], algorithm: str=''):
+        """
+        Initializes an empty trace.
+
+        Parameters:
+            rows, cols      (int, int): Dimensions of the grid.
+            start    (tuple[int, int]): Start coordinates of the search.
+            algorithm            (str): Name of the algorithm being traced.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.algorithm = algorithm
+        self.start = self.pack(*start)
+        self.popped = array('i')
+        self.offsets = array('i', [0])
+        self.enqueued = array('i')
+        self.route = array('i')
+
+    def __len__(self):
+        return len(self.popped)
+
+    def pack(self, x: int, y: int) -> int:
+        return y * self.cols + x
+
+    def unpack(self, cell: int) -> tuple[int, int]:
+        return cell % self.cols, cell // self.cols
+
+    def record(self, search):
+        """
+        Appends the last step of a search to the trace.
+
+        Parameters:
+            search (Pathfinder): Search exposing last_popped and last_enqueued.
+        """
+        popped = search.last_popped
+        self.popped.append(self.pack(*popped) if popped is not None else -1)
+        cols = self.cols
+        self.enqueued.extend([y * cols + x for x, y in search.last_enqueued])
+        self.offsets.append(len(self.enqueued))
+
+    def finish(self, route):
+        """
+        Stores the final route of the search.
+
+        Parameters:
+            route (list[Node]): Route from goal back to start, as returned by get_route().
+        """
+        self.route = array('i', [self.pack(node.x, node.y) for node in route])
+
+    def step(self, i: int) -> tuple[tuple[int, int] | None, list[tuple[int, int]]]:
+        """
+        Returns the cells popped and enqueued by step i.
+
+        Returns:
+            tuple: (popped (x, y) or None, list of enqueued (x, y)).
+        """
+        cell = self.popped[i]
+        popped = self.unpack(cell) if cell >= 0 else None
+        enqueued = [self.unpack(c) for c in self.enqueued[self.offsets[i]:self.offsets[i + 1]]]
+        return popped, enqueued
+
+    def get_route(self) -> list[tuple[int, int, list[int] | None]]:
+        """
+        Returns the recorded route with the move taken to reach each cell.
+
+        Returns:
+            list[tuple[int, int, list[int, int] | None]]: (x, y, move) from goal back to start.
+        """
+        cells = [self.unpack(c) for c in self.route]
+        route = []
+        for i, (x, y) in enumerate(cells):
+            if i + 1 < len(cells):
+                px, py = cells[i + 1]
+                route.append((x, y, [x - px, y - py]))
+            else:
+                route.append((x, y, None))
+        return route
+
+    def first_divergence(self, other) -> int | None:
+        """
+        Compares two traces step by step.
+
+        Parameters:
+            other (SearchTrace): Trace to compare against.
+
+        Returns:
+            int | None: Index of the first step that differs, or None if the traces are identical.
+        """
+        for i in range(min(len(self), len(other))):
+            if self.popped[i] != other.popped[i]:
+                return i
+            if self.enqueued[self.offsets[i]:self.offsets[i + 1]] != other.enqueued[other.offsets[i]:other.offsets[i + 1]]:
+                return i
+        if len(self) != len(other) or self.route != other.route:
+            return min(len(self), len(other))
+        return None
+
+    def save(self, file_name: str):
+        """
+        Writes the trace to a zlib compressed binary file.
+
+        Parameters:
+            file_name (str): Path of the file to write.
+        """
+        name = self.algorithm.encode('utf-8')
+        header = HEADER.pack(MAGIC, VERSION, self.rows, self.cols, self.start,
+                             len(self.popped), len(self.enqueued), len(self.route), len(name))
+        payload = b''.join([header, name, _to_le_bytes(self.popped), _to_le_bytes(self.offsets),
+                            _to_le_bytes(self.enqueued), _to_le_bytes(self.route)])
+        with open(file_name, 'wb') as f:
+            f.write(zlib.compress(payload))
+
+    @classmethod
+    def load(cls, file_name: str):
+        """
+        Reads a trace written by save().
+
+        Parameters:
+            file_name (str): Path of the file to read.
+
+        Returns:
+            SearchTrace: The loaded trace.
+        """
+        with open(file_name, 'rb') as f:
+            payload = zlib.decompress(f.read())
+        magic, version, rows, cols, start, steps, enqueued, route, name_len = HEADER.unpack_from(payload)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{file_name} is not a version {VERSION} search trace.')
+        pos = HEADER.size
+        algorithm = payload[pos:pos + name_len].decode('utf-8')
+        pos += name_len
+
+        trace = cls(rows, cols, (0, 0), algorithm)
+        trace.start = start
+        trace.popped, pos = _from_le_bytes(payload, pos, steps)
+        trace.offsets, pos = _from_le_bytes(payload, pos, steps + 1)
+        trace.enqueued, pos = _from_le_bytes(payload, pos, enqueued)
+        trace.route, pos = _from_le_bytes(payload, pos, route)
+        return trace
+
+def _to_le_bytes(values: array) -> bytes:
+    """Returns the bytes of an int32 array in little-endian order."""
+    if struct.pack('=i', 1) == struct.pack('<i', 1):
+        return values.tobytes()
+    swapped = array('i', values)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+def _from_le_bytes(payload: bytes, pos: int, count: int) -> tuple[array, int]:
+    """Reads count little-endian int32 values from payload at pos. Returns the array and the next position."""
+    end = pos + count * 4
+    values = array('i')
+    values.frombytes(payload[pos:end])
+    if struct.pack('=i', 1) != struct.pack('<i', 1):
+        values.byteswap()
+    return values, end
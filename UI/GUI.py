@@ -3,8 +3,13 @@ import tkinter as tk
 from UI.grid import Grid
 import Core.event_handler as event_handler
 import Core.config as config
+import Core.level_index as level_index
+from Core.generators import GENERATORS
+from Core.memory import format_bytes
+from Core.pathfinders import ALGORITHMS
+from Algorithms.heuristics import HEURISTICS
 import os
-from PIL import Image
+from PIL import Image, ImageColor
 
 class App(ctk.CTk):
     def __init__(self):
@@ -13,6 +18,9 @@ class App(ctk.CTk):
         self.attributes('-fullscreen', True)
         self.bind('<F11>', self.toggle_fullscreen)
         self.bind('<Escape>', self.end_fullscreen)
+        self.bind('<Control-z>', lambda e: event_handler.undo(self))
+        self.bind('<Control-y>', lambda e: event_handler.redo(self))
+        self.bind('<Control-Z>', lambda e: event_handler.redo(self))
         ctk.set_appearance_mode("light")
 
         self.screen_width = self.winfo_screenwidth()
@@ -23,11 +31,13 @@ class App(ctk.CTk):
 
         self.grid_rowconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=0)
+        self.grid_rowconfigure(2, weight=0)
         self.grid_columnconfigure(0, weight=0) 
         self.grid_columnconfigure(1, weight=1)
 
         self._build_sidebar()
         self._build_canvas()
+        self._build_timeline()
         self._build_editing_panel()
         self._bind_events()
         self.help_window = None
@@ -50,6 +60,8 @@ class App(ctk.CTk):
         self.movement_choice = ctk.StringVar(value='Cardinal')
         self.level_choice = ctk.StringVar(value='')
         self.speed_choice = ctk.StringVar(value='Normal')
+        self.execution_choice = ctk.StringVar(value='Inline')
+        self.pruning_choice = ctk.BooleanVar(value=config.dead_end_pruning)
 
         #--- Algorithm Selection ---#
         ctk.CTkLabel(self.sidebar, 
@@ -61,7 +73,7 @@ class App(ctk.CTk):
                      ).grid(row=1, column=0, pady=10, sticky='se')
         ctk.CTkOptionMenu(self.sidebar, 
                           variable=self.algo_choice,
-                          values=['BFS', 'A*', 'DFS', 'UCS', 'GBeFS'],
+                          values=ALGORITHMS,
                           command=lambda val: event_handler.algo_selection(self, val)
                           ).grid(row=2, column=0, pady=10, sticky='nesw')
 
@@ -69,7 +81,7 @@ class App(ctk.CTk):
         self.heuristic_label = ctk.CTkLabel(self.sidebar, text='Heuristic')
         self.heuristic_icon = ctk.CTkLabel(self.sidebar, text='', image=self.get_element_icon('Heuristic.png'))
         self.heuristic_picker = ctk.CTkOptionMenu(self.sidebar, variable=self.heuristic_choice,
-                                                  values=['Manhattan', 'Diagonal', 'None'])
+                                                  values=HEURISTICS)
         self.heuristic_weight_label = ctk.CTkLabel(self.sidebar, text='Heuristic Weight')
         self.heuristic_weight_icon = ctk.CTkLabel(self.sidebar, text='', image=self.get_element_icon('Weight.png'))
         self.heuristic_weight_picker = ctk.CTkOptionMenu(self.sidebar, variable=self.heuristic_weight_choice,
@@ -90,9 +102,12 @@ class App(ctk.CTk):
                      ).grid(row=9, column=0, pady=10, sticky='sw')
         ctk.CTkLabel(self.sidebar, text='', image=self.get_element_icon('Load.png')
                      ).grid(row=9, column=0, pady=10, sticky='se')
+        self.level_preview = ctk.CTkLabel(self.sidebar, text='', compound='left')
+        self.level_preview.grid(row=9, column=0, pady=10, sticky='s')
         self.level_picker = ctk.CTkOptionMenu(self.sidebar, variable=self.level_choice,
-                                              command=lambda val: event_handler.load_level(self, val))
+                                              command=self.choose_level)
         self.level_picker.grid(row=10, column=0, pady=10, sticky='nesw')
+        self.level_entries = {}
 
         #--- Simulation Speed ---#
         ctk.CTkLabel(self.sidebar, text='Simulation Speed'
@@ -104,28 +119,41 @@ class App(ctk.CTk):
                           command=event_handler.set_speed
                           ).grid(row=12, column=0, pady=10, sticky='nesw')
 
+        #--- Execution Mode ---#
+        ctk.CTkLabel(self.sidebar, text='Execution'
+                     ).grid(row=13, column=0, pady=10, sticky='sw')
+        ctk.CTkOptionMenu(self.sidebar, variable=self.execution_choice,
+                          values=['Inline', 'Background'],
+                          command=event_handler.set_execution_mode
+                          ).grid(row=14, column=0, pady=10, sticky='nesw')
+        ctk.CTkCheckBox(self.sidebar, text='Dead-End Pruning', variable=self.pruning_choice,
+                        command=lambda: setattr(config, 'dead_end_pruning', self.pruning_choice.get())
+                        ).grid(row=15, column=0, pady=10, sticky='w')
+
         #--- Simulation Playback ---#
         ctk.CTkButton(self.sidebar,
                       text='', 
                       command=self.run_algorithm, 
                       image=self.get_element_icon('Play.png', 32)
-                      ).grid(row=15, column=0, pady=10, sticky='se')
+                      ).grid(row=16, column=0, pady=10, sticky='se')
         ctk.CTkButton(self.sidebar, text='Pause/Resume', command=event_handler.toggle_pause
-                      ).grid(row=16, column=0, pady=10, sticky='nsew')
+                      ).grid(row=17, column=0, pady=10, sticky='nsew')
+        ctk.CTkButton(self.sidebar, text='Compare', command=self.compare_algorithms
+                      ).grid(row=18, column=0, pady=10, sticky='nsew')
         
         #--- Help ---#
         ctk.CTkButton(self.sidebar,
                       text='Help',
                       command = self.open_help_menu,
                       image=self.get_element_icon('Help.png')
-                      ).grid(row=17, column=0, pady=10, sticky='s')
+                      ).grid(row=19, column=0, pady=10, sticky='s')
 
     def _build_editing_panel(self):
         self.editing_panel = ctk.CTkFrame(self, height=self.editing_panel_height)
-        self.editing_panel.grid(row=1, column=0, columnspan=2, sticky='ew', padx=10, pady=10)
+        self.editing_panel.grid(row=2, column=0, columnspan=2, sticky='ew', padx=10, pady=10)
         self.editing_panel.grid_propagate(False)  # Keep fixed height
 
-        for i in range(7):
+        for i in range(11):
             self.editing_panel.grid_columnconfigure(i, weight=1)
         
 
@@ -152,6 +180,12 @@ class App(ctk.CTk):
                       image=self.get_element_icon('Goal.png', 32)
                       ).grid(row=0, column=3, padx=20, pady=10, sticky='nesw')
 
+        ctk.CTkButton(self.editing_panel,
+                      text='Replay',
+                      command=lambda: event_handler.replay_trace(self),
+                      image=self.get_element_icon('Play.png', 32)
+                      ).grid(row=0, column=4, padx=20, pady=10, sticky='nesw')
+
         ctk.CTkButton(self.editing_panel, 
                       text='Save Level',
                       command=lambda: event_handler.save_level(self),
@@ -159,11 +193,66 @@ class App(ctk.CTk):
                       ).grid(row=0, column=5, padx=20, pady=10, sticky='nesw')
 
         self.grid_size_choice = ctk.StringVar(value='10x10')
-        ctk.CTkOptionMenu(self.editing_panel, 
-                          variable=self.grid_size_choice,
-                          values=['3x3', '10x10', '25x25', '50x50'],
-                          command=lambda val: event_handler.size_select(self, val)
-                          ).grid(row=0, column=6, padx=20, pady=10, sticky='nesw')
+        self.grid_size_picker = ctk.CTkComboBox(self.editing_panel,
+                                                variable=self.grid_size_choice,
+                                                values=['3x3', '10x10', '25x25', '50x50', '100x100',
+                                                        '500x500', '1000x1000', '2000x2000'],
+                                                command=lambda val: event_handler.size_select(self, val))
+        self.grid_size_picker.grid(row=0, column=6, padx=20, pady=10, sticky='nesw')
+        self.grid_size_picker.bind('<Return>', lambda e: event_handler.size_select(self, self.grid_size_choice.get()))
+
+        self.brush_size_choice = ctk.StringVar(value='1')
+        ctk.CTkOptionMenu(self.editing_panel,
+                          variable=self.brush_size_choice,
+                          values=['1', '3', '5', '9', '15'],
+                          command=event_handler.set_brush_size
+                          ).grid(row=0, column=7, padx=20, pady=10, sticky='nesw')
+
+        self.generator_choice = ctk.StringVar(value='Generate')
+        ctk.CTkOptionMenu(self.editing_panel,
+                          variable=self.generator_choice,
+                          values=list(GENERATORS),
+                          command=self._generate_level
+                          ).grid(row=0, column=8, padx=20, pady=10, sticky='nesw')
+
+        ctk.CTkButton(self.editing_panel,
+                      text='Undo',
+                      command=lambda: event_handler.undo(self),
+                      image=self.get_element_icon('Left.png', 32)
+                      ).grid(row=0, column=9, padx=20, pady=10, sticky='nesw')
+
+        ctk.CTkButton(self.editing_panel,
+                      text='Redo',
+                      command=lambda: event_handler.redo(self),
+                      image=self.get_element_icon('Right.png', 32)
+                      ).grid(row=0, column=10, padx=20, pady=10, sticky='nesw')
+
+    def _build_timeline(self):
+        self.timeline_panel = ctk.CTkFrame(self)
+        self.timeline_panel.grid(row=1, column=1, sticky='ew', padx=10)
+        self.timeline_panel.grid_columnconfigure(0, weight=1)
+        self.timeline_steps = 0
+
+        self.timeline_slider = ctk.CTkSlider(self.timeline_panel, from_=0, to=1,
+                                             command=lambda val: event_handler.seek_timeline(self, val))
+        self.timeline_slider.set(0)
+        self.timeline_slider.configure(state='disabled')
+        self.timeline_slider.grid(row=0, column=0, padx=10, pady=5, sticky='ew')
+
+        self.timeline_label = ctk.CTkLabel(self.timeline_panel, text='Step 0 / 0', width=140)
+        self.timeline_label.grid(row=0, column=1, padx=10, pady=5)
+
+        self.memory_choice = ctk.BooleanVar(value=config.memory_report)
+        ctk.CTkCheckBox(self.timeline_panel, text='Memory Report', variable=self.memory_choice,
+                        command=lambda: setattr(config, 'memory_report', self.memory_choice.get())
+                        ).grid(row=0, column=2, padx=10, pady=5)
+
+        # Last memory reports, keyed by what was measured ('search' or 'load')
+        self.memory_reports = {}
+        self.memory_window = None
+        self.memory_button = ctk.CTkButton(self.timeline_panel, text='No memory report', width=260, state='disabled',
+                                           command=self.open_memory_report)
+        self.memory_button.grid(row=0, column=3, padx=10, pady=5)
 
     def _build_canvas(self):
         canvas_width = self.screen_width - self.sidebar_width - 40
@@ -174,12 +263,21 @@ class App(ctk.CTk):
 
         cell_size = min(canvas_width // 10, canvas_height // 10)
         self.grid = Grid(rows=10, cols=10, canvas=self.canvas, cell_size=cell_size)
+        self.pan_anchor = (0, 0)
 
     def _bind_events(self):
         self.canvas.bind('<Button-1>', lambda e: event_handler.draw(e, self))
         self.canvas.bind('<B1-Motion>', lambda e: event_handler.draw(e, self))
         self.canvas.bind('<Button-3>', lambda e: event_handler.erase(e, self))
         self.canvas.bind('<B3-Motion>', lambda e: event_handler.erase(e, self))
+        self.canvas.bind('<ButtonRelease-1>', lambda e: event_handler.end_stroke(e, self))
+        self.canvas.bind('<ButtonRelease-3>', lambda e: event_handler.end_stroke(e, self))
+        self.canvas.bind('<MouseWheel>', lambda e: event_handler.zoom(e, self))
+        self.canvas.bind('<Button-4>', lambda e: event_handler.zoom(e, self))
+        self.canvas.bind('<Button-5>', lambda e: event_handler.zoom(e, self))
+        self.canvas.bind('<Button-2>', lambda e: event_handler.start_pan(e, self))
+        self.canvas.bind('<B2-Motion>', lambda e: event_handler.pan(e, self))
+        self.canvas.bind('<ButtonRelease-2>', lambda e: event_handler.end_pan(e, self))
 
     def _build_help_menu(self, on_close_callback) -> ctk.CTkToplevel:
         help_window = ctk.CTkToplevel()
@@ -207,16 +305,34 @@ class App(ctk.CTk):
             '## Drawing On The Canvas\n'
             'Draw on the grid with left click, erase with right click.\n'
             'Click "Starting Position" or "Goal Position", then left click on canvas to place objectives.\n'
-            'Press "Save Level" to save the level, then input a level name.\n'
-            'Change the grid size by using the dropdown.\n'
+            'Press "Save Level" to save the level, then input a level name. Names ending in ".lvz" are saved compressed\n'
+            '(the default for very large grids); ".json" keeps the plain format.\n'
+            'Change the brush size (in tiles) with the dropdown in the editing bar.\n'
+            'Undo a brush stroke with "Undo" or Ctrl+Z, and redo it with "Redo", Ctrl+Y or Ctrl+Shift+Z.\n'
+            'Fill the grid with a random map, maze, caves or rooms using the "Generate" dropdown and a seed.\n'
+            'Change the grid size by using the dropdown, or type any size as COLSxROWS and press Enter.\n'
+            'Zoom with the mouse wheel and pan by dragging with the middle mouse button.\n'
             '\n'
             '## Configuring The Simulation\n'
             'Select an algorithm using the "Algorithm" dropdown.\n'
+            '"ARA*" finds a rough route quickly, then keeps improving it until it is optimal or time runs out.\n'
+            '"IDA*" stores at most a fixed number of nodes, for maps too large for A*.\n'
+            '"Subgoal" searches a graph of the map\'s corners, built once per level and saved next to it.\n'
+            '"Theta*" finds any-angle routes that run straight between corners instead of zigzagging along the grid\n'
+            '(with Cardinal movement, as staircases of cardinal moves).\n'
             'Select a movement type using the "Movement Type" dropdown.\n'
             'Load a level using the "Load Level" dropdown.\n'
             'Change the simulation speed using the "Simulation Speed" dropdown.\n'
             'Hit the play button to start the simulation.\n'
+            'Hit "Compare" and enter algorithms (e.g. "BFS, A*, GBeFS") to run them side by side with a results table.\n'
             'Hit the "Pause/Resume" button to pause or resume the simulation.\n'
+            'Drag the timeline slider below the grid to jump to any step of the last completed search.\n'
+            'Hit "Replay" to watch the last completed search again without recomputing it.\n'
+            'Set "Execution" to "Background" to run the search in a worker thread and keep the UI responsive.\n'
+            'Tick "Dead-End Pruning" to make A*, UCS, GBeFS, BFS, DFS and Theta* skip dead ends that cannot lie on the\n'
+            'route. The map\'s dead ends are found on the first search and kept up to date as you edit.\n'
+            'Tick "Memory Report" to measure the peak and retained memory of each search and level load (searches\n'
+            'run slower while it is on). Click the report next to it to see which lines allocated the most.\n'
         )
 
         label = ctk.CTkLabel(instructions_frame, text=instructions, justify='left', anchor='nw', wraplength=min_width - 40)
@@ -251,29 +367,104 @@ class App(ctk.CTk):
             self.heuristic_weight_choice.get()
         )
 
+    def compare_algorithms(self):
+        '''Runs several algorithms side by side using the configured heuristic settings.'''
+        event_handler.compare_algorithms(self, self.heuristic_choice.get(), self.heuristic_weight_choice.get())
+
+    def _generate_level(self, kind):
+        '''Generates a level of the selected kind, then resets the generator picker.'''
+        self.generator_choice.set('Generate')
+        event_handler.generate_level(self, kind)
+
+    def set_timeline(self, steps: int):
+        '''Configures the timeline slider for a completed search of the given number of steps.'''
+        self.timeline_steps = steps
+        self.timeline_slider.configure(state='normal', to=max(steps, 1), number_of_steps=max(steps, 1))
+        self.timeline_slider.set(steps)
+        self.set_timeline_step(steps)
+
+    def set_timeline_step(self, step: int):
+        '''Shows the current timeline position.'''
+        self.timeline_label.configure(text=f'Step {step} / {self.timeline_steps}')
+
+    def show_memory_report(self, report):
+        '''Shows a finished memory report's summary in the stats panel, and its details if the report window is open.'''
+        self.memory_reports[report.label.split()[0]] = report
+        self.memory_button.configure(text=f'{format_bytes(report.peak_bytes)} peak, '
+                                          f'{format_bytes(report.retained_bytes)} retained', state='normal')
+        if self.memory_window is not None and self.memory_window.winfo_exists():
+            self.memory_window.destroy()
+            self.open_memory_report()
+
+    def open_memory_report(self):
+        '''Opens a window listing the last search and level load reports with their largest allocation sites.'''
+        if self.memory_window is not None and self.memory_window.winfo_exists():
+            self.memory_window.lift()
+            return
+        self.memory_window = ctk.CTkToplevel()
+        self.memory_window.title('Memory Report')
+        lines = []
+        for report in self.memory_reports.values():
+            lines.append(report.summary())
+            lines += [f"    {format_bytes(site['bytes']):>10}  {site['blocks']:>8} blocks  {site['site']}" for site in report.sites]
+            lines.append('')
+        text = ctk.CTkTextbox(self.memory_window, width=640, height=400, font=ctk.CTkFont(family='Courier'))
+        text.insert('1.0', '\n'.join(lines))
+        text.configure(state='disabled')
+        text.pack(fill='both', expand=True, padx=10, pady=10)
+        self.memory_window.attributes('-topmost', True)
+
     def toggle_weight_option(self, algo):
         '''Packs and unpacks heuristic weight selection based on chosen algorithm.'''
-        if algo == 'A*':
+        if algo in ['A*', 'IDA*', 'ARA*']:
             self.heuristic_label.grid(row=3, column=0, pady=10, sticky='w')
             self.heuristic_icon.grid(row=3, column=0, pady=10, sticky='e')
             self.heuristic_picker.grid(row=4, column=0, pady=10, sticky='nsew')
-            self.heuristic_weight_label.grid(row=5, column=0, pady=10, sticky='w')
-            self.heuristic_weight_icon.grid(row=5, column=0, pady=10, sticky='e')
-            self.heuristic_weight_picker.grid(row=6, column=0, pady=10, sticky='nsew')
         else:
             self.heuristic_label.grid_forget()
             self.heuristic_icon.grid_forget()
             self.heuristic_picker.grid_forget()
+        # ARA* chooses its own weights
+        if algo in ['A*', 'IDA*', 'Theta*']:
+            self.heuristic_weight_label.grid(row=5, column=0, pady=10, sticky='w')
+            self.heuristic_weight_icon.grid(row=5, column=0, pady=10, sticky='e')
+            self.heuristic_weight_picker.grid(row=6, column=0, pady=10, sticky='nsew')
+        else:
             self.heuristic_weight_label.grid_forget()
             self.heuristic_weight_icon.grid_forget()
             self.heuristic_weight_picker.grid_forget()
 
     def retrieve_levels(self):
-        # '''Retrieves list of levels from Assets/Levels subfolder and configures level_picker values.'''
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        level_dir = os.path.abspath(os.path.join(current_dir, '..', 'assets', 'levels'))
-        levels = [file for file in os.listdir(level_dir) if file.endswith('.json')]
-        self.level_picker.configure(values=levels)
+        '''Refreshes the level index of the Assets/Levels subfolder and configures level_picker values.'''
+        self.level_entries = level_index.refresh()
+        self.level_picker.configure(values=list(self.level_entries))
+
+    def choose_level(self, file_name):
+        '''Shows the indexed preview of the chosen level, then loads it.'''
+        entry = self.level_entries.get(file_name)
+        if entry is not None:
+            self.level_preview.configure(image=self.get_level_thumbnail(entry),
+                                         text=f"{entry['cols']}x{entry['rows']}\n{entry['wall_density']:.0%} walls")
+        event_handler.load_level(self, file_name)
+
+    def get_level_thumbnail(self, entry):
+        """
+        Builds the thumbnail of an index entry, with the start and goal marked.
+
+        Parameters:
+            entry (dict): Level index entry.
+
+        Returns:
+            CTkImage: The thumbnail.
+        """
+        thumb = entry['thumbnail']
+        image = Image.frombytes('L', (thumb['width'], thumb['height']), level_index.thumbnail_pixels(entry)).convert('RGB')
+        for key, color in (('start', 'orange'), ('goal', 'purple')):
+            if entry[key] is not None:
+                x, y = entry[key]
+                image.putpixel((x * thumb['width'] // entry['cols'], y * thumb['height'] // entry['rows']),
+                               ImageColor.getrgb(color))
+        return ctk.CTkImage(light_image=image, size=(thumb['width'], thumb['height']))
 
     def toggle_fullscreen(self, event=None):
         self.attributes('-fullscreen', not self.attributes('-fullscreen'))
@@ -0,0 +1,87 @@
+import customtkinter as ctk
+import tkinter as tk
+import numpy as np
+from PIL import Image, ImageTk
+from Core.export import compose, render
+
+# Largest width or height (px) of a comparison panel.
+PANEL_SIZE = 320
+
+# Columns of the results table: (heading, Entry.result() key).
+COLUMNS = [('Algorithm', 'label'), ('Status', 'status'), ('Expansions', 'expansions'),
+           ('Time (ms)', 'ms'), ('Route Length', 'route_length'), ('Route Cost', 'route_cost')]
+
+class ComparisonWindow(ctk.CTkToplevel):
+    """
+    Shows a Comparison: one panel per search, rendered one pixel block per tile from the shared
+    snapshot and the search's own frame, with a results table underneath.
+
+    Attributes:
+        comparison (Comparison): The comparison being shown.
+        base (np.ndarray): State codes of the snapshot, viewed without copying.
+        panel_shape (tuple[int, int]): Width and height (px) of every panel.
+        panels (list[tk.Label]): Label showing each search's panel image.
+        photos (list[ImageTk.PhotoImage]): Image of each panel, kept referenced while shown.
+        cells (list[list[ctk.CTkLabel]]): Results table cells, one row per search.
+    """
+    def __init__(self, comparison, on_close=None):
+        """
+        Parameters:
+            comparison (Comparison): The comparison to show.
+            on_close (Callable | None): Called when the window is closed.
+        """
+        super().__init__()
+        self.title('Compare Algorithms')
+        self.comparison = comparison
+        grid = comparison.snapshot
+        self.base = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.rows, grid.cols)
+        scale = PANEL_SIZE / max(grid.rows, grid.cols)
+        self.panel_shape = (max(1, round(grid.cols * scale)), max(1, round(grid.rows * scale)))
+        self.on_close = on_close
+        self.protocol('WM_DELETE_WINDOW', self.close)
+
+        columns = min(len(comparison.entries), 3)
+        self.panels = []
+        self.photos = []
+        for i, entry in enumerate(comparison.entries):
+            frame = ctk.CTkFrame(self)
+            frame.grid(row=i // columns, column=i % columns, padx=10, pady=10)
+            ctk.CTkLabel(frame, text=entry.label).pack(pady=(5, 0))
+            panel = tk.Label(frame, borderwidth=0)
+            panel.pack(padx=5, pady=5)
+            self.panels.append(panel)
+            self.photos.append(None)
+
+        table = ctk.CTkFrame(self)
+        table.grid(row=(len(comparison.entries) - 1) // columns + 1, column=0, columnspan=columns,
+                   sticky='ew', padx=10, pady=10)
+        for col, (heading, _) in enumerate(COLUMNS):
+            table.grid_columnconfigure(col, weight=1)
+            ctk.CTkLabel(table, text=heading, font=ctk.CTkFont(weight='bold')).grid(row=0, column=col, padx=10)
+        self.cells = [[ctk.CTkLabel(table, text='') for _ in COLUMNS] for _ in comparison.entries]
+        for row, labels in enumerate(self.cells, start=1):
+            for col, label in enumerate(labels):
+                label.grid(row=row, column=col, padx=10)
+        self.render()
+
+    def render(self):
+        """Redraws the panels whose frames changed and refreshes the results table."""
+        for i, entry in enumerate(self.comparison.entries):
+            if not entry.dirty:
+                continue
+            entry.dirty = False
+            frame = np.frombuffer(entry.frame, dtype=np.uint8).reshape(self.base.shape)
+            image = render(compose(self.base, frame))
+            self.photos[i] = ImageTk.PhotoImage(image.resize(self.panel_shape, Image.NEAREST))
+            self.panels[i].configure(image=self.photos[i])
+
+        for labels, result in zip(self.cells, self.comparison.results()):
+            for label, (_, key) in zip(labels, COLUMNS):
+                label.configure(text=str(result[key]))
+
+    def close(self):
+        """Cancels the comparison and closes the window."""
+        self.comparison.cancel()
+        if self.on_close is not None:
+            self.on_close()
+        self.destroy()
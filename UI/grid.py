@@ -2,97 +2,67 @@ import Core.config as config
 import os
 import customtkinter as ctk
 from PIL import Image, ImageTk
-import time
-
-TILE_COLORS = {
-    'empty': 'white',
-    'wall': 'black',
-    'start': 'orange',
-    'goal': 'purple',
-    'open': 'green',
-    'closed': 'red',
-    'route': 'blue'
-}
-
-class Node:
-    """
-    Represents a single tile or cell in the grid.
+from Core.grid_model import GridModel, STATES, STATE_CODES, TILE_COLORS
+from Core.history import EditHistory
 
-    Attributes:
-        x, y (int, int): Coordinates of the node.
-        size (int): Size of node in pixels.
-        state (str): The current state of the tile ('empty', 'wall', etc. See TILE_COLORS for all possible states).
-        parent (Node | None): Reference to parent node along route.
-        move (list[int, int] | None): Move taken to reach node from parent.
-        canvas_id (int | None): Canvas rectangle ID for rendering.
-    """
-    def __init__(self, x, y, size, parent, move):
-        self.x = x
-        self.y = y
-        self.size = size
-        self.state = 'empty'
-        self.parent = parent
-        self.move = move
+# Smallest and largest tile sizes (px) the viewport can zoom to.
+MIN_TILE_SIZE = 6
+MAX_TILE_SIZE = 128
+# Tiles smaller than this (px) are drawn without an outline.
+OUTLINE_TILE_SIZE = 8
 
-    def get_coords(self, grid):
-        """
-        Returns screen coordinates of the tile on the canvas.
+# Delay (ms) between frames of the route animation.
+ROUTE_FRAME_DELAY = 55
 
-        Returns:
-            tuple[int, int, int, int]: Corner coordinates of node.
-        """
-        grid_width = grid.cols * grid.tile_size
-        grid_height = grid.rows * grid.tile_size
+# State codes written by simulations, which clear_simulation() restores to empty.
+SIM_CODES = (STATE_CODES['open'], STATE_CODES['closed'], STATE_CODES['route'])
 
-        canvas_width = grid.canvas.winfo_width()
-        canvas_height = grid.canvas.winfo_height()
-
-        offset_x = (canvas_width - grid_width) // 2
-        offset_y = (canvas_height - grid_height) // 2
-
-        x1 = self.x * grid.tile_size + offset_x
-        y1 = self.y * grid.tile_size + offset_y
-        x2 = x1 + grid.tile_size
-        y2 = y1 + grid.tile_size
-        return x1, y1, x2, y2
-
-class Grid:
+class Grid(GridModel):
     """
-    Represents the 2D grid environment for pathfinding and rendering.
+    Renders a GridModel on a canvas through a zoomable and pannable viewport.
+
+    Only the tiles inside the viewport have canvas items, so drawing cost and canvas memory
+    depend on the size of the canvas rather than the size of the map.
 
     Attributes:
-        rows (int): Number of rows in the grid.
-        cols (int): Number of columns in the grid.
         canvas (tk.Canvas): Canvas used to draw the grid.
-        tile_size (int): Size of each tile in pixels.
-        grid (list[list[Node]]): 2D list of Node objects.
-        sx, sy (int): Coordinates of the start node.
-        gx, gy (int): Coordinates of the goal node.
+        tile_size (int): Size of each tile in pixels (the zoom level).
+        offset_x, offset_y (int, int): Canvas position (px) of the top left corner of tile (0, 0).
+        tile_ids (dict[int, int]): Canvas rectangle ID of every drawn tile, keyed by packed cell.
+        icon_ids (dict[int, int]): Canvas image ID of the icon (start, goal or route arrow) on each drawn tile.
+        edit_listeners (list[callable]): Called with the (cell, old code, new code) changes of every committed edit batch,
+            or with None when the whole grid is cleared.
+        history (EditHistory): Undo and redo history of the edits, one entry per brush stroke.
+        sim_cells (set[int]): Packed cells a simulation has marked open, closed or route since the last clear.
+        route_animation (RouteAnimator | None): The route animation in progress, if any.
         sim_present (bool): Whether a simulation is currently visualized.
     """
-    def __init__(self, rows: int, cols: int, canvas: ctk.CTkCanvas, cell_size: int):
+    def __init__(self, rows: int, cols: int, canvas: ctk.CTkCanvas, cell_size: int=MIN_TILE_SIZE, cells=None):
         """
-        Initializes the grid and binds to the canvas resize event.
+        Initializes the grid.
 
         Parameters:
             rows (int): Number of rows in the grid.
             cols (int): Number of columns in the grid.
             canvas (tk.Canvas): The canvas to draw on.
-            cell_size (int): Pixel size of each cell.
+            cell_size (int): Initial pixel size of each cell.
+            cells (bytearray | None): Optional state codes to use as the grid buffer.
         """
-        self.rows = rows
-        self.cols = cols
+        super().__init__(rows, cols, cells)
         self.canvas = canvas
-        self.tile_size = cell_size
-        self.grid = []
-        self.sx, self.sy = -1, -1
-        self.gx, self.gy = -1, -1
+        self.tile_size = max(MIN_TILE_SIZE, min(cell_size, MAX_TILE_SIZE))
+        self.offset_x, self.offset_y = 0, 0
+        self.tile_ids = {}
+        self.icon_ids = {}
+        self.edit_listeners = []
+        self.history = EditHistory()
+        self.sim_cells = set()
+        self.route_animation = None
         self.route = []
         self.sim_present = False
         self.image_refs = {}
         self.route_image_refs = {}
         self.init_images()
-        self.init_grid()
 
     def init_images(self):
         self.image_refs = {
@@ -111,144 +81,237 @@ class Grid:
             '[-1, -1]': self.get_element_icon('UpLeft.png', self.tile_size)
         }
 
-    def init_grid(self):
-        """Initializes the 2D grid with empty Node objects."""
-        for y in range(self.rows):
-            row = []
-            for x in range(self.cols):
-                row.append(Node(x, y, self.tile_size, None, None))
-            self.grid.append(row)
+    def fit(self):
+        """Zooms the viewport so the whole map fits on the canvas (within the zoom limits) and centers it."""
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
+        tile_size = min(canvas_width // self.cols, canvas_height // self.rows)
+        self.set_tile_size(max(MIN_TILE_SIZE, min(tile_size, MAX_TILE_SIZE)))
+        self.offset_x = (canvas_width - self.cols * self.tile_size) // 2
+        self.offset_y = (canvas_height - self.rows * self.tile_size) // 2
+
+    def set_tile_size(self, tile_size: int):
+        """Sets the zoom level, rescaling the tile icons if it changed."""
+        if tile_size != self.tile_size:
+            self.tile_size = tile_size
+            self.init_images()
+
+    def zoom(self, factor: float, px: int, py: int):
+        """
+        Zooms the viewport by the given factor, keeping the point under (px, py) in place.
 
-    def draw(self):
-        """Clears and redraws the entire grid on the canvas."""
-        self.canvas.delete('all')
+        Parameters:
+            factor (float): Zoom factor. Values above 1 zoom in.
+            px, py (int, int): Canvas position (px) to zoom around.
+        """
+        old_size = self.tile_size
+        new_size = max(MIN_TILE_SIZE, min(round(old_size * factor), MAX_TILE_SIZE))
+        if new_size == old_size:
+            return
+        self.offset_x = px - (px - self.offset_x) * new_size // old_size
+        self.offset_y = py - (py - self.offset_y) * new_size // old_size
+        self.set_tile_size(new_size)
+        self.draw()
 
-        grid_width = self.cols * self.tile_size
-        grid_height = self.rows * self.tile_size
+    def pan(self, dx: int, dy: int):
+        """
+        Moves the viewport contents by the given number of pixels.
+        Existing canvas items are moved; call draw() once panning ends to fill in newly exposed tiles.
 
+        Parameters:
+            dx, dy (int, int): Distance to move (px).
+        """
+        self.offset_x += dx
+        self.offset_y += dy
+        self.canvas.move('all', dx, dy)
+
+    def tile_at(self, px: int, py: int):
+        """
+        Maps a canvas position through the viewport transform to tile coordinates.
+
+        Parameters:
+            px, py (int, int): Canvas position (px).
+
+        Returns:
+            tuple[int, int] | None: Tile coordinates, or None if the position is outside the map.
+        """
+        x = (px - self.offset_x) // self.tile_size
+        y = (py - self.offset_y) // self.tile_size
+        if self.is_OOB(x, y):
+            return None
+        return x, y
+
+    def visible_range(self):
+        """
+        Returns:
+            tuple[int, int, int, int]: The first and one-past-last visible columns and rows (x0, x1, y0, y1).
+        """
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
+        x0 = max(0, -self.offset_x // self.tile_size)
+        y0 = max(0, -self.offset_y // self.tile_size)
+        x1 = min(self.cols, (canvas_width - self.offset_x) // self.tile_size + 1)
+        y1 = min(self.rows, (canvas_height - self.offset_y) // self.tile_size + 1)
+        return x0, max(x0, x1), y0, max(y0, y1)
 
-        offset_x = (canvas_width - grid_width) // 2
-        offset_y = (canvas_height - grid_height) // 2
+    def tile_coords(self, x: int, y: int):
+        """
+        Returns screen coordinates of a tile on the canvas.
 
-        for row in self.grid:
-            for node in row:
-                x1 = node.x * self.tile_size + offset_x
-                y1 = node.y * self.tile_size + offset_y
-                x2 = x1 + self.tile_size
-                y2 = y1 + self.tile_size
+        Returns:
+            tuple[int, int, int, int]: Corner coordinates of the tile.
+        """
+        x1 = x * self.tile_size + self.offset_x
+        y1 = y * self.tile_size + self.offset_y
+        return x1, y1, x1 + self.tile_size, y1 + self.tile_size
 
-                rect_id = self.canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    fill=TILE_COLORS[node.state],
-                    outline='gray'
+    def draw(self):
+        """Clears the canvas and redraws the tiles inside the viewport."""
+        self.canvas.delete('all')
+        self.tile_ids = {}
+        self.icon_ids = {}
+
+        size = self.tile_size
+        outline = 'gray' if size >= OUTLINE_TILE_SIZE else ''
+        x0, x1, y0, y1 = self.visible_range()
+        for y in range(y0, y1):
+            row = y * self.cols
+            py1 = y * size + self.offset_y
+            for x in range(x0, x1):
+                px1 = x * size + self.offset_x
+                state = STATES[self.cells[row + x]]
+                self.tile_ids[row + x] = self.canvas.create_rectangle(
+                    px1, py1, px1 + size, py1 + size,
+                    fill=TILE_COLORS[state],
+                    outline=outline
                 )
-                if node.state == 'goal':
-                    image = self.image_refs['goal']
-                    self.canvas.create_image(x1, y1, image=image, anchor='nw')
-                if node.state == 'start':
-                    image = self.image_refs['start']
-                    self.canvas.create_image(x1, y1, image=image, anchor='nw')
-                node.canvas_id = rect_id
+                image = self._tile_image(row + x, state)
+                if image is not None:
+                    self.icon_ids[row + x] = self.canvas.create_image(px1, py1, image=image, anchor='nw')
 
-    def set_obj(self, x: int, y: int):
+    def _tile_image(self, cell: int, state: str):
         """
-        Sets an objective (start or goal) at a given pixel location. 
-        Reads config.draw_type for the objective type.
+        Returns:
+            PhotoImage | None: The icon drawn on top of a tile in the given state, if any.
+        """
+        if state == 'start' or state == 'goal':
+            return self.image_refs[state]
+        if state == 'route':
+            return self.route_image_refs.get(str(self.moves.get(cell)))
+        return None
 
-        Parameters:
-            x, y (int, int): coordinates.
-        """
-        if not self.is_OOB(x, y):
-            node = self.grid[y][x]
-            if node.state == 'start' or node.state == 'goal':
-                return
-            if config.editor_has_start and config.draw_type == 'start':
-                return
-            if config.editor_has_goal and config.draw_type == 'goal':
-                return
-            node.state = config.draw_type
-            if config.draw_type == 'start':
-                config.editor_has_start = True
-                self.sx, self.sy = x, y
-            elif config.draw_type == 'goal':
-                config.editor_has_goal = True
-                self.gx, self.gy = x, y
+    def _draw_tile(self, cell: int):
+        """
+        Updates the canvas items of a single tile to match its state, if it is inside the viewport.
+        Icons are created, reconfigured or deleted as needed, so a tile never has more than one.
 
-    def clear_obj(self, x: int, y: int):
+        Parameters:
+            cell (int): Packed cell of the tile.
+        """
+        tile_id = self.tile_ids.get(cell)
+        if tile_id is None:
+            return
+        state = STATES[self.cells[cell]]
+        self.canvas.itemconfig(tile_id, fill=TILE_COLORS[state])
+        image = self._tile_image(cell, state)
+        icon_id = self.icon_ids.get(cell)
+        if image is None:
+            if icon_id is not None:
+                self.canvas.delete(icon_id)
+                del self.icon_ids[cell]
+        elif icon_id is None:
+            x1, y1, x2, y2 = self.tile_coords(cell % self.cols, cell // self.cols)
+            self.icon_ids[cell] = self.canvas.create_image(x1, y1, image=image, anchor='nw')
+        else:
+            self.canvas.itemconfig(icon_id, image=image)
+
+    def apply_edits(self, edits: dict[int, str], record: bool=True) -> list[tuple[int, int, int]]:
         """
-        Clears an objective (start or goal) at the given pixel location, resetting the state to 'empty'.
+        Commits a batch of tile edits to the model, the canvas and every edit listener at once.
+        Keeps the start and goal coordinates (and config.editor_has_start/goal) in sync with the edits.
+
+        Parameters:
+            edits (dict[int, str]): New state of each edited tile, keyed by packed cell.
+            record        (bool): Add the changes to the stroke in progress in the edit history.
 
-        Paramaters:
-            px, py (int, int): coordinates in pixels.
+        Returns:
+            list[tuple[int, int, int]]: (cell, old code, new code) of every tile that changed.
         """
-        if not self.is_OOB(x, y):
-            node = self.grid[y][x]
-            if node.state == 'start':
+        changes = []
+        for cell, state in edits.items():
+            old = self.cells[cell]
+            new = STATE_CODES[state]
+            if old == new:
+                continue
+            self.cells[cell] = new
+            changes.append((cell, old, new))
+            if old == STATE_CODES['start']:
                 config.editor_has_start = False
                 self.sx, self.sy = -1, -1
-            if node.state == 'goal':
+            elif old == STATE_CODES['goal']:
                 config.editor_has_goal = False
                 self.gx, self.gy = -1, -1
-            node.state = 'empty'
-
-
-    def is_OOB(self, x: int, y: int):
+            if new == STATE_CODES['start']:
+                config.editor_has_start = True
+                self.sx, self.sy = cell % self.cols, cell // self.cols
+            elif new == STATE_CODES['goal']:
+                config.editor_has_goal = True
+                self.gx, self.gy = cell % self.cols, cell // self.cols
+            self._draw_tile(cell)
+        if changes:
+            if record:
+                self.history.record(changes)
+            for listener in self.edit_listeners:
+                listener(changes)
+        return changes
+
+    def undo(self) -> bool:
         """
-        Checks if the given tile coordinates are out of bounds.
-
-        Paramaters:
-            x, y (int, int): Tile coordinates.
+        Reverts the most recent brush stroke. Only the tiles it changed are restored, through apply_edits(),
+        so the canvas, the start and goal, and every edit listener follow.
+        Tiles a simulation had marked when the stroke was drawn are restored as empty.
 
         Returns:
-            bool: True if out of bounds, False otherwise.
+            bool: False if there was nothing to undo.
         """
-        return not (0 <= x < self.cols and 0 <= y < self.rows)
-
-    def get(self, x: int, y: int):
+        edit = self.history.undo()
+        if edit is None:
+            return False
+        self.apply_edits({cell: 'empty' if code in SIM_CODES else STATES[code]
+                          for cell, code in zip(edit.cells, edit.old)}, record=False)
+        return True
+
+    def redo(self) -> bool:
         """
-        Gets the state of the tile at the given coordinates.
-
-        Paramaters:
-            x, y (int, int): Tile coordinates.
+        Applies the most recently undone brush stroke again.
 
         Returns:
-            str: The tile state (e.g., 'wall', 'empty').
+            bool: False if there was nothing to redo.
         """
-        if self.is_OOB(x, y):
-            return 'wall'
-        return self.grid[y][x].state
+        edit = self.history.redo()
+        if edit is None:
+            return False
+        self.apply_edits({cell: STATES[code] for cell, code in zip(edit.cells, edit.new)}, record=False)
+        return True
 
     def reset(self):
         """
         Resets the entire grid and simulation state to default.
         """
-        for row in self.grid:
-            for node in row:
-                node.state = 'empty'
+        self.cells[:] = bytes(len(self.cells))
+        self.history.clear()
+        for listener in self.edit_listeners:
+            listener(None)
+        self.sim_cells = set()
         config.editor_has_start = False
         config.editor_has_goal = False
         self.sx, self.sy = -1, -1
         self.gx, self.gy = -1, -1
+        self.moves = {}
         self.open = []
         self.closed = []
         self.route = []
 
-    def get_start(self):
-        """
-        Returns:
-            list[int, int]: The [x, y] coordinates of the start tile.
-        """
-        return [self.sx, self.sy]
-
-    def get_goal(self):
-        """
-        Returns:
-            list[int, int]: The [x, y] coordinates of the goal tile.
-        """
-        return [self.gx, self.gy]
-
     def show_open(self, open_list):
         """
         Updates the grid to display the current open list.
@@ -259,7 +322,6 @@ class Grid:
         for x, y in open_list:
             if (x, y) in [(self.sx, self.sy), (self.gx, self.gy)]:
                 continue
-            self.grid[y][x].state = 'open'
             self.update_tile(x, y, 'open')
         self.sim_present = True
 
@@ -273,52 +335,52 @@ class Grid:
         for x, y in closed_list:
             if (x, y) in [(self.sx, self.sy), (self.gx, self.gy)]:
                 continue
-            self.grid[y][x].state = 'closed'
             self.update_tile(x, y, 'closed')
         self.sim_present = True
 
-    def visualize_route(self, route, GUI, index: int):
+    def visualize_route(self, route, GUI, index: int=1, tiles_per_frame: int=1):
         """
         Visualizes the route, from goal backwards to the start.
+        Replaces any route animation already in progress.
 
         Parameters:
             route (list[Node]): List of Node objects in the final route.
             GUI          (GUI): Reference to the GUI for displaying backtracking.
-            index        (int): Index into the route.
+            index        (int): Index into the route of the first tile to reveal.
+            tiles_per_frame (int): Number of route tiles revealed per animation frame.
         """
-        if index >= len(route) - 1:
-            return
-        node = route[index]
-        if not node.move:
-            return
-        if self.grid[node.y][node.x].state in ['start', 'goal']:
-            GUI.after(55, lambda: self.visualize_route(route, GUI, index + 1))
-        if (node.x, node.y) in [(self.sx, self.sy), (self.gx, self.gy)]:
-            GUI.after(55, lambda: self.visualize_route(route, GUI, index + 1))
-        self.grid[node.y][node.x].state = 'route'
-        self.grid[node.y][node.x].parent = node.parent
-        self.grid[node.y][node.x].move = node.move
-        self.update_tile(node.x, node.y, 'route')
-        GUI.after(55, lambda: self.visualize_route(route, GUI, index + 1))
+        self.route_animation = RouteAnimator(self, route[index:-1], GUI, tiles_per_frame)
+        self.route_animation.start()
 
     def update_tile(self, x: int, y: int, state: str) -> None:
         """
-        Updates the fill color of a single tile on the canvas.
+        Updates the state of a single tile, and its fill color on the canvas if it is inside the viewport.
 
         Parameters:
             x, y (int, int): Tile coordinates.
             state     (str): New tile state ('open', 'closed', 'route', etc.).
         """
-        tile = self.grid[y][x]
-        if tile.state == 'start' or tile.state == 'goal':
+        cell = y * self.cols + x
+        current = self.cells[cell]
+        if current == STATE_CODES['start'] or current == STATE_CODES['goal']:
             return
-        tile.state = state
-        if tile.canvas_id is not None:
-            if tile.state == 'route':
-                    x1, y1, x2, y2 = tile.get_coords(self)
-                    image = self.route_image_refs[str(tile.move)]
-                    self.canvas.create_image(x1, y1, image=image, anchor='nw')
-            self.canvas.itemconfig(tile.canvas_id, fill=TILE_COLORS[state])
+        self.cells[cell] = STATE_CODES[state]
+        if self.cells[cell] in SIM_CODES:
+            self.sim_cells.add(cell)
+        self._draw_tile(cell)
+
+    def clear_simulation(self):
+        """
+        Restores the tiles a simulation marked open, closed or route to empty, in the model and on the canvas.
+        Only the tracked cells are visited, so the cost depends on the size of the search, not the map.
+        """
+        for cell in self.sim_cells:
+            if self.cells[cell] in SIM_CODES:
+                self.cells[cell] = STATE_CODES['empty']
+                self._draw_tile(cell)
+        self.sim_cells = set()
+        self.moves = {}
+        self.route_animation = None
 
 
     def get_element_icon(self, name: str, size: int=16):
@@ -337,3 +399,43 @@ class Grid:
 
         img = Image.open(icon_path).resize((size, size))
         return ImageTk.PhotoImage(img)
+
+class RouteAnimator:
+    """
+    Reveals a route a fixed number of tiles per frame, driven by a single GUI.after timer.
+    Tiles are drawn through Grid.update_tile, which reuses each tile's icon item, so no duplicate items are created.
+
+    Attributes:
+        grid          (Grid): Grid to reveal the route on.
+        route   (list[Node]): Route nodes to reveal, in order.
+        GUI                 : Reference to the GUI used for scheduling.
+        tiles_per_frame (int): Number of tiles revealed per frame.
+        index          (int): Index of the next node to reveal.
+    """
+    def __init__(self, grid, route, GUI, tiles_per_frame: int=1):
+        self.grid = grid
+        self.route = route
+        self.GUI = GUI
+        self.tiles_per_frame = max(1, tiles_per_frame)
+        self.index = 0
+
+    def start(self):
+        self._frame()
+
+    def _frame(self):
+        """Reveals the next batch of tiles and schedules the next frame until the route is complete."""
+        grid = self.grid
+        if grid.route_animation is not self:
+            return # Animation was cleared or replaced
+        end = min(self.index + self.tiles_per_frame, len(self.route))
+        for node in self.route[self.index:end]:
+            if not node.move:
+                end = len(self.route)
+                break
+            grid.moves[node.y * grid.cols + node.x] = node.move
+            grid.update_tile(node.x, node.y, 'route')
+        self.index = end
+        if self.index < len(self.route):
+            self.GUI.after(ROUTE_FRAME_DELAY, self._frame)
+        else:
+            grid.route_animation = None